@@ -3,6 +3,7 @@ from pygame import Surface, Rect
 from typing import Callable, Optional, Tuple, List
 
 from constants import Colors, Sounds
+from systems.display import display
 
 
 class Button:
@@ -73,7 +74,7 @@ class Button:
         Аргументы:
             events: Список событий pygame для обработки
         """
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = display.mouse_pos()
         self.hovered = self.rect.collidepoint(mouse_pos)
 
         for event in events:
@@ -1,7 +1,9 @@
+import time
+
 import pygame
 
+from systems.sound_archive import sound_archive
 
-pygame.mixer.init()
 
 class Colors:
     WHITE = (255, 255, 255)
@@ -12,21 +14,61 @@ class Colors:
     GREEN_200 = (0, 200, 0)
 
 
+class LazySound:
+    """
+    Звук, который декодируется при первом использовании, а не при импорте.
+
+    Ведёт себя как pygame.mixer.Sound: все атрибуты (play, set_volume, ...)
+    передаются загруженному звуку. Микшер к этому моменту уже должен быть
+    инициализирован. Если открыт архив звуков, уже декодированный звук
+    берётся из него, иначе файл декодируется с диска.
+    """
+    # Суммарное время декодирования всех звуков (для --startup-profile)
+    load_seconds = 0.0
+
+    def __init__(self, path: str):
+        """
+        Аргументы:
+            path: Путь к файлу звука
+        """
+        self.path = path
+        self.sound = None
+
+    def load(self) -> pygame.mixer.Sound:
+        """
+        Загрузить звук, если он ещё не загружен.
+
+        Возвращает:
+            Загруженный звук
+        """
+        if self.sound is None:
+            started = time.perf_counter()
+            self.sound = sound_archive.sound(self.path) or pygame.mixer.Sound(self.path)
+            LazySound.load_seconds += time.perf_counter() - started
+        return self.sound
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+
 class Sounds:
-    CLICK = pygame.mixer.Sound('assets/sounds/click.wav')
-    SHOOT = pygame.mixer.Sound('assets/sounds/Cards_Dart Goblin_blowdart_goblin_atk_02.ogg')
-    GAME_OVER = pygame.mixer.Sound('assets/sounds/spongebob-fail.mp3')
+    CLICK = LazySound('assets/sounds/click.wav')
+    SHOOT = LazySound('assets/sounds/Cards_Dart Goblin_blowdart_goblin_atk_02.ogg')
+    GAME_OVER = LazySound('assets/sounds/spongebob-fail.mp3')
     MENU_MUSIC = 'assets/sounds/Music_menu_03.ogg'
     BATTLE_MUSIC = 'assets/sounds/Music_2min_loop_battle_01.ogg'
     BACKGROUND_MUSIC = 'assets/sounds/Different Heaven, EH!DE - My Heart .mp3'
-    DAMAGE_LIGHTNING = pygame.mixer.Sound('assets/sounds/roblox-death-sound_1.mp3')  # Повторное использование звука клика для урона
-    DAMAGE_PLAYER = pygame.mixer.Sound('assets/sounds/aaah.mp3')
-    KILL_1 = pygame.mixer.Sound('assets/sounds/om-nom-sad.mp3')
-    MMMM = pygame.mixer.Sound('assets/sounds/levelup_sVAqjan.mp3')
-    MUSTARDD = pygame.mixer.Sound('assets/sounds/mustardddddddd.mp3')
-    LEVEL_UP = pygame.mixer.Sound('assets/sounds/apple-pay-sound.mp3')
-    RANDOM_WEAPON = pygame.mixer.Sound('assets/sounds/let-me-know.mp3')
-    UPGRADE_CLICKED = pygame.mixer.Sound('assets/sounds/discord-notification.mp3')
-    METAL_PIPE = pygame.mixer.Sound('assets/sounds/metal-pipe-clang.mp3')
-    STATS_INCREASE = pygame.mixer.Sound('assets/sounds/gay_CRD979V.mp3')
-    RIZZ = pygame.mixer.Sound('assets/sounds/rizz-sounds.mp3')
+    DAMAGE_LIGHTNING = LazySound('assets/sounds/roblox-death-sound_1.mp3')  # Повторное использование звука клика для урона
+    DAMAGE_PLAYER = LazySound('assets/sounds/aaah.mp3')
+    KILL_1 = LazySound('assets/sounds/om-nom-sad.mp3')
+    MMMM = LazySound('assets/sounds/levelup_sVAqjan.mp3')
+    MUSTARDD = LazySound('assets/sounds/mustardddddddd.mp3')
+    LEVEL_UP = LazySound('assets/sounds/apple-pay-sound.mp3')
+    RANDOM_WEAPON = LazySound('assets/sounds/let-me-know.mp3')
+    UPGRADE_CLICKED = LazySound('assets/sounds/discord-notification.mp3')
+    METAL_PIPE = LazySound('assets/sounds/metal-pipe-clang.mp3')
+    STATS_INCREASE = LazySound('assets/sounds/gay_CRD979V.mp3')
+    RIZZ = LazySound('assets/sounds/rizz-sounds.mp3')
+
+    # Файлы, которые проигрываются потоком через pygame.mixer.music
+    MUSIC = (MENU_MUSIC, BATTLE_MUSIC, BACKGROUND_MUSIC)
@@ -1,22 +1,59 @@
+import time
+
+# Момент запуска до остальных импортов (для --startup-profile)
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+from typing import Optional
+
 import pygame
 from pygame import mixer
+from constants import Sounds
+from systems.display import display
+from systems.gc_policy import gc_policy
+from systems.log import LEVELS, log_hub
+from systems.scenarios import SCENARIOS
+from systems.sound_archive import sound_archive
+from systems.startup_profile import StartupProfile
 from views.main_menu import MainMenu
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, use_scaled: bool = False, profile: Optional[StartupProfile] = None,
+                 check_surfaces: bool = False):
+        # Инициализировать только нужные подсистемы, а не все через pygame.init()
+        pygame.display.init()
+        pygame.font.init()
+        mixer.init()
+
+        # Звуки читаются из упакованного архива; он пересобирается,
+        # только если изменился исходный файл или формат микшера
+        sound_archive.prepare(Sounds.MUSIC)
+
         pygame.display.set_caption("Свэг гейм 52 нгг")
 
-        self.screen = pygame.display.set_mode((1280, 720))
+        # Экраны рисуют в self.screen всегда в логическом разрешении 1280×720
+        self.screen = display.open((1280, 720), use_scaled)
         self.clock = pygame.time.Clock()
         self.running = True
         self.dt = 0
+        # Время работы прошлого кадра в мс (события, обновление, отрисовка)
+        # без ожидания ограничителя кадров — по нему регулируется нагрузка
+        self.frame_work_ms = 0.0
         self.view_stack = []
+        self.profile = profile
+        # Проверить формат поверхностей после первого кадра игрового экрана
+        self.check_surfaces = check_surfaces
+        if self.profile:
+            self.profile.mark("инициализация")
+
         self.initialize_main_menu()
+        if self.profile:
+            self.profile.mark("ресурсы меню")
 
-        # Инициализация микшера для звуков
-        mixer.init()
+        # Громкость звуков
         self.sfx_volume = 0.5
         self.music_volume = 0.5
 
@@ -41,6 +78,16 @@ class Game:
             "current_difficulty": 1
         }
 
+        # Инструменты из командной строки (--telemetry, --watchdog); их модули
+        # импортируются только при включении, чтобы не замедлять запуск
+        self.telemetry = None
+        self.watchdog = None
+
+        # Ресурсы загружены: долгоживущие объекты больше не обходятся сборщиком мусора
+        self.previous_state = None
+        gc_policy.install()
+        gc_policy.freeze()
+
     def initialize_main_menu(self):
         # Начать с главного меню
         self.view_stack.append(MainMenu(self))
@@ -48,6 +95,9 @@ class Game:
     def game_loop(self):
         while self.running:
             self.dt = self.clock.tick(60) / 1000
+            frame_started = time.perf_counter()
+            if self.watchdog is not None:
+                self.watchdog.begin_frame()
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
@@ -57,14 +107,183 @@ class Game:
                 continue
             # Обновляем и рендерим только верхнее состояние
             current_state = self.view_stack[-1]
+
+            # Смена экрана — удобный момент для полной сборки мусора
+            if current_state is not self.previous_state:
+                changed = self.previous_state is not None
+                self.previous_state = current_state
+                if changed:
+                    gc_policy.on_view_change()
+            gc_policy.begin_frame(getattr(current_state, "suppress_gc", False))
+            if self.telemetry is not None:
+                self.telemetry.begin_frame()
+
+            update_started = time.perf_counter()
             current_state.update(self.dt, events)
-            self.screen.fill((0, 0, 0))
+            render_started = time.perf_counter()
+            # Экраны, которые сами заливают фон, не нужно очищать лишний раз
+            if not getattr(current_state, "fills_background", False):
+                self.screen.fill((0, 0, 0))
             current_state.render(self.screen)
-            pygame.display.flip()
+            display.present()
+            render_finished = time.perf_counter()
+            self.frame_work_ms = (render_finished - frame_started) * 1000
+            gc_policy.end_frame(self.frame_work_ms)
+
+            if self.telemetry is not None:
+                self.telemetry.end_frame(self.dt * 1000, (render_started - update_started) * 1000,
+                                         (render_finished - render_started) * 1000,
+                                         gc_policy.frame_pauses, gc_policy.frame_pause_ms)
+            if self.watchdog is not None:
+                self.watchdog.end_frame({
+                    "events": (update_started - frame_started) * 1000,
+                    "update": (render_started - update_started) * 1000,
+                    "render": (render_finished - render_started) * 1000,
+                    "gc": gc_policy.frame_pause_ms,
+                }, self.view_stack)
+
+            if self.profile and not self.profile.reported:
+                self.profile.mark("первый кадр")
+                self.profile.report()
 
+            if self.check_surfaces:
+                from views.game_view import GameView
+                if isinstance(current_state, GameView):
+                    # К этому моменту созданы спрайты, текст интерфейса и кнопки
+                    from systems.surfaces import report_surface_formats
+                    report_surface_formats()
+                    self.check_surfaces = False
+
+        gc_policy.uninstall()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        log_hub.shutdown()
         pygame.quit()
 
 
 if __name__ == "__main__":
-    game = Game()
-    game.game_loop()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scaled", action="store_true",
+                        help="растягивать окно средствами SDL (pygame.SCALED); игра остаётся в 1280×720")
+    parser.add_argument("--check-surfaces", action="store_true",
+                        help="после первого кадра игры записать в журнал поверхности не в формате экрана")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="вывести время импорта, инициализации, загрузки ресурсов и первого кадра")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="записывать телеметрию кадров в файл (читается python -m systems.telemetry)")
+    parser.add_argument("--log", action="append", default=[], metavar="[CATEGORY=]LEVEL",
+                        help="уровень журнала (debug, info, warning, error) для всех или одной категории, "
+                             "например --log debug или --log combat=debug")
+    parser.add_argument("--log-json", action="store_true", help="выводить журнал в формате JSON Lines")
+    parser.add_argument("--watchdog", nargs="?", type=float, const=50.0, metavar="MS",
+                        help="сохранять стеки вызовов кадров дольше MS миллисекунд (по умолчанию 50) "
+                             "в каталог captures; сводка: python -m systems.watchdog")
+    parser.add_argument("--profile", metavar="SCENARIO", choices=list(SCENARIOS),
+                        help="прогнать сценарий под cProfile и выйти; сценарии: " + ", ".join(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=1800, help="количество тиков сценария (по умолчанию 1800)")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="путь без расширения для .pstats и .collapsed (по умолчанию profiles/<сценарий>)")
+    parser.add_argument("--soak", metavar="SCENARIO", choices=list(SCENARIOS),
+                        help="долгий прогон сценария без окна с поиском утечек памяти; код выхода 1 при утечке")
+    parser.add_argument("--soak-minutes", type=float, default=180.0,
+                        help="длительность прогона в минутах игрового времени (по умолчанию 180)")
+    parser.add_argument("--soak-threshold", type=float, default=2048.0,
+                        help="допустимый рост памяти на сущность в байтах (по умолчанию 2048)")
+    parser.add_argument("--soak-out", metavar="PATH", help="записать замеры памяти в JSON")
+    parser.add_argument("--render-bench", nargs="*", type=int, metavar="ENEMIES",
+                        help="замерить стратегии отрисовки без окна для сцен с заданным количеством врагов "
+                             "(по умолчанию 500 2000 5000) и вывести таблицу")
+    parser.add_argument("--bench-frames", type=int, default=60, help="кадров на каждый случай замера (по умолчанию 60)")
+    parser.add_argument("--bench", nargs="*", metavar="SCENARIO",
+                        help="прогнать сценарии замера (по умолчанию все) и сравнить с базовыми результатами "
+                             "профиля машины; код выхода 1 при ухудшении")
+    parser.add_argument("--bench-profile", metavar="NAME", help="профиль машины (по умолчанию имя компьютера)")
+    parser.add_argument("--bench-save", action="store_true", help="сохранить результаты как базовые для профиля")
+    parser.add_argument("--bench-tolerance", type=float, default=10.0,
+                        help="допустимое ухудшение в процентах (по умолчанию 10)")
+    parser.add_argument("--bench-out", metavar="PATH", help="записать текущие результаты в JSON")
+    parser.add_argument("--golden", metavar="SCENARIO", choices=list(SCENARIOS),
+                        help="сверить прогон сценария с эталонной трассой хешей состояния golden/<сценарий>.npz; "
+                             "код выхода 1 при расхождении или если эталона нет")
+    parser.add_argument("--golden-save", action="store_true",
+                        help="записать (перезаписать) эталонную трассу на --ticks тиков вместо сверки")
+    parser.add_argument("--autopilot", nargs="?", const="balanced", metavar="POLICY",
+                        help="игрой управляет автопилот, улучшения выбираются по правилу POLICY "
+                             "(по умолчанию balanced; balanced, weapons, health, speed, random)")
+    args = parser.parse_args()
+
+    # Инструменты импортируются только в ветках, которые их используют:
+    # главное меню не должно ждать numpy-таблиц мира и замеров
+    if args.bench:
+        from systems.benchmarks import BENCHMARKS
+        unknown = [name for name in args.bench if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"неизвестные сценарии замера: {', '.join(unknown)}; есть: {', '.join(BENCHMARKS)}")
+    autopilot = None
+    if args.autopilot:
+        from systems.autopilot import LEVEL_UP_POLICIES, Autopilot
+        from systems.controls import controls
+        if args.autopilot not in LEVEL_UP_POLICIES:
+            parser.error(f"неизвестное правило автопилота {args.autopilot}; есть: {', '.join(LEVEL_UP_POLICIES)}")
+        autopilot = Autopilot(args.autopilot)
+        controls.use(autopilot)
+
+    levels = {}
+    default_level = None
+    for setting in args.log:
+        category, _, level = setting.rpartition("=")
+        if level.lower() not in LEVELS:
+            parser.error(f"неизвестный уровень журнала {level} в --log {setting}; есть: {', '.join(LEVELS)}")
+        if category:
+            levels[category] = LEVELS[level.lower()]
+        else:
+            default_level = LEVELS[level.lower()]
+    log_hub.configure(default_level=default_level, levels=levels, json_lines=args.log_json)
+
+    profile = None
+    if args.startup_profile:
+        profile = StartupProfile(STARTED)
+        profile.mark("импорт")
+
+    if (args.render_bench is not None or args.bench is not None or args.soak
+            or args.profile or args.golden):
+        # Замеры, долгие прогоны и проверки идут без окна
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    game = Game(use_scaled=args.scaled, profile=profile, check_surfaces=args.check_surfaces)
+    if args.telemetry:
+        from systems.telemetry import telemetry
+        telemetry.open(args.telemetry)
+        game.telemetry = telemetry
+    if args.watchdog is not None:
+        from systems.watchdog import watchdog
+        watchdog.threshold_ms = args.watchdog
+        watchdog.start()
+        game.watchdog = watchdog
+    if args.profile:
+        from systems.profiling import profile_scenario
+        if not profile_scenario(game, args.profile, args.ticks, args.profile_out or f"profiles/{args.profile}"):
+            sys.exit(1)
+    elif args.soak:
+        from systems.soak import soak_scenario
+        if not soak_scenario(game, args.soak, args.soak_minutes, args.soak_threshold, args.soak_out):
+            sys.exit(1)
+    elif args.render_bench is not None:
+        from systems.render_bench import ENEMY_COUNTS, format_table, run_render_bench
+        print(format_table(run_render_bench(game, args.render_bench or ENEMY_COUNTS, args.bench_frames)))
+    elif args.bench is not None:
+        from systems.benchmarks import bench
+        if not bench(game, args.bench, args.bench_profile, args.bench_save,
+                     args.bench_tolerance / 100, args.bench_out):
+            sys.exit(1)
+    elif args.golden:
+        from systems.golden import golden
+        if not golden(game, args.golden, args.ticks, args.golden_save):
+            sys.exit(1)
+    else:
+        game.game_loop()
+
+    if autopilot is not None:
+        print(autopilot.summary())
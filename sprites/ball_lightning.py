@@ -4,14 +4,26 @@ from typing import Tuple, List, Set
 import random
 import math
 
+import numpy as np
+
 from constants import Sounds
+from sprites.entity_sprite import EntitySprite
 from sprites.projectile_base import ProjectileBase
+from systems.damage import DamageBuffer
+from systems.archetypes import Column, world
+from systems.entity_ids import HitSet
+from systems.quality import quality
+from systems.spatial import EnemySnapshot
+from systems.surfaces import make_surface
 
 
-class BallLightning(pygame.sprite.Sprite, ProjectileBase):
+class BallLightning(EntitySprite, ProjectileBase):
     """
     Спрайт шаровой молнии, который отскакивает между врагами, нанося урон каждому поражённому врагу.
     """
+    table = world.projectiles
+
+    damage = Column("damage")
 
     def __init__(self, x: int, y: int, direction: pygame.math.Vector2, speed: int = 10, damage: int = 60, max_bounces: int = 5, range: int = 800):
         """
@@ -26,11 +38,11 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
             max_bounces: Максимальное количество отскоков до исчезновения
             range: Максимальная дистанция, которую может пройти снаряд
         """
-        super().__init__()
+        super().__init__(damage=damage)
 
         # Создать спрайт шаровой молнии (электрический синий круг с эффектом свечения)
         self.radius = 8
-        self.image = Surface((self.radius * 2 + 4, self.radius * 2 + 4), pygame.SRCALPHA)
+        self.image = make_surface((self.radius * 2 + 4, self.radius * 2 + 4), alpha=True)
 
         # Нарисовать внешнее свечение
         pygame.draw.circle(self.image, (100, 150, 255, 100), (self.radius + 2, self.radius + 2), self.radius + 2)
@@ -42,7 +54,6 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
         # Атрибуты движения
         self.speed = speed
         self.direction = direction
-        self.damage = damage
         self.max_bounces = max_bounces
         self.bounces_left = max_bounces
         self.max_range = range
@@ -54,7 +65,7 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
 
         # Отслеживание цели
         self.current_target = None
-        self.hit_enemies = set()  # Отслеживать поражённых врагов, чтобы не поражать одного врага дважды
+        self.hit_enemies = HitSet()  # Отслеживать поражённых врагов, чтобы не поражать одного врага дважды
 
         # Анимация и визуальные эффекты
         self.animation_frame = 0
@@ -91,26 +102,30 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
             self.kill()
             return
 
-        # Если у нас есть текущая цель, проверьте, достигли ли мы её
-        if self.current_target is not None:
-            # Рассчитать расстояние до цели
-            target_x = self.current_target.rect.centerx
-            target_y = self.current_target.rect.centery
-            dx = target_x - self.pos_x
-            dy = target_y - self.pos_y
-            distance_to_target = math.sqrt(dx * dx + dy * dy)
+    def has_reached_target(self) -> bool:
+        """
+        Проверить, долетела ли шаровая молния до текущей цели.
+
+        Возвращает:
+            True, если цель есть и молния достаточно близко к ней, иначе False
+        """
+        if self.current_target is None:
+            return False
 
-            # Если мы достаточно близки к цели, считайте, что она достигнута
-            if distance_to_target < self.radius + self.current_target.rect.width / 2:
-                # Обработать столкновение с целью
-                self.handle_collision(self.current_target)
+        # Рассчитать расстояние до цели
+        dx = self.current_target.rect.centerx - self.pos_x
+        dy = self.current_target.rect.centery - self.pos_y
+        distance_to_target = math.sqrt(dx * dx + dy * dy)
 
-        # Обновить позицию rect
-        self.rect.centerx = int(self.pos_x)
-        self.rect.centery = int(self.pos_y)
+        # Если мы достаточно близки к цели, считайте, что она достигнута
+        return distance_to_target < self.radius + self.current_target.rect.width / 2
 
     def _update_appearance(self):
         """Обновить визуальный вид шаровой молнии для эффекта анимации."""
+        # На пониженном качестве «дрожание» заморожено
+        if not quality.animate_effects:
+            return
+
         # Очистить изображение
         self.image.fill((0, 0, 0, 0))
 
@@ -143,82 +158,55 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
             temp_rect.center = center_position
             surface.blit(self.image, temp_rect)
 
-    def find_next_target(self, enemies, camera_pos: Tuple[int, int], max_distance: float = 300) -> bool:
+    def find_next_target(self, snapshot: EnemySnapshot, max_distance: float = 300) -> bool:
         """
         Найти следующего врага, к которому можно отскочить.
 
         Аргументы:
-            enemies: Группа спрайтов врагов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            snapshot: Снимок позиций врагов на текущий кадр (мировые координаты)
             max_distance: Максимальное расстояние для поиска следующей цели
 
         Возвращает:
             True, если была найдена новая цель, иначе False
         """
-        if self.bounces_left <= 0:
+        if self.bounces_left <= 0 or len(snapshot) == 0:
             return False
 
-        closest_enemy = None
-        closest_distance = max_distance
-
-        for enemy in enemies:
-            # Пропустить врагов, которые уже были поражены
-            if id(enemy) in self.hit_enemies:
-                continue
+        # Рассчитать расстояния до всех врагов сразу
+        offsets = snapshot.positions - self.rect.center
+        distances_sq = np.einsum("ij,ij->i", offsets, offsets)
 
-            # Рассчитать экранную позицию врага
-            enemy_screen_x = enemy.rect.centerx + camera_pos[0]
-            enemy_screen_y = enemy.rect.centery + camera_pos[1]
+        # Пропустить врагов, которые уже были поражены
+        distances_sq[self.hit_enemies.contains_many(snapshot.entity_ids)] = np.inf
 
-            # Рассчитать экранную позицию шаровой молнии
-            lightning_screen_x = self.rect.centerx + camera_pos[0]
-            lightning_screen_y = self.rect.centery + camera_pos[1]
-
-            # Рассчитать расстояние
-            dx = enemy_screen_x - lightning_screen_x
-            dy = enemy_screen_y - lightning_screen_y
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_enemy = enemy
-
-        if closest_enemy:
-            self.current_target = closest_enemy
-
-            # Рассчитать направление к новой цели
-            enemy_screen_x = closest_enemy.rect.centerx + camera_pos[0]
-            enemy_screen_y = closest_enemy.rect.centery + camera_pos[1]
-            lightning_screen_x = self.rect.centerx + camera_pos[0]
-            lightning_screen_y = self.rect.centery + camera_pos[1]
-
-            dx = enemy_screen_x - lightning_screen_x
-            dy = enemy_screen_y - lightning_screen_y
+        closest_index = int(distances_sq.argmin())
+        if distances_sq[closest_index] >= max_distance * max_distance:
+            return False
 
-            # Создать новый вектор направления
-            self.direction = pygame.math.Vector2(dx, dy)
-            if self.direction.length() > 0:
-                self.direction = self.direction.normalize()
+        self.current_target = snapshot.sprites[closest_index]
 
-            return True
+        # Создать новый вектор направления к новой цели
+        dx, dy = offsets[closest_index]
+        self.direction = pygame.math.Vector2(dx, dy)
+        if self.direction.length() > 0:
+            self.direction = self.direction.normalize()
 
-        return False
+        return True
 
-    def handle_collision(self, enemy) -> bool:
+    def handle_collision(self, enemy, damage_buffer: DamageBuffer, source: str) -> None:
         """
         Обработать столкновение с врагом.
 
         Аргументы:
             enemy: Враг, который был поражён
-
-        Возвращает:
-            True, если враг был побеждён, иначе False
+            damage_buffer: Буфер событий урона за кадр
+            source: Название оружия, выпустившего молнию
         """
         # Отметить этого врага как поражённого
-        self.hit_enemies.add(id(enemy))
+        self.hit_enemies.add(enemy.entity_id)
 
-        # Нанести урон врагу
-        defeated = enemy.take_damage(self.damage)
+        # Записать урон врагу (применится при разрешении урона за кадр)
+        damage_buffer.add(enemy, self.damage, source)
 
         # Уменьшить счётчик отскоков
         self.bounces_left -= 1
@@ -227,5 +215,3 @@ class BallLightning(pygame.sprite.Sprite, ProjectileBase):
         self.current_target = None
 
         Sounds.DAMAGE_LIGHTNING.play()
-
-        return defeated
@@ -1,15 +1,28 @@
-from typing import Tuple
+from typing import Dict, Tuple
 
 import pygame
 from pygame import Surface
 
+from sprites.entity_sprite import EntitySprite
 from sprites.projectile_base import ProjectileBase
+from systems.archetypes import Column, world
+from systems.surfaces import freeze
 
 
-class Bullet(pygame.sprite.Sprite, ProjectileBase):
+class Bullet(EntitySprite, ProjectileBase):
     """
     Спрайт пули, который движется по прямой и наносит урон врагам.
     """
+    table = world.projectiles
+
+    vel_x = Column("vel_x")
+    vel_y = Column("vel_y")
+    damage = Column("damage")
+    lifetime = Column("lifetime")
+    time_alive = Column("time_alive")
+
+    # Кэш изображений пуль по радиусу
+    _images: Dict[int, Surface] = {}
 
     def __init__(self, x: int, y: int, direction: pygame.math.Vector2, speed: int = 10, damage: int = 10):
         """
@@ -22,41 +35,61 @@ class Bullet(pygame.sprite.Sprite, ProjectileBase):
             speed: Скорость движения в пикселях за кадр
             damage: Урон, наносимый врагам при столкновении
         """
-        super().__init__()
-
-        # Создать маленький спрайт пули (жёлтый круг)
+        super().__init__(
+            vel_x=direction.x * speed,
+            vel_y=direction.y * speed,
+            damage=damage,
+            lifetime=2.0  # секунды, чтобы снаряд не летел бесконечно
+        )
+
+        # Маленький спрайт пули (жёлтый круг), общий для всех пуль
         self.radius = 5
-        self.image = Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 0), (self.radius, self.radius), self.radius)
+        self.image = self.get_image(self.radius)
         self.rect = self.image.get_rect(center=(x, y))
 
         # Атрибуты движения
         self.speed = speed
         self.direction = direction
-        self.damage = damage
 
         # Точное положение пули (для точного движения)
         self.pos_x = float(x)
         self.pos_y = float(y)
 
-        # Время жизни, чтобы пули не летели бесконечно
-        self.lifetime = 2.0  # секунды
-        self.time_alive = 0.0
+    @classmethod
+    def get_image(cls, radius: int) -> Surface:
+        """
+        Получить общее изображение пули.
+
+        Картинка не меняется, поэтому рисуется один раз и хранится
+        с умноженной на альфу прозрачностью (см. systems.surfaces.freeze).
+
+        Аргументы:
+            radius: Радиус пули
+
+        Возвращает:
+            Поверхность, общая для всех пуль этого радиуса
+        """
+        image = cls._images.get(radius)
+        if image is None:
+            image = Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(image, (255, 255, 0), (radius, radius), radius)
+            image = freeze(image)
+            cls._images[radius] = image
+        return image
 
     def update(self, dt: float) -> None:
         """
         Обновить позицию пули.
 
+        Обычно пули обновляются пакетно системами movement_system и
+        lifetime_system; этот метод обновляет одну пулю.
+
         Аргументы:
             dt: Дельта времени с последнего обновления
         """
-        # Обновить позицию на основе направления и скорости
-        self.pos_x += self.direction.x * self.speed
-        self.pos_y += self.direction.y * self.speed
-
-        # Обновить позицию rect
-        self.rect.centerx = int(self.pos_x)
-        self.rect.centery = int(self.pos_y)
+        # Обновить позицию на основе скорости
+        self.pos_x += self.vel_x
+        self.pos_y += self.vel_y
 
         # Обновить время жизни
         self.time_alive += dt
@@ -72,9 +105,9 @@ class Bullet(pygame.sprite.Sprite, ProjectileBase):
             center_position: Необязательная кортеж (x, y), чтобы отобразить пулю в заданной позиции
         """
         if center_position is None:
-            surface.blit(self.image, self.rect)
+            surface.blit(self.image, self.rect, special_flags=pygame.BLEND_PREMULTIPLIED)
         else:
             # Создать временный rect для отображения в указанной позиции
             temp_rect = self.rect.copy()
             temp_rect.center = center_position
-            surface.blit(self.image, temp_rect)
+            surface.blit(self.image, temp_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
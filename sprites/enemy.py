@@ -1,17 +1,55 @@
-import random
-
 import pygame
 from pygame import Surface
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
 from components.progress_bar import ProgressBar
-from constants import Colors, Sounds
+from constants import Colors
+from sprites.entity_sprite import EntitySprite
 from sprites.player import Player
+from systems.archetypes import ArchetypeTable, Column, world
+from systems.camera import Camera
+from systems.lod import SimulationLod
+from systems.quality import quality
+from systems.surfaces import make_surface
 
 
-class Enemy(pygame.sprite.Sprite):
+class Enemy(EntitySprite):
     """
     Спрайт врага с характеристиками здоровья и урона.
+
+    Позиция, скорость и боевые характеристики хранятся в таблице врагов
+    (world.enemies); объект лишь даёт к ним доступ.
     """
+    table = world.enemies
+
+    vel_x = Column("vel_x")
+    vel_y = Column("vel_y")
+    speed = Column("speed")
+    current_health = Column("health")
+    max_health = Column("max_health")
+    damage = Column("damage")
+    width = Column("width")
+    height = Column("height")
+    decided_at = Column("decided_at")
+
+    # Общая полоска здоровья: все враги рисуют её по очереди, а не держат по экземпляру
+    health_bar = ProgressBar(
+        x=0,
+        y=0,
+        width=50,
+        height=8,
+        progress=1.0,  # Полное здоровье
+        bg_color=(50, 50, 50),
+        fill_color=(200, 0, 0),  # Красный
+        border_color=(200, 200, 200),
+        show_text=False
+    )
+
+    # Изображения врагов одного цвета совпадают, поэтому хранятся в одном экземпляре
+    _images: Dict[Tuple, Surface] = {}
+
     def __init__(self, player: Player, x: int, y: int, speed: int = 2, max_health: int = 50, damage: int = 10, color = (255, 0, 0)):
         """
         Инициализация врага.
@@ -23,71 +61,62 @@ class Enemy(pygame.sprite.Sprite):
             max_health: Максимальное количество очков здоровья
             damage: Урон, наносимый игроку при столкновении
         """
-        super().__init__()
+        super().__init__(
+            speed=speed,
+            health=max_health,
+            max_health=max_health,
+            damage=damage
+        )
 
         self.player = player
 
         # Создать простой спрайт врага (красный прямоугольник)
-        self.width = 40
-        self.height = 40
-        self.image = Surface((self.width, self.height))
-        self.image.fill(color)  # Красный цвет
+        self.image = self.get_image(color, 40, 40)
         self.rect = self.image.get_rect(center=(x, y))
 
-        # Атрибуты движения
-        self.speed = speed
-        self.direction = pygame.math.Vector2(0, 0)
-
-        # Боевая механика
-        self.max_health = max_health
-        self.current_health = max_health
-        self.damage = damage
         self.recently_targeted = False
 
-        # Создать полоску здоровья
-        health_bar_width = 50
-        health_bar_height = 8
-        self.health_bar = ProgressBar(
-            x=self.rect.x - (health_bar_width - self.width) // 2,
-            y=self.rect.y - 15,
-            width=health_bar_width,
-            height=health_bar_height,
-            progress=1.0,  # Полное здоровье
-            bg_color=(50, 50, 50),
-            fill_color=(200, 0, 0),  # Красный
-            border_color=(200, 200, 200),
-            show_text=False
-        )
+    @classmethod
+    def get_image(cls, color: Tuple[int, int, int], width: int, height: int) -> Surface:
+        """
+        Получить общее изображение врага заданного цвета.
+
+        Аргументы:
+            color: RGB цвет врага
+            width: Ширина изображения
+            height: Высота изображения
+
+        Возвращает:
+            Поверхность, общая для всех врагов этого цвета
+        """
+        key = (tuple(color), width, height)
+        image = cls._images.get(key)
+        if image is None:
+            image = make_surface((width, height))
+            image.fill(color)
+            cls._images[key] = image
+        return image
 
     def update(self, dt: float, player_pos: Tuple[int, int]) -> None:
         """
         Обновить позицию и состояние врага.
 
+        Обычно все враги обновляются сразу системой chase_system; этот метод
+        обновляет одного врага.
+
         Аргументы:
             dt: Дельта времени с момента последнего обновления
             player_pos: Позиция игрока (x, y)
         """
-        # Двигаться к игроку
-        player_x, player_y = player_pos
-
         # Вычислить вектор направления к игроку
-        direction_x = player_x - self.rect.centerx
-        direction_y = player_y - self.rect.centery
-
-        # Создать нормализованный вектор направления
-        direction = pygame.math.Vector2(direction_x, direction_y)
+        direction = pygame.math.Vector2(player_pos[0] - self.pos_x, player_pos[1] - self.pos_y)
         if direction.length() > 0:
-            direction = direction.normalize()
+            direction.scale_to_length(self.speed)
 
         # Двигаться к игроку
-        self.rect.x += direction.x * self.speed
-        self.rect.y += direction.y * self.speed
-
-        # Обновить позицию полоски здоровья
-        self.health_bar.set_position(
-            self.rect.x - 5,  # Центрировать полоску здоровья над врагом
-            self.rect.y - 15
-        )
+        self.vel_x, self.vel_y = direction
+        self.pos_x += direction.x
+        self.pos_y += direction.y
 
     def render(self, surface: Surface, center_position: Tuple[int, int] = None) -> None:
         """
@@ -98,20 +127,29 @@ class Enemy(pygame.sprite.Sprite):
             center_position: Необязательная кортеж (x, y) для отображения врага в заданной позиции
         """
         # Использовать текущую позицию rect, если center_position не задано
-        if center_position is None:
-            surface.blit(self.image, self.rect)
-            self.health_bar.render(surface)
-        else:
-            # Создать временной rect для отображения в заданной позиции
-            temp_rect = self.rect.copy()
+        temp_rect = self.rect.copy()
+        if center_position is not None:
             temp_rect.center = center_position
-            surface.blit(self.image, temp_rect)
+        surface.blit(self.image, temp_rect)
 
-            # Обновить позицию полоски здоровья, чтобы она была над врагом в заданной позиции
-            health_bar_x = temp_rect.x - 5
-            health_bar_y = temp_rect.y - 15
-            self.health_bar.set_position(health_bar_x, health_bar_y)
-            self.health_bar.render(surface)
+        # Нарисовать полоску здоровья над врагом
+        if quality.health_bars:
+            self.draw_health_bar(surface, temp_rect.x, temp_rect.y, self.current_health / self.max_health)
+
+    @classmethod
+    def draw_health_bar(cls, surface: Surface, x: int, y: int, progress: float) -> None:
+        """
+        Нарисовать полоску здоровья врага общим экземпляром ProgressBar.
+
+        Аргументы:
+            surface: Поверхность Pygame для отображения
+            x: Левая граница врага на экране
+            y: Верхняя граница врага на экране
+            progress: Доля оставшегося здоровья (от 0.0 до 1.0)
+        """
+        cls.health_bar.set_position(x - 5, y - 15)  # Центрировать полоску здоровья над врагом
+        cls.health_bar.set_progress(progress)
+        cls.health_bar.render(surface)
 
     def take_damage(self, amount: int) -> bool:
         """
@@ -124,7 +162,6 @@ class Enemy(pygame.sprite.Sprite):
             True, если враг повержен (здоровье <= 0), иначе False
         """
         self.current_health = max(0, self.current_health - amount)
-        self.health_bar.set_progress(self.current_health / self.max_health)
 
         return self.current_health <= 0
 
@@ -140,8 +177,50 @@ class Enemy(pygame.sprite.Sprite):
         """
         return self.rect.colliderect(player_rect)
 
-    def kill(self):
-        self.player.add_score(self.max_health * 0.1 + self.damage * 0.3 + self.speed * 3)
-        print("Добавление очков: ", self.max_health * 0.1 + self.damage * 0.3 + self.speed * 3, " игроку.")
-        random.choice([Sounds.KILL_1]).play()
-        super().kill()
\ No newline at end of file
+    def score_value(self) -> float:
+        """
+        Количество очков, которое получает игрок за победу над этим врагом.
+
+        Возвращает:
+            Количество очков
+        """
+        return self.max_health * 0.1 + self.damage * 0.3 + self.speed * 3
+
+
+def render_enemies(surface: Surface, table: ArchetypeTable, rows: np.ndarray, camera: Camera) -> None:
+    """
+    Отрисовать врагов из таблицы одним пакетом blits с отсечением по экрану.
+
+    Аргументы:
+        surface: Поверхность Pygame для отрисовки
+        table: Таблица врагов
+        rows: Индексы строк врагов для отрисовки
+        camera: Камера игрового экрана
+    """
+    screen_width, screen_height = surface.get_size()
+    widths = table["width"][rows]
+    heights = table["height"][rows]
+
+    # Левый верхний угол врагов на экране (камера применяется ко всем позициям сразу)
+    left = table["pos_x"][rows].astype(np.int64) - widths // 2 + int(camera.x)
+    top = table["pos_y"][rows].astype(np.int64) - heights // 2 + int(camera.y)
+
+    # Отсечь врагов за пределами экрана (с запасом на полоску здоровья)
+    visible = (left + widths + 10 > 0) & (left - 10 < screen_width) & (top + heights > 0) & (top - 20 < screen_height)
+    rows = rows[visible]
+    left = left[visible].tolist()
+    top = top[visible].tolist()
+    enemies = table.objects_at(rows)
+
+    surface.blits([(enemy.image, (x, y)) for enemy, x, y in zip(enemies, left, top)], doreturn=False)
+
+    # Полоски здоровья рисуются только для врагов ближнего уровня детализации
+    # и только если их не отключило пониженное качество графики
+    if not quality.health_bars:
+        return
+
+    near = table["lod_tier"][rows] == SimulationLod.NEAR
+    progress = (table["health"][rows] / table["max_health"][rows]).tolist()
+    for x, y, enemy_progress, is_near in zip(left, top, progress, near.tolist()):
+        if is_near:
+            Enemy.draw_health_bar(surface, x, y, enemy_progress)
@@ -0,0 +1,92 @@
+from typing import Dict, Optional
+
+import pygame
+from pygame import Rect
+
+from systems.archetypes import ArchetypeTable, Column
+from systems.entity_ids import EntityAllocator
+
+
+class EntitySprite(pygame.sprite.Sprite):
+    """
+    Спрайт-представление строки таблицы архетипа.
+
+    Числовые компоненты сущности хранятся в колонках таблицы, а спрайт лишь
+    даёт к ним доступ через атрибуты. Строка выдаётся при создании и
+    освобождается, когда спрайт покидает последнюю группу (kill() или remove()
+    из всех групп); после этого спрайт хранит последние значения у себя.
+    """
+    # Таблица задаётся в подклассе
+    table: ArchetypeTable = None
+
+    pos_x = Column("pos_x")
+    pos_y = Column("pos_y")
+
+    def __init__(self, **values):
+        """
+        Создать сущность в таблице архетипа.
+
+        Аргументы:
+            values: Начальные значения колонок
+        """
+        super().__init__()
+        self.detached_values: Optional[Dict[str, object]] = None
+        self.entity_id = self.table.spawn(self, **values)
+        self._rect = Rect(0, 0, 0, 0)
+
+    @property
+    def index(self) -> int:
+        """Индекс строки сущности в таблице архетипа."""
+        return EntityAllocator.index_of(self.entity_id)
+
+    @property
+    def rect(self) -> Rect:
+        """Прямоугольник спрайта с центром в текущей позиции сущности."""
+        rect = self._rect
+        rect.center = (int(self.pos_x), int(self.pos_y))
+        return rect
+
+    @rect.setter
+    def rect(self, rect: Rect) -> None:
+        self._rect = rect
+        self.pos_x, self.pos_y = rect.center
+
+        # Размер нужен системам столкновений, если таблица его хранит
+        if "width" in self.table.columns:
+            # После detach() строка уже не наша: пишем в сохранённые значения, как Column
+            if self.detached_values is not None:
+                self.detached_values["width"], self.detached_values["height"] = rect.size
+            else:
+                self.table["width"][self.index], self.table["height"][self.index] = rect.size
+
+    def detach(self) -> None:
+        """
+        Убрать сущность из таблицы, сохранив последние значения колонок в объекте.
+        """
+        if self.detached_values is None:
+            self.detached_values = self.table.despawn(self.entity_id)
+
+    def attach(self) -> None:
+        """
+        Вернуть отсоединённую сущность в таблицу (с новым идентификатором).
+        """
+        values, self.detached_values = self.detached_values, None
+        self.entity_id = self.table.spawn(self, **values)
+
+    def add_internal(self, group) -> None:
+        # Спрайт возвращается в игру после удаления
+        if self.detached_values is not None:
+            self.attach()
+        super().add_internal(group)
+
+    def kill(self) -> None:
+        # Sprite.kill() убирает спрайт из групп в обход remove_internal()
+        super().kill()
+        self.detach()
+
+    def remove_internal(self, group) -> None:
+        super().remove_internal(group)
+
+        # Сущность больше нигде не используется — освободить строку
+        if not self.alive():
+            self.detach()
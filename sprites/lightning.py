@@ -3,13 +3,23 @@ from pygame import Surface
 from typing import Tuple
 import math
 
+from sprites.entity_sprite import EntitySprite
 from sprites.projectile_base import ProjectileBase
+from systems.archetypes import Column, world
+from systems.surfaces import freeze
 
 
-class Lightning(pygame.sprite.Sprite, ProjectileBase):
+class Lightning(EntitySprite, ProjectileBase):
     """
     Спрайт молнии, который движется по прямой и наносит урон врагам.
     """
+    table = world.projectiles
+
+    vel_x = Column("vel_x")
+    vel_y = Column("vel_y")
+    damage = Column("damage")
+    lifetime = Column("lifetime")
+    time_alive = Column("time_alive")
 
     def __init__(self, x: int, y: int, direction: pygame.math.Vector2, speed: int = 15, damage: int = 40):
         """
@@ -22,7 +32,12 @@ class Lightning(pygame.sprite.Sprite, ProjectileBase):
             speed: Скорость движения в пикселях за кадр
             damage: Урон, наносимый врагам при столкновении
         """
-        super().__init__()
+        super().__init__(
+            vel_x=direction.x * speed,
+            vel_y=direction.y * speed,
+            damage=damage,
+            lifetime=1.5  # секунды, чтобы снаряд не летел бесконечно
+        )
 
         # Создать спрайт молнии (вытянутая синяя форма)
         self.width = 12
@@ -51,35 +66,32 @@ class Lightning(pygame.sprite.Sprite, ProjectileBase):
         # Повернуть изображение по направлению движения
         angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
         self.image = pygame.transform.rotate(self.image, angle)
+
+        # Картинка больше не меняется: перевести в формат экрана и умножить цвет на альфу
+        self.image = freeze(self.image)
         self.rect = self.image.get_rect(center=(x, y))
 
         # Атрибуты движения
         self.speed = speed
         self.direction = direction
-        self.damage = damage
 
         # Отслеживание точного положения молнии (для точного движения)
         self.pos_x = float(x)
         self.pos_y = float(y)
 
-        # Время жизни, чтобы предотвратить бесконечное движение молнии
-        self.lifetime = 1.5  # секунды
-        self.time_alive = 0.0
-
     def update(self, dt: float) -> None:
         """
         Обновить позицию молнии.
 
+        Обычно молнии обновляются пакетно системами movement_system и
+        lifetime_system; этот метод обновляет одну молнию.
+
         Аргументы:
             dt: Дельта времени с момента последнего обновления
         """
-        # Обновить позицию на основе направления и скорости
-        self.pos_x += self.direction.x * self.speed
-        self.pos_y += self.direction.y * self.speed
-
-        # Обновить позицию прямоугольника
-        self.rect.centerx = int(self.pos_x)
-        self.rect.centery = int(self.pos_y)
+        # Обновить позицию на основе скорости
+        self.pos_x += self.vel_x
+        self.pos_y += self.vel_y
 
         # Обновить время жизни
         self.time_alive += dt
@@ -95,9 +107,9 @@ class Lightning(pygame.sprite.Sprite, ProjectileBase):
             center_position: Необязательная кортеж (x, y) для отображения молнии в заданной позиции
         """
         if center_position is None:
-            surface.blit(self.image, self.rect)
+            surface.blit(self.image, self.rect, special_flags=pygame.BLEND_PREMULTIPLIED)
         else:
             # Создать временный прямоугольник для отображения в указанной позиции
             temp_rect = self.rect.copy()
             temp_rect.center = center_position
-            surface.blit(self.image, temp_rect)
+            surface.blit(self.image, temp_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
@@ -1,17 +1,26 @@
-from typing import Tuple, List
+from typing import Tuple
 
 import pygame
 from pygame import Surface
 import random
 
-from constants import Sounds
+from sprites.entity_sprite import EntitySprite
 from sprites.projectile_base import ProjectileBase
+from systems.archetypes import Column, world
+from systems.quality import quality
+from systems.surfaces import make_surface
 
 
-class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
+class MagicCloud(EntitySprite, ProjectileBase):
     """
     Спрайт магического облака, который наносит урон врагам в области и постепенно исчезает.
     """
+    table = world.effects
+
+    current_radius = Column("radius")
+    damage = Column("damage")
+    max_lifetime = Column("lifetime")
+    time_alive = Column("time_alive")
 
     def __init__(self, x: int, y: int, direction: pygame.math.Vector2, speed: int = 5, speed_decay = 2, damage: int = 5, radius: int = 40):
         """
@@ -25,12 +34,15 @@ class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
             damage: Урон, наносимый врагам в секунду
             radius: Начальный радиус облака
         """
-        super().__init__()
+        super().__init__(
+            radius=radius,
+            damage=damage,
+            lifetime=3.0  # секунды
+        )
 
         # Создать спрайт облака (синий/фиолетовый круг с прозрачностью)
         self.max_radius = radius
-        self.current_radius = radius
-        self.image = Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
+        self.image = make_surface((self.max_radius * 2, self.max_radius * 2), alpha=True)
         
         # Нарисовать облако с помощью случайных частиц
         self.color = (100, 100, 255, 180)  # Синий с прозрачностью
@@ -42,24 +54,19 @@ class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
         self.speed = speed
         self.speed_decay = speed_decay
         self.direction = direction
-        self.damage = damage
         self.damage_per_second = damage  # Оригинальный урон для расчёта затухания
 
         # Точное положение облака (для точного движения)
         self.pos_x = float(x)
         self.pos_y = float(y)
 
-        # Время жизни и затухание
-        self.max_lifetime = 3.0  # секунды
-        self.time_alive = 0.0
+        # Время жизни (max_lifetime) и текущий урон хранятся в таблице эффектов
         self.damage_interval = 0.1  # Наносить урон каждые N секунд
         self.time_since_last_damage = 0.0
-        
-        # Отслеживать врагов, которым был нанесён урон в текущем интервале
-        self.damaged_enemies = set()
 
     def draw_cloud(self):
         """Нарисовать облако с помощью случайных частиц."""
+        self.drawn_radius = self.current_radius
         self.image.fill((0, 0, 0, 0))  # Очистить с прозрачностью
         
         # Нарисовать основное тело облака
@@ -107,10 +114,6 @@ class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
         self.pos_x += self.direction.x * self.speed
         self.pos_y += self.direction.y * self.speed
 
-        # Обновить позицию rect
-        self.rect.centerx = int(self.pos_x)
-        self.rect.centery = int(self.pos_y)
-
         # Обновить время жизни и затухание
         self.time_alive += dt
         decay_factor = 1.0 - (self.time_alive / self.max_lifetime)
@@ -124,7 +127,10 @@ class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
         self.damage = self.damage_per_second * decay_factor
         
         # Заново нарисовать облако с новым радиусом
-        self.draw_cloud()
+        # (на пониженном качестве частицы заморожены и облако перерисовывается,
+        # только когда радиус заметно уменьшился)
+        if quality.animate_effects or self.drawn_radius - self.current_radius >= 5:
+            self.draw_cloud()
         
         # Обновить интервал урона
         self.time_since_last_damage += dt
@@ -144,63 +150,16 @@ class MagicCloud(pygame.sprite.Sprite, ProjectileBase):
             temp_rect = self.rect.copy()
             temp_rect.center = center_position
             surface.blit(self.image, temp_rect)
-    
-    def check_enemy_collision(self, enemy, camera_pos: Tuple[int, int]) -> bool:
-        """
-        Проверить, находится ли враг в области действия облака.
-        
-        Аргументы:
-            enemy: Враг для проверки
-            camera_pos: Позиция камеры (camera_x, camera_y)
-            
-        Возвращает:
-            True, если враг находится в области действия облака, иначе False
-        """
-        # Вычислить расстояние между центром облака и центром врага
-        cloud_screen_x = self.rect.centerx + camera_pos[0]
-        cloud_screen_y = self.rect.centery + camera_pos[1]
-        
-        enemy_screen_x = enemy.rect.centerx + camera_pos[0]
-        enemy_screen_y = enemy.rect.centery + camera_pos[1]
-        
-        dx = cloud_screen_x - enemy_screen_x
-        dy = cloud_screen_y - enemy_screen_y
-        distance = (dx * dx + dy * dy) ** 0.5
-        
-        # Проверить, находится ли враг в пределах текущего радиуса облака
-        return distance <= self.current_radius + enemy.rect.width / 2
-    
-    def apply_damage_to_enemies(self, enemies, camera_pos: Tuple[int, int]) -> List:
+
+    def consume_damage_tick(self) -> bool:
         """
-        Нанести урон всем врагам в области действия облака.
-        
-        Аргументы:
-            enemies: Группа спрайтов врагов
-            camera_pos: Позиция камеры (camera_x, camera_y)
-            
+        Проверить, пора ли облаку нанести урон, и начать новый интервал урона.
+
         Возвращает:
-            Список поверженных врагов
+            True, если интервал урона истёк и облако должно нанести урон, иначе False
         """
         if self.time_since_last_damage < self.damage_interval:
-            return []
+            return False
 
         self.time_since_last_damage = 0.0
-        self.damaged_enemies.clear()
-
-        defeated_enemies = []
-        
-        for enemy in enemies:
-            # Пропустить врагов, которым уже был нанесён урон в этом интервале
-            if id(enemy) in self.damaged_enemies:
-                continue
-                
-            if self.check_enemy_collision(enemy, camera_pos):
-                # Нанести урон врагу
-                if enemy.take_damage(int(self.damage)):
-                    # Враг повержен
-                    defeated_enemies.append(enemy)
-                
-                # Отметить этого врага как повреждённого в этом интервале
-                self.damaged_enemies.add(id(enemy))
-
-        return defeated_enemies
+        return True
@@ -3,9 +3,16 @@ from pygame import Surface
 from typing import List, Dict, Tuple, Optional
 from components.progress_bar import ProgressBar
 from constants import Colors, Sounds
+from systems.camera import Camera
+from systems.controls import controls
+from systems.log import get_logger
+from systems.surfaces import make_surface
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("player")
+
+
 class Player(pygame.sprite.Sprite):
     """
     Спрайт игрока, которым можно управлять с помощью клавиш WASD.
@@ -26,7 +33,7 @@ class Player(pygame.sprite.Sprite):
         # Создать простой спрайт игрока (синий прямоугольник)
         self.width = 50
         self.height = 50
-        self.image = Surface((self.width, self.height))
+        self.image = make_surface((self.width, self.height))
         self.image.fill((0, 0, 255))  # Синий цвет
         self.rect = self.image.get_rect(center=(x, y))
 
@@ -69,40 +76,25 @@ class Player(pygame.sprite.Sprite):
         self.weapon_slots: dict[int, Optional[WeaponBase]] = { }
         self.active_weapon_slot = 1
 
-    def update(self, dt: float, events: List[pygame.event.Event], camera_pos=None) -> None:
+    def update(self, dt: float, events: List[pygame.event.Event], camera: Optional[Camera] = None) -> None:
         """
         Обновить состояние игрока и направление движения.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
             events: Список событий pygame
-            camera_pos: Необязательный кортеж (camera_x, camera_y) для обновления на основе движения игрока
+            camera: Необязательная камера, которая сдвигается вместо позиции игрока
         """
-        # Обработка нажатий клавиш для движения
-        keys = pygame.key.get_pressed()
-
-        # Сброс направления
-        self.direction.x = 0
-        self.direction.y = 0
-
-        # Движение WASD
-        if keys[pygame.K_w]:
-            self.direction.y = -1
-        if keys[pygame.K_s]:
-            self.direction.y = 1
-        if keys[pygame.K_a]:
-            self.direction.x = -1
-        if keys[pygame.K_d]:
-            self.direction.x = 1
+        # Направление движения от источника управления (по умолчанию WASD)
+        self.direction.x, self.direction.y = controls.movement(camera)
 
         # Нормализовать диагональное движение
         if self.direction.length() > 0:
             self.direction = self.direction.normalize()
 
-        # Если camera_pos предоставлен, обновить его вместо позиции игрока
-        if camera_pos is not None:
-            camera_pos[0] -= self.direction.x * self.speed
-            camera_pos[1] -= self.direction.y * self.speed
+        # Если камера предоставлена, сдвинуть её вместо позиции игрока
+        if camera is not None:
+            camera.move(-self.direction.x * self.speed, -self.direction.y * self.speed)
 
         # Обновить позицию полоски здоровья, чтобы она оставалась над игроком
         self.health_bar.set_position(
@@ -181,15 +173,19 @@ class Player(pygame.sprite.Sprite):
     def add_score(self, amount: float) -> None:
         """
         Увеличить счёт игрока на заданное количество.
+
+        Очки сверх порога уровня переходят на следующий уровень; если их
+        хватает ещё на один, он наступит при следующем начислении.
         """
         self.score += amount
 
         self.score_bar.set_progress(self.score / self.required_for_level_up())
 
-        if self.required_for_level_up() < self.score:
+        required = self.required_for_level_up()
+        if required < self.score:
             self.current_level += 1
-            print("Повышение уровня! Текущий уровень: ", self.current_level)
-            self.score = 0
+            log.info("Повышение уровня", level=self.current_level)
+            self.score -= required
             self.reset_score_progress_bar()
 
             # Проиграть звук повышения уровня
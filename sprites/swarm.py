@@ -0,0 +1,86 @@
+import math
+import random
+from typing import List
+
+from sprites.enemy import Enemy
+from sprites.entity_sprite import EntitySprite
+from systems.archetypes import Column, world
+
+
+class Swarm(EntitySprite):
+    """
+    Рой — группа далёких врагов, которая движется как одно тело.
+
+    Враги-участники убираются из игровых групп (и из таблицы врагов) и
+    хранятся в рое отсоединёнными, сохраняя все свои характеристики. Рой
+    несёт количество участников и их суммарное здоровье; когда он подходит
+    к игроку, участники снова становятся обычными врагами.
+    """
+    table = world.swarms
+
+    vel_x = Column("vel_x")
+    vel_y = Column("vel_y")
+    speed = Column("speed")
+    health = Column("health")
+    member_count = Column("members")
+
+    def __init__(self, x: float, y: float):
+        """
+        Создать пустой рой.
+
+        Аргументы:
+            x: Позиция x в мировых координатах
+            y: Позиция y в мировых координатах
+        """
+        super().__init__(pos_x=x, pos_y=y)
+        self.members: List[Enemy] = []
+
+    def absorb(self, enemies: List[Enemy]) -> None:
+        """
+        Добавить отсоединённых врагов в рой.
+
+        Центр роя смещается к среднему положению всех участников, а скорость
+        роя — средняя скорость участников.
+
+        Аргументы:
+            enemies: Враги, уже убранные из игровых групп
+        """
+        count = len(self.members)
+        sum_x = self.pos_x * count
+        sum_y = self.pos_y * count
+        for enemy in enemies:
+            sum_x += enemy.pos_x
+            sum_y += enemy.pos_y
+
+        self.members.extend(enemies)
+        count = len(self.members)
+        self.pos_x = sum_x / count
+        self.pos_y = sum_y / count
+
+        self.member_count = count
+        self.health = sum(member.current_health for member in self.members)
+        self.speed = sum(member.speed for member in self.members) / count
+
+    def release(self) -> List[Enemy]:
+        """
+        Распустить рой: расставить участников вокруг центра роя.
+
+        Возвращает:
+            Список отсоединённых врагов, готовых к добавлению в игровые группы
+        """
+        members, self.members = self.members, []
+
+        # Разбросать участников по кругу, площадь которого растёт с их числом
+        spread = 20 * math.sqrt(len(members))
+        for member in members:
+            angle = random.uniform(0, 2 * math.pi)
+            distance = random.uniform(0, spread)
+            member.pos_x = self.pos_x + math.cos(angle) * distance
+            member.pos_y = self.pos_y + math.sin(angle) * distance
+            member.vel_x = 0
+            member.vel_y = 0
+            member.decided_at = 0
+
+        self.member_count = 0
+        self.health = 0
+        return members
@@ -0,0 +1,128 @@
+import time
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from systems.archetypes import ArchetypeTable, steer_system
+
+
+class AiMetrics(NamedTuple):
+    """
+    Метрики планировщика решений врагов за последний тик.
+    """
+    bucket_count: int
+    decisions: int
+    mean_latency: float  # Среднее число тиков с прошлого решения
+    max_latency: int  # Наибольшее число тиков с прошлого решения
+    steer_ms: float  # Сглаженное время принятия решений за тик, мс
+
+
+class AiScheduler:
+    """
+    Планировщик решений врагов с разбиением по корзинам.
+
+    Враги делятся на bucket_count корзин по индексу строки; за тик решение
+    (направление движения) пересчитывается только для одной корзины, а
+    остальные враги двигаются по сохранённой скорости. Враги совсем рядом
+    с игроком и враги без единого решения пересчитываются каждый тик.
+
+    Количество корзин подстраивается под бюджет времени на решения:
+    если сглаженное время превышает budget_ms, корзин становится больше,
+    если оно ниже половины бюджета — меньше. Время зависит от машины и
+    нагрузки, поэтому для повторяемых прогонов подстройку можно отключить
+    (adaptive = False): тогда корзин всегда min_buckets.
+    """
+    def __init__(self, budget_ms: float = 0.5, min_buckets: int = 1, max_buckets: int = 8,
+                 close_radius: float = 150, adapt_interval: int = 30, adaptive: bool = True):
+        """
+        Инициализация планировщика.
+
+        Аргументы:
+            budget_ms: Бюджет времени на решения за тик в миллисекундах
+            min_buckets: Минимальное количество корзин
+            max_buckets: Максимальное количество корзин
+            close_radius: Радиус вокруг игрока, в котором решения принимаются каждый тик
+            adapt_interval: Раз во сколько тиков можно менять количество корзин
+            adaptive: Подстраивать ли количество корзин под время решений
+        """
+        self.budget_ms = budget_ms
+        self.min_buckets = min_buckets
+        self.max_buckets = max_buckets
+        self.close_radius = close_radius
+        self.adapt_interval = adapt_interval
+        self.adaptive = adaptive
+
+        self.bucket_count = min_buckets
+        # Тики считаются с 1, чтобы 0 в колонке decided_at означал «решения ещё не было»
+        self.tick = 0
+        self.steer_ms = 0.0
+        self.metrics = AiMetrics(self.bucket_count, 0, 0.0, 0, 0.0)
+
+    def steer(self, table: ArchetypeTable, rows: np.ndarray, target: Tuple[float, float]) -> AiMetrics:
+        """
+        Пересчитать направление для текущей корзины врагов.
+
+        Аргументы:
+            table: Таблица врагов
+            rows: Индексы строк врагов, которые двигаются в этом тике
+            target: Позиция игрока в мировых координатах
+
+        Возвращает:
+            Метрики тика
+        """
+        start = time.perf_counter()
+        self.tick += 1
+
+        decided_at = table["decided_at"][rows]
+        dx = table["pos_x"][rows] - target[0]
+        dy = table["pos_y"][rows] - target[1]
+
+        due = (
+            (rows % self.bucket_count == self.tick % self.bucket_count)
+            | (dx * dx + dy * dy < self.close_radius * self.close_radius)
+            | (decided_at == 0)
+        )
+        due_rows = rows[due]
+
+        steer_system(table, due_rows, target)
+
+        # Задержка решения: сколько тиков враг двигался по сохранённой скорости
+        previous = decided_at[due]
+        latencies = self.tick - previous[previous > 0]
+        self.mark_decided(table, due_rows)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.steer_ms += (elapsed_ms - self.steer_ms) * 0.1
+        self.adapt()
+
+        self.metrics = AiMetrics(
+            self.bucket_count,
+            len(due_rows),
+            float(latencies.mean()) if len(latencies) else 0.0,
+            int(latencies.max()) if len(latencies) else 0,
+            self.steer_ms
+        )
+        return self.metrics
+
+    def mark_decided(self, table: ArchetypeTable, rows: np.ndarray) -> None:
+        """
+        Отметить, что направление врагов пересчитано в текущем тике
+        (например, другой системой).
+
+        Аргументы:
+            table: Таблица врагов
+            rows: Индексы строк
+        """
+        table["decided_at"][rows] = max(self.tick, 1)
+
+    def adapt(self) -> None:
+        """
+        Подстроить количество корзин под бюджет времени.
+        """
+        if not self.adaptive or self.tick % self.adapt_interval != 0:
+            return
+
+        if self.steer_ms > self.budget_ms and self.bucket_count < self.max_buckets:
+            self.bucket_count += 1
+        elif self.steer_ms < self.budget_ms / 2 and self.bucket_count > self.min_buckets:
+            self.bucket_count -= 1
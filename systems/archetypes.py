@@ -0,0 +1,372 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from systems.entity_ids import EntityAllocator, effect_ids, enemy_ids, projectile_ids, swarm_ids
+
+
+class ArchetypeTable:
+    """
+    Хранилище компонентов одного архетипа сущностей в виде колонок-массивов.
+
+    Строка таблицы — это индекс слота из аллокатора идентификаторов, поэтому
+    доступ к компонентам сущности по её идентификатору прямой, без словарей.
+    """
+    def __init__(self, name: str, allocator: EntityAllocator, columns: Dict[str, type], capacity: int = 256):
+        """
+        Создать пустую таблицу.
+
+        Аргументы:
+            name: Название архетипа (для отладки и отчётов)
+            allocator: Аллокатор идентификаторов сущностей этого архетипа
+            columns: Словарь название колонки -> тип данных NumPy
+            capacity: Начальная вместимость в строках
+        """
+        self.name = name
+        self.allocator = allocator
+        self.dtypes = dict(columns)
+        self.columns: Dict[str, np.ndarray] = {
+            column: np.zeros(capacity, dtype=dtype) for column, dtype in self.dtypes.items()
+        }
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Объект-представление для каждой строки (спрайт), чтобы системы могли
+        # вернуть результат в виде объектов
+        self.objects: List[Optional[object]] = [None] * capacity
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def __len__(self) -> int:
+        return self.allocator.live_count
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def _grow(self, min_capacity: int) -> None:
+        new_capacity = max(min_capacity, self.capacity * 2)
+        for column, values in self.columns.items():
+            grown = np.zeros(new_capacity, dtype=values.dtype)
+            grown[:len(values)] = values
+            self.columns[column] = grown
+
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        self.alive = alive
+        self.objects.extend([None] * (new_capacity - len(self.objects)))
+
+    def spawn(self, obj, **values) -> int:
+        """
+        Добавить сущность в таблицу.
+
+        Аргументы:
+            obj: Объект-представление сущности
+            values: Начальные значения колонок (остальные заполняются нулями)
+
+        Возвращает:
+            Идентификатор сущности
+        """
+        entity_id = self.allocator.allocate()
+        row = EntityAllocator.index_of(entity_id)
+        if row >= self.capacity:
+            self._grow(row + 1)
+
+        for column, values_array in self.columns.items():
+            values_array[row] = values.get(column, 0)
+        self.alive[row] = True
+        self.objects[row] = obj
+
+        return entity_id
+
+    def despawn(self, entity_id: int) -> Optional[Dict[str, object]]:
+        """
+        Убрать сущность из таблицы.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+
+        Возвращает:
+            Последние значения колонок сущности или None, если она уже была убрана
+        """
+        if not self.allocator.is_alive(entity_id):
+            return None
+
+        row = EntityAllocator.index_of(entity_id)
+        values = {column: values_array[row].item() for column, values_array in self.columns.items()}
+
+        self.alive[row] = False
+        self.objects[row] = None
+        self.allocator.release(entity_id)
+
+        return values
+
+    def entity_ids_at(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Восстановить идентификаторы сущностей по индексам строк.
+
+        Аргументы:
+            rows: Индексы живых строк
+
+        Возвращает:
+            Массив идентификаторов той же длины
+        """
+        generations = np.frombuffer(self.allocator.generations, dtype=np.uint32)[rows].astype(np.int64)
+        return (generations << EntityAllocator.INDEX_BITS) | rows
+
+    def live_rows(self) -> np.ndarray:
+        """
+        Получить индексы всех живых строк.
+
+        Возвращает:
+            Массив индексов строк
+        """
+        return np.flatnonzero(self.alive)
+
+    def objects_at(self, rows) -> List:
+        """
+        Получить объекты-представления для набора строк.
+
+        Аргументы:
+            rows: Индексы строк
+
+        Возвращает:
+            Список объектов в том же порядке
+        """
+        objects = self.objects
+        return [objects[row] for row in rows.tolist()]
+
+    def clear(self) -> None:
+        """
+        Убрать из таблицы все сущности.
+
+        Объекты отсоединяются и сохраняют последние значения своих колонок.
+        """
+        for row in self.live_rows().tolist():
+            obj = self.objects[row]
+            if obj is not None:
+                obj.detach()
+            else:
+                self.alive[row] = False
+
+
+# Колонки архетипов. Позиция — центр сущности в мировых координатах,
+# скорость — смещение за кадр.
+ENEMY_COLUMNS = {
+    "pos_x": np.float64,
+    "pos_y": np.float64,
+    "vel_x": np.float64,
+    "vel_y": np.float64,
+    "speed": np.float64,
+    "health": np.float64,
+    "max_health": np.float64,
+    "damage": np.float64,
+    "width": np.int32,
+    "height": np.int32,
+    "lod_tier": np.int8,
+    "decided_at": np.int64,
+}
+
+PROJECTILE_COLUMNS = {
+    "pos_x": np.float64,
+    "pos_y": np.float64,
+    "vel_x": np.float64,
+    "vel_y": np.float64,
+    "damage": np.float64,
+    "lifetime": np.float64,
+    "time_alive": np.float64,
+    "width": np.int32,
+    "height": np.int32,
+}
+
+EFFECT_COLUMNS = {
+    "pos_x": np.float64,
+    "pos_y": np.float64,
+    "radius": np.float64,
+    "damage": np.float64,
+    "lifetime": np.float64,
+    "time_alive": np.float64,
+}
+
+# Рой — несколько далёких врагов, объединённых в одну сущность
+SWARM_COLUMNS = {
+    "pos_x": np.float64,
+    "pos_y": np.float64,
+    "vel_x": np.float64,
+    "vel_y": np.float64,
+    "speed": np.float64,
+    "health": np.float64,
+    "members": np.int32,
+}
+
+
+class World:
+    """
+    Набор таблиц архетипов игрового мира.
+    """
+    def __init__(self):
+        self.enemies = ArchetypeTable("enemies", enemy_ids, ENEMY_COLUMNS)
+        self.projectiles = ArchetypeTable("projectiles", projectile_ids, PROJECTILE_COLUMNS)
+        self.effects = ArchetypeTable("effects", effect_ids, EFFECT_COLUMNS)
+        self.swarms = ArchetypeTable("swarms", swarm_ids, SWARM_COLUMNS)
+
+    def tables(self) -> Tuple[ArchetypeTable, ...]:
+        return self.enemies, self.projectiles, self.effects, self.swarms
+
+    def reset(self) -> None:
+        """
+        Очистить все таблицы перед новой игрой.
+        """
+        for table in self.tables():
+            table.clear()
+
+
+class Column:
+    """
+    Дескриптор, превращающий атрибут объекта в представление колонки таблицы.
+
+    Пока сущность находится в таблице, чтение и запись идут напрямую в массив;
+    после удаления объект хранит последние значения у себя.
+    """
+    def __init__(self, column: str):
+        self.column = column
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        detached = obj.detached_values
+        if detached is not None:
+            return detached[self.column]
+        return obj.table.columns[self.column][obj.index].item()
+
+    def __set__(self, obj, value) -> None:
+        detached = obj.detached_values
+        if detached is not None:
+            detached[self.column] = value
+        else:
+            obj.table.columns[self.column][obj.index] = value
+
+
+def movement_system(table: ArchetypeTable, rows: np.ndarray, steps: float = 1) -> None:
+    """
+    Сдвинуть сущности на их скорость за кадр.
+
+    Аргументы:
+        table: Таблица архетипа с колонками pos_x, pos_y, vel_x, vel_y
+        rows: Индексы строк для обновления
+        steps: Сколько кадров движения применить за один вызов
+    """
+    table["pos_x"][rows] += table["vel_x"][rows] * steps
+    table["pos_y"][rows] += table["vel_y"][rows] * steps
+
+
+def steer_system(table: ArchetypeTable, rows: np.ndarray, target: Tuple[float, float]) -> None:
+    """
+    Направить скорость сущностей к цели, не сдвигая их.
+
+    Аргументы:
+        table: Таблица архетипа с колонками позиции, скорости и speed
+        rows: Индексы строк для обновления
+        target: Позиция цели в мировых координатах
+    """
+    dx = target[0] - table["pos_x"][rows]
+    dy = target[1] - table["pos_y"][rows]
+    length = np.hypot(dx, dy)
+
+    # Сущности, уже стоящие на цели, не двигаются
+    scale = np.divide(table["speed"][rows], length, out=np.zeros_like(length), where=length > 0)
+    table["vel_x"][rows] = dx * scale
+    table["vel_y"][rows] = dy * scale
+
+
+def chase_system(table: ArchetypeTable, rows: np.ndarray, target: Tuple[float, float], steps: float = 1) -> None:
+    """
+    Направить сущности к цели с их скоростью и сдвинуть их.
+
+    Аргументы:
+        table: Таблица архетипа с колонками позиции, скорости и speed
+        rows: Индексы строк для обновления
+        target: Позиция цели в мировых координатах
+        steps: Сколько кадров движения применить за один вызов
+    """
+    steer_system(table, rows, target)
+    movement_system(table, rows, steps)
+
+
+def lifetime_system(table: ArchetypeTable, rows: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Увеличить время жизни сущностей и найти истёкшие.
+
+    Аргументы:
+        table: Таблица архетипа с колонками lifetime и time_alive
+        rows: Индексы строк для обновления
+        dt: Дельта времени с последнего обновления
+
+    Возвращает:
+        Индексы строк, время жизни которых истекло
+    """
+    table["time_alive"][rows] += dt
+    return rows[table["time_alive"][rows] >= table["lifetime"][rows]]
+
+
+def rows_of(group) -> np.ndarray:
+    """
+    Получить индексы строк для всех сущностей группы спрайтов.
+
+    Аргументы:
+        group: Группа спрайтов-представлений одной таблицы
+
+    Возвращает:
+        Массив индексов строк
+    """
+    return np.fromiter((sprite.index for sprite in group), dtype=np.intp, count=len(group))
+
+
+def overlap_system(table: ArchetypeTable, rows: np.ndarray, snapshot) -> np.ndarray:
+    """
+    Найти для каждой сущности первого врага, с чьим прямоугольником она пересекается.
+
+    Точная проверка идёт только по врагам-кандидатам из пространственной
+    сетки снимка, а не по всем врагам.
+
+    Аргументы:
+        table: Таблица архетипа с колонками позиции и размера
+        rows: Индексы строк для проверки
+        snapshot: Снимок врагов (EnemySnapshot) с сеткой, позициями и половинами размеров
+
+    Возвращает:
+        Массив формы (K,) с индексом врага в снимке или -1, если столкновения нет
+    """
+    misses = np.full(len(rows), -1, dtype=np.intp)
+    if len(rows) == 0 or len(snapshot) == 0:
+        return misses
+
+    positions = np.stack((table["pos_x"][rows], table["pos_y"][rows]), axis=1)
+    half_sizes = np.stack((table["width"][rows], table["height"][rows]), axis=1) / 2
+
+    # Квадрат запроса к сетке покрывает любой прямоугольник врага, который может задеть сущность
+    reach_radii = half_sizes.max(axis=1) + float(snapshot.half_sizes.max())
+    chunks = [
+        snapshot.grid.query_radius(x, y, radius)
+        for (x, y), radius in zip(positions.tolist(), reach_radii.tolist())
+    ]
+    candidates = np.concatenate(chunks)
+    if len(candidates) == 0:
+        return misses
+
+    # Пары «сущность — кандидат»: проверяются только соседи по сетке
+    owners = np.repeat(np.arange(len(rows)), [len(chunk) for chunk in chunks])
+
+    # Прямоугольники пересекаются, если центры ближе суммы половин размеров по обеим осям
+    gap = np.abs(positions[owners] - snapshot.positions[candidates])
+    reach = half_sizes[owners] + snapshot.half_sizes[candidates]
+    hits = (gap < reach).all(axis=1)
+
+    # Первый враг — с наименьшим индексом в снимке, как при полном переборе
+    first_hit = np.full(len(rows), len(snapshot), dtype=np.intp)
+    np.minimum.at(first_hit, owners[hits], candidates[hits])
+    return np.where(first_hit < len(snapshot), first_hit, misses)
+
+
+# Мир текущей игры
+world = World()
@@ -0,0 +1,234 @@
+import math
+import random
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from systems.archetypes import world
+from systems.camera import Camera
+
+
+# Восемь направлений движения по углу, начиная с «вправо» (ось y вниз)
+DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+
+def pick_health(level_up_view) -> None:
+    """Всегда прибавка здоровья."""
+    level_up_view.increase_health()
+
+
+def pick_speed(level_up_view) -> None:
+    """Всегда прибавка скорости."""
+    level_up_view.increase_speed()
+
+
+def pick_random(level_up_view) -> None:
+    """Случайная кнопка (включая случайное оружие)."""
+    random.choice(level_up_view.weapon_buttons).callback()
+
+
+def upgrade_in_turn(level_up_view) -> None:
+    """Улучшить оружие игрока по очереди: номер оружия зависит от уровня."""
+    player = level_up_view.player
+    weapons = [weapon for weapon in player.weapon_slots.values() if weapon is not None]
+    if not weapons:
+        level_up_view.increase_health()
+        return
+    level_up_view.level_up_weapon(weapons[player.current_level % len(weapons)])
+
+
+def pick_weapons(level_up_view) -> None:
+    """Новое оружие, когда его предлагают, иначе улучшение оружия по очереди."""
+    if level_up_view.player.current_level % 2 == 0:
+        level_up_view.select_random_weapon()
+    else:
+        upgrade_in_turn(level_up_view)
+
+
+def pick_balanced(level_up_view) -> None:
+    """Здоровье, если его меньше половины, иначе как pick_weapons."""
+    player = level_up_view.player
+    if player.current_health < player.max_health / 2:
+        level_up_view.increase_health()
+    else:
+        pick_weapons(level_up_view)
+
+
+# Правила выбора на экране повышения уровня
+LEVEL_UP_POLICIES: Dict[str, Callable] = {
+    "balanced": pick_balanced,
+    "weapons": pick_weapons,
+    "health": pick_health,
+    "speed": pick_speed,
+    "random": pick_random,
+}
+
+
+class Autopilot:
+    """
+    Источник управления для прогонов без человека: игрок уходит от самого
+    плотного скопления врагов, целится в центр толпы и сам выбирает
+    улучшения по правилу из LEVEL_UP_POLICIES.
+
+    Решение принимается раз в think_interval тиков по врагам в радиусе
+    sense_radius: они раскладываются по сетке с ячейкой cell_size, самая
+    заполненная ячейка считается скоплением. Если враг ближе danger_radius,
+    игрок бежит от скопления (с отталкиванием от ближайших врагов); если
+    скопление дальше engage_radius, идёт к нему, чтобы оружие доставало;
+    иначе обходит его по кругу, держа дистанцию. Без врагов рядом игрок
+    идёт к ближайшему. Между решениями направление и прицел не меняются,
+    так что на тик приходится меньше одного пакетного прохода по врагам.
+    """
+    def __init__(self, policy: str = "balanced", think_interval: int = 4, sense_radius: float = 500.0,
+                 danger_radius: float = 100.0, engage_radius: float = 200.0, cell_size: float = 100.0):
+        """
+        Инициализация автопилота.
+
+        Аргументы:
+            policy: Правило выбора улучшений из LEVEL_UP_POLICIES
+            think_interval: Раз во сколько тиков принимать решение
+            sense_radius: Радиус, в котором учитываются враги
+            danger_radius: Расстояние до врага, с которого игрок убегает
+            engage_radius: Расстояние до скопления, с которого игрок к нему идёт
+            cell_size: Размер ячейки сетки поиска скопления
+        """
+        self.policy = policy
+        self.choose = LEVEL_UP_POLICIES[policy]
+        self.think_interval = think_interval
+        self.sense_radius = sense_radius
+        self.danger_radius = danger_radius
+        self.engage_radius = engage_radius
+        self.cell_size = cell_size
+
+        self.tick = 0
+        self.direction: Tuple[int, int] = (0, 0)
+        self.aim: Optional[Tuple[float, float]] = None   # Точка прицеливания в мировых координатах
+
+        # Стоимость решений, чтобы проверить, что автопилот не искажает замеры
+        self.thinks = 0
+        self.think_seconds = 0.0
+        self.level_ups = 0
+
+    def movement(self, camera: Optional[Camera]) -> Tuple[int, int]:
+        """
+        Получить направление движения за тик.
+
+        Аргументы:
+            camera: Камера игрового экрана (None — игрок стоит)
+
+        Возвращает:
+            (dx, dy), каждая составляющая -1, 0 или 1
+        """
+        if camera is None:
+            return 0, 0
+        if self.tick % self.think_interval == 0:
+            start = time.perf_counter()
+            self.think(camera.center_world())
+            self.think_seconds += time.perf_counter() - start
+            self.thinks += 1
+        self.tick += 1
+        return self.direction
+
+    def aim_screen(self, camera: Camera) -> Tuple[int, int]:
+        """
+        Получить точку прицеливания в координатах поверхности отрисовки.
+
+        Аргументы:
+            camera: Камера игрового экрана
+
+        Возвращает:
+            Центр толпы на экране (центр экрана, если врагов нет)
+        """
+        if self.aim is None:
+            return camera.screen_center
+        return camera.world_to_screen(self.aim)
+
+    def choose_level_up(self, level_up_view) -> bool:
+        """
+        Выбрать улучшение по правилу автопилота.
+
+        Аргументы:
+            level_up_view: Экран повышения уровня
+
+        Возвращает:
+            True — выбор сделан
+        """
+        self.choose(level_up_view)
+        self.level_ups += 1
+        return True
+
+    def think(self, player_pos: Tuple[float, float]) -> None:
+        """
+        Выбрать направление движения и точку прицеливания.
+
+        Аргументы:
+            player_pos: Позиция игрока в мировых координатах
+        """
+        table = world.enemies
+        rows = table.live_rows()
+        if not len(rows):
+            self.direction = (0, 0)
+            self.aim = None
+            return
+
+        px, py = player_pos
+        dx = table["pos_x"][rows] - px
+        dy = table["pos_y"][rows] - py
+        dist2 = dx * dx + dy * dy
+
+        sensed = dist2 < self.sense_radius * self.sense_radius
+        if not sensed.any():
+            # Врагов рядом нет: идти к ближайшему
+            nearest = int(dist2.argmin())
+            self.aim = (px + float(dx[nearest]), py + float(dy[nearest]))
+            self.direction = self.quantize(float(dx[nearest]), float(dy[nearest]))
+            return
+
+        dx, dy, dist2 = dx[sensed], dy[sensed], dist2[sensed]
+        self.aim = (px + float(dx.mean()), py + float(dy.mean()))
+
+        # Самое плотное скопление: самая заполненная ячейка сетки вокруг игрока
+        half = int(math.ceil(self.sense_radius / self.cell_size))
+        cell_x = np.floor(dx / self.cell_size).astype(np.int64) + half
+        cell_y = np.floor(dy / self.cell_size).astype(np.int64) + half
+        cells = cell_x * (2 * half + 1) + cell_y
+        densest = cells == np.bincount(cells).argmax()
+        cluster_x = float(dx[densest].mean())
+        cluster_y = float(dy[densest].mean())
+        cluster_distance = math.hypot(cluster_x, cluster_y) or 1.0
+
+        danger = dist2 < self.danger_radius * self.danger_radius
+        if danger.any():
+            # Бежать от скопления и от тех, кто уже рядом (ближние весят больше)
+            weights = 1.0 / np.maximum(dist2[danger], 1.0)
+            move_x = -cluster_x / cluster_distance - float((dx[danger] * weights).sum()) * self.danger_radius
+            move_y = -cluster_y / cluster_distance - float((dy[danger] * weights).sum()) * self.danger_radius
+        elif cluster_distance > self.engage_radius:
+            move_x, move_y = cluster_x, cluster_y
+        else:
+            # Обходить скопление по кругу
+            move_x, move_y = -cluster_y, cluster_x
+        self.direction = self.quantize(move_x, move_y)
+
+    @staticmethod
+    def quantize(x: float, y: float) -> Tuple[int, int]:
+        """
+        Привести вектор к ближайшему из восьми направлений клавиатуры.
+
+        Аргументы:
+            x: Составляющая x
+            y: Составляющая y
+
+        Возвращает:
+            (dx, dy), каждая составляющая -1, 0 или 1
+        """
+        if x == 0 and y == 0:
+            return 0, 0
+        return DIRECTIONS[round(math.atan2(y, x) / (math.pi / 4)) % 8]
+
+    def summary(self) -> str:
+        """Строка со стоимостью решений автопилота."""
+        mean_us = self.think_seconds / self.thinks * 1e6 if self.thinks else 0.0
+        return (f"Автопилот ({self.policy}): {self.tick} тиков, {self.thinks} решений по {mean_us:.0f} мкс, "
+                f"{self.level_ups} улучшений")
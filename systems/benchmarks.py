@@ -0,0 +1,348 @@
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from systems.gc_policy import gc_policy
+from systems.scenarios import SURVIVABLE_HEALTH, Scenario, run_ticks, start_scenario
+
+
+# Каталог базовых результатов (по файлу на профиль машины)
+BASELINE_DIR = "benchmarks"
+
+# Тиков на каждый сценарий
+BENCH_TICKS = 600
+
+# Здоровье игрока в замерах: игрок не должен погибнуть посреди замера
+BENCH_HEALTH = SURVIVABLE_HEALTH
+
+# Метрики, по которым ищутся ухудшения (больше — хуже)
+METRICS = ("mean_ms", "p95_ms", "p99_ms", "peak_kb")
+
+
+def _level_benchmarks() -> Dict[str, Scenario]:
+    """Сценарии «персонаж на уровне 10, 20 и 30» для каждого стартового персонажа."""
+    names = {"fat": "Толстяк", "mage": "Маг", "warrior": "Воин", "electromage": "Электромаг"}
+    benchmarks = {}
+    for character, title in names.items():
+        for level in (10, 20, 30):
+            # Примерно половина выборов при повышении уровня уходит в стартовое оружие
+            benchmarks[f"{character}_{level}"] = Scenario(
+                f"{title} {level} уровня, 300 врагов", character,
+                level=level, weapon_levels=level // 2, enemies=300, max_health=BENCH_HEALTH)
+    return benchmarks
+
+
+BENCHMARKS: Dict[str, Scenario] = {
+    **_level_benchmarks(),
+    "crowd_3000": Scenario("Воин в толпе из 3000 врагов", "warrior",
+                           level=5, enemies=3000, max_health=BENCH_HEALTH),
+    "cloud_spam": Scenario("Маг с волшебной палочкой максимального уровня, 500 врагов", "mage",
+                           level=30, weapon_levels=20, enemies=500, max_health=BENCH_HEALTH),
+}
+
+
+class BenchResult(NamedTuple):
+    """
+    Результат одного сценария.
+    """
+    mean_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_kb: float     # Пик памяти Python за прогон (tracemalloc, отдельный прогон)
+    level_ups: int
+
+
+class Regression(NamedTuple):
+    """
+    Ухудшение метрики относительно базового результата.
+    """
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Изменение в долях от базового значения."""
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def machine_profile() -> str:
+    """
+    Название профиля машины по умолчанию (имя компьютера).
+
+    Возвращает:
+        Название, пригодное для имени файла
+    """
+    return re.sub(r"[^\w.-]+", "_", platform.node() or "default")
+
+
+def baseline_path(profile: str) -> str:
+    """Путь к файлу базовых результатов профиля."""
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+
+def run_frames(game, scenario: Scenario, ticks: int) -> Tuple[np.ndarray, int]:
+    """
+    Прогнать сценарий и замерить время кадров.
+
+    Сборщик мусора управляется так же, как в главном цикле: на игровом
+    экране он отключён, а мусор собирается в запасе кадра.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario: Сценарий
+        ticks: Количество тиков
+
+    Возвращает:
+        (время кадров в миллисекундах, количество повышений уровня)
+    """
+    start_scenario(game, scenario)
+    times: List[float] = []
+    frame_started = time.perf_counter()
+
+    def on_tick(tick: int) -> None:
+        nonlocal frame_started
+        work_ms = (time.perf_counter() - frame_started) * 1000
+        times.append(work_ms)
+        gc_policy.end_frame(work_ms)
+        gc_policy.begin_frame(True)
+        frame_started = time.perf_counter()
+
+    gc_policy.on_view_change()
+    gc_policy.begin_frame(True)
+    try:
+        level_ups = run_ticks(game, ticks, on_tick=on_tick).level_ups
+    finally:
+        gc_policy.set_suppressed(False)
+        del game.view_stack[1:]
+    return np.array(times), level_ups
+
+
+def peak_memory(game, scenario: Scenario, ticks: int) -> float:
+    """
+    Прогнать сценарий под tracemalloc и получить пик памяти Python.
+
+    Отслеживание памяти сильно замедляет игру, поэтому время кадров
+    замеряется отдельным прогоном.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario: Сценарий
+        ticks: Количество тиков
+
+    Возвращает:
+        Пик памяти в килобайтах с начала сценария
+    """
+    tracemalloc.start()
+    try:
+        start_scenario(game, scenario)
+        tracemalloc.reset_peak()
+        run_ticks(game, ticks)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+        del game.view_stack[1:]
+
+
+def run_benchmarks(game, names: Sequence[str], ticks: int = BENCH_TICKS,
+                   memory: bool = True) -> Dict[str, BenchResult]:
+    """
+    Прогнать сценарии замера.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        names: Названия сценариев из BENCHMARKS
+        ticks: Тиков на сценарий
+        memory: Замерять ли пик памяти (отдельный прогон)
+
+    Возвращает:
+        Результаты по названиям сценариев
+    """
+    results = {}
+    for name in names:
+        scenario = BENCHMARKS[name]
+        times, level_ups = run_frames(game, scenario, ticks)
+        peak_kb = peak_memory(game, scenario, ticks) if memory else 0.0
+        results[name] = BenchResult(
+            mean_ms=float(times.mean()),
+            p95_ms=float(np.percentile(times, 95)),
+            p99_ms=float(np.percentile(times, 99)),
+            max_ms=float(times.max()),
+            peak_kb=peak_kb,
+            level_ups=level_ups,
+        )
+        print(f"{name}: {format_result(results[name])}", flush=True)
+    return results
+
+
+def format_result(result: BenchResult) -> str:
+    """Строка с метриками результата."""
+    return (f"среднее {result.mean_ms:.2f} мс, p95 {result.p95_ms:.2f}, p99 {result.p99_ms:.2f}, "
+            f"макс. {result.max_ms:.2f}, пик памяти {result.peak_kb:.0f} КБ")
+
+
+def save_results(path: str, profile: str, ticks: int, results: Dict[str, BenchResult]) -> None:
+    """
+    Записать результаты в JSON.
+
+    Аргументы:
+        path: Путь к файлу
+        profile: Профиль машины
+        ticks: Тиков на сценарий
+        results: Результаты по сценариям
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "profile": profile,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "video_driver": pygame.display.get_driver() if pygame.display.get_init() else None,
+        },
+        "ticks": ticks,
+        "results": {name: result._asdict() for name, result in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=1)
+
+
+def load_results(path: str) -> Dict[str, BenchResult]:
+    """
+    Прочитать результаты из JSON.
+
+    Аргументы:
+        path: Путь к файлу
+
+    Возвращает:
+        Результаты по сценариям
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return {name: BenchResult(**values) for name, values in data["results"].items()}
+
+
+def compare(baseline: Dict[str, BenchResult], current: Dict[str, BenchResult],
+            tolerance: float) -> List[Regression]:
+    """
+    Найти ухудшения метрик сверх допуска.
+
+    Аргументы:
+        baseline: Базовые результаты
+        current: Текущие результаты
+        tolerance: Допустимое ухудшение в долях (0.1 — 10%)
+
+    Возвращает:
+        Список ухудшений
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            old, new = getattr(base, metric), getattr(result, metric)
+            # Нулевая память означает, что она не замерялась
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(Regression(name, metric, old, new))
+    return regressions
+
+
+def format_comparison(baseline: Dict[str, BenchResult], current: Dict[str, BenchResult],
+                      regressions: List[Regression]) -> str:
+    """
+    Собрать таблицу сравнения с базовыми результатами.
+
+    Аргументы:
+        baseline: Базовые результаты
+        current: Текущие результаты
+        regressions: Найденные ухудшения
+
+    Возвращает:
+        Текст таблицы
+    """
+    flagged = {(regression.benchmark, regression.metric) for regression in regressions}
+    name_width = max(len(name) for name in current)
+    lines = [f"{'сценарий':<{name_width}}" + "".join(f"{metric:>22}" for metric in METRICS)]
+    for name, result in current.items():
+        base = baseline.get(name)
+        cells = []
+        for metric in METRICS:
+            new = getattr(result, metric)
+            if base is None or not getattr(base, metric):
+                cells.append(f"{new:>22.2f}")
+                continue
+            change = new / getattr(base, metric) - 1
+            mark = " !" if (name, metric) in flagged else "  "
+            cells.append(f"{f'{new:.2f} ({change:+.0%})':>20}{mark}")
+        lines.append(f"{name:<{name_width}}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def bench(game, names: Optional[Sequence[str]], profile: Optional[str], save: bool, tolerance: float,
+          output: Optional[str] = None) -> bool:
+    """
+    Прогнать сценарии и сохранить их как базовые или сравнить с базовыми.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        names: Названия сценариев (None или пусто — все)
+        profile: Профиль машины (None — имя компьютера)
+        save: Сохранить результаты как базовые
+        tolerance: Допустимое ухудшение в долях
+        output: Куда дополнительно записать текущие результаты (None — никуда)
+
+    Возвращает:
+        False, если найдены ухудшения сверх допуска
+    """
+    profile = profile or machine_profile()
+    path = baseline_path(profile)
+    results = run_benchmarks(game, names or list(BENCHMARKS))
+    if output:
+        save_results(output, profile, BENCH_TICKS, results)
+
+    if save or not os.path.exists(path):
+        if os.path.exists(path):
+            # Результаты сценариев, которые не прогонялись, сохраняются
+            results = {**load_results(path), **results}
+        save_results(path, profile, BENCH_TICKS, results)
+        print(f"Базовые результаты профиля {profile}: {path}")
+        return True
+
+    baseline = load_results(path)
+    regressions = compare(baseline, results, tolerance)
+    print(format_comparison(baseline, results, regressions))
+    if regressions:
+        print(f"Ухудшений сверх {tolerance:.0%}: {len(regressions)}")
+    return not regressions
+
+
+if __name__ == "__main__":
+    # Сравнение двух файлов результатов: python -m systems.benchmarks base.json new.json
+    parser = argparse.ArgumentParser(description="Сравнить результаты замеров с базовыми")
+    parser.add_argument("baseline", help="файл базовых результатов")
+    parser.add_argument("current", help="файл новых результатов")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="допустимое ухудшение в процентах")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    regressions = compare(baseline, current, args.tolerance / 100)
+    print(format_comparison(baseline, current, regressions))
+    if regressions:
+        print(f"Ухудшений сверх {args.tolerance:.0f}%: {len(regressions)}")
+    sys.exit(1 if regressions else 0)
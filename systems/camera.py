@@ -0,0 +1,113 @@
+from typing import Tuple
+
+import numpy as np
+
+
+class Camera:
+    """
+    Камера игрового экрана.
+
+    Хранит смещение между мировыми и экранными координатами:
+    экранная позиция = мировая позиция + смещение. Игрок всегда находится
+    в центре экрана, поэтому его мировая позиция выводится из смещения.
+    Вся игровая логика работает в мировых координатах, а камера применяется
+    только при отрисовке.
+    """
+    def __init__(self, screen_size: Tuple[int, int]):
+        """
+        Инициализация камеры.
+
+        Аргументы:
+            screen_size: Размер экрана (ширина, высота)
+        """
+        self.screen_width, self.screen_height = screen_size
+
+        # Смещение камеры (мировые координаты -> экранные)
+        self.x = 0.0
+        self.y = 0.0
+
+    @property
+    def offset(self) -> Tuple[float, float]:
+        """Смещение камеры (x, y)."""
+        return self.x, self.y
+
+    @property
+    def screen_center(self) -> Tuple[int, int]:
+        """Центр экрана, где всегда отрисовывается игрок."""
+        return self.screen_width // 2, self.screen_height // 2
+
+    def move(self, dx: float, dy: float) -> None:
+        """
+        Сдвинуть камеру.
+
+        Аргументы:
+            dx: Сдвиг смещения по x
+            dy: Сдвиг смещения по y
+        """
+        self.x += dx
+        self.y += dy
+
+    def center_world(self) -> Tuple[float, float]:
+        """
+        Получить мировую позицию центра экрана (позицию игрока).
+
+        Возвращает:
+            Кортеж (x, y) в мировых координатах
+        """
+        return self.screen_width // 2 - self.x, self.screen_height // 2 - self.y
+
+    def world_to_screen(self, position: Tuple[float, float]) -> Tuple[int, int]:
+        """
+        Перевести мировую позицию в экранную.
+
+        Аргументы:
+            position: Позиция (x, y) в мировых координатах
+
+        Возвращает:
+            Позиция (x, y) на экране
+        """
+        return int(position[0] + self.x), int(position[1] + self.y)
+
+    def screen_to_world(self, position: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        Перевести экранную позицию (например, курсор мыши) в мировую.
+
+        Аргументы:
+            position: Позиция (x, y) на экране
+
+        Возвращает:
+            Позиция (x, y) в мировых координатах
+        """
+        return position[0] - self.x, position[1] - self.y
+
+    def world_to_screen_many(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Перевести массив мировых позиций в экранные одним действием.
+
+        Аргументы:
+            positions: Массив формы (N, 2) в мировых координатах
+
+        Возвращает:
+            Целочисленный массив формы (N, 2) с экранными позициями
+        """
+        return (positions + (self.x, self.y)).astype(np.int64)
+
+    def visible_mask(self, screen_positions: np.ndarray, half_sizes: np.ndarray, margin: int = 0) -> np.ndarray:
+        """
+        Определить, какие объекты хотя бы частично попадают на экран.
+
+        Аргументы:
+            screen_positions: Центры объектов на экране формы (N, 2)
+            half_sizes: Половины размеров объектов формы (N, 2)
+            margin: Дополнительный запас вокруг экрана в пикселях
+
+        Возвращает:
+            Булев массив формы (N,)
+        """
+        reach = half_sizes + margin
+        return (
+            (screen_positions[:, 0] + reach[:, 0] > 0)
+            & (screen_positions[:, 0] - reach[:, 0] < self.screen_width)
+            & (screen_positions[:, 1] + reach[:, 1] > 0)
+            & (screen_positions[:, 1] - reach[:, 1] < self.screen_height)
+        )
@@ -0,0 +1,71 @@
+from typing import Tuple
+
+import numpy as np
+import pygame
+
+from systems.archetypes import world
+from systems.camera import Camera
+from systems.controls import controls
+from systems.damage import DamageBuffer
+from systems.spatial import EnemySnapshot
+
+
+class CombatContext:
+    """
+    Данные боя на один кадр, общие для всего оружия.
+
+    Собирается игровым экраном один раз за кадр после движения игрока.
+    Позиция игрока и массивы позиций врагов хранятся в мировых координатах,
+    поэтому оружию не нужно переводить каждого врага в экранные координаты
+    и обратно; камера нужна только для прицеливания мышью и отрисовки.
+    """
+    def __init__(self, camera: Camera, enemies, all_sprites, damage_buffer: DamageBuffer):
+        """
+        Собрать контекст кадра.
+
+        Аргументы:
+            camera: Камера игрового экрана
+            enemies: Группа врагов
+            all_sprites: Группа спрайтов, кроме врагов (игрок и снаряды)
+            damage_buffer: Буфер событий урона за кадр
+        """
+        self.camera = camera
+        self.enemies = enemies
+        self.all_sprites = all_sprites
+        self.damage_buffer = damage_buffer
+
+        # Позиция игрока в мировых координатах
+        self.player_pos = camera.center_world()
+
+        # Позиции и размеры всех врагов на начало кадра
+        self.snapshot = EnemySnapshot(world.enemies)
+
+    @property
+    def enemy_positions(self) -> np.ndarray:
+        """Центры всех врагов формы (N, 2) в мировых координатах."""
+        return self.snapshot.positions
+
+    def aim_position(self) -> Tuple[float, float]:
+        """
+        Получить точку прицеливания (курсор мыши или подменённый источник
+        управления) в мировых координатах.
+
+        Возвращает:
+            Кортеж (x, y) в мировых координатах
+        """
+        return self.camera.screen_to_world(controls.aim_screen(self.camera))
+
+    def direction_to(self, target: Tuple[float, float]) -> pygame.math.Vector2:
+        """
+        Получить нормализованное направление от игрока к точке.
+
+        Аргументы:
+            target: Точка (x, y) в мировых координатах
+
+        Возвращает:
+            Единичный вектор (или нулевой, если точка совпадает с игроком)
+        """
+        direction = pygame.math.Vector2(target[0] - self.player_pos[0], target[1] - self.player_pos[1])
+        if direction.length() > 0:
+            direction = direction.normalize()
+        return direction
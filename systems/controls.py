@@ -0,0 +1,163 @@
+import random
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from systems.camera import Camera
+from systems.display import display
+
+
+class KeyboardMouse:
+    """
+    Управление с клавиатуры (WASD) и мыши.
+    """
+    def movement(self, camera: Optional[Camera]) -> Tuple[int, int]:
+        """
+        Получить направление движения за тик.
+
+        Аргументы:
+            camera: Камера игрового экрана (не нужна)
+
+        Возвращает:
+            (dx, dy), каждая составляющая -1, 0 или 1
+        """
+        keys = pygame.key.get_pressed()
+        dx = dy = 0
+        if keys[pygame.K_w]:
+            dy = -1
+        if keys[pygame.K_s]:
+            dy = 1
+        if keys[pygame.K_a]:
+            dx = -1
+        if keys[pygame.K_d]:
+            dx = 1
+        return dx, dy
+
+    def aim_screen(self, camera: Camera) -> Tuple[int, int]:
+        """
+        Получить точку прицеливания в координатах поверхности отрисовки.
+
+        Аргументы:
+            camera: Камера игрового экрана (не нужна)
+
+        Возвращает:
+            Позиция курсора (x, y)
+        """
+        return display.mouse_pos()
+
+    def choose_level_up(self, level_up_view) -> bool:
+        """Улучшение выбирает игрок кнопками на экране."""
+        return False
+
+
+class ReplayInput:
+    """
+    Записанное управление: по строке (dx, dy, прицел x, прицел y) на тик.
+
+    Тиком считается вызов movement(): он раз за обновление игрового экрана
+    вызывается игроком до стрельбы, поэтому прицел, запрошенный оружием
+    после него, относится к тому же тику. После конца записи игрок стоит на
+    месте, а прицел остаётся последним.
+    """
+    def __init__(self, track: np.ndarray):
+        """
+        Аргументы:
+            track: Массив формы (тики, 4)
+        """
+        self.track = track
+        self.tick = -1
+
+    def movement(self, camera: Optional[Camera]) -> Tuple[int, int]:
+        self.tick += 1
+        if self.tick >= len(self.track):
+            return 0, 0
+        dx, dy = self.track[self.tick, :2].tolist()
+        return dx, dy
+
+    def aim_screen(self, camera: Camera) -> Tuple[int, int]:
+        if not len(self.track):
+            return 0, 0
+        x, y = self.track[min(max(self.tick, 0), len(self.track) - 1), 2:].tolist()
+        return x, y
+
+    def choose_level_up(self, level_up_view) -> bool:
+        # Выбор делает тот, кто прогоняет запись (run_ticks)
+        return False
+
+
+def scripted_track(ticks: int, screen_size: Sequence[int], seed: int = 1, hold: int = 60) -> np.ndarray:
+    """
+    Создать повторяемую запись управления: новое направление и точка
+    прицеливания раз в hold тиков.
+
+    Генератор случайных чисел свой, поэтому запись не зависит от
+    состояния модуля random игры.
+
+    Аргументы:
+        ticks: Количество тиков
+        screen_size: Размер поверхности отрисовки
+        seed: Зерно генератора
+        hold: Сколько тиков держать направление
+
+    Возвращает:
+        Массив формы (ticks, 4) для ReplayInput
+    """
+    rng = random.Random(seed)
+    width, height = screen_size
+    track = np.zeros((ticks, 4), dtype=np.int32)
+    for start in range(0, ticks, hold):
+        track[start:start + hold] = (rng.randint(-1, 1), rng.randint(-1, 1),
+                                     rng.randrange(width), rng.randrange(height))
+    return track
+
+
+class Controls:
+    """
+    Источник управления игроком.
+
+    По умолчанию это клавиатура и мышь; для проверок и автоматических
+    прогонов источник подменяется (use()). Источник — любой объект с
+    методами movement(camera), aim_screen(camera) и choose_level_up(view);
+    камера нужна источникам, которые сами смотрят на игру (автопилот).
+    """
+    def __init__(self):
+        self.source = KeyboardMouse()
+
+    def use(self, source) -> object:
+        """
+        Подменить источник управления.
+
+        Аргументы:
+            source: Новый источник (None — клавиатура и мышь)
+
+        Возвращает:
+            Прежний источник
+        """
+        previous = self.source
+        self.source = source if source is not None else KeyboardMouse()
+        return previous
+
+    def movement(self, camera: Optional[Camera] = None) -> Tuple[int, int]:
+        """Направление движения игрока за тик (dx, dy)."""
+        return self.source.movement(camera)
+
+    def aim_screen(self, camera: Camera) -> Tuple[int, int]:
+        """Точка прицеливания в координатах поверхности отрисовки."""
+        return self.source.aim_screen(camera)
+
+    def choose_level_up(self, level_up_view) -> bool:
+        """
+        Дать источнику выбрать улучшение на экране повышения уровня.
+
+        Аргументы:
+            level_up_view: Экран повышения уровня
+
+        Возвращает:
+            True, если источник сделал выбор (экран уже закрыт)
+        """
+        return self.source.choose_level_up(level_up_view)
+
+
+# Управление текущей игры
+controls = Controls()
@@ -0,0 +1,83 @@
+from collections import Counter
+from typing import Dict, List, NamedTuple
+
+
+class DamageEvent(NamedTuple):
+    """
+    Запись об уроне, нанесённом врагу за кадр.
+    """
+    enemy: object
+    amount: float
+    source: str
+
+
+class DamageReport(NamedTuple):
+    """
+    Итог разрешения урона за кадр.
+    """
+    defeated: List
+    score: float
+    damage_by_source: Dict[str, float]
+    kills_by_source: Dict[str, int]
+
+
+class DamageBuffer:
+    """
+    Буфер событий урона за кадр.
+
+    Оружие только добавляет записи (враг, урон, источник), а применяет их
+    игровой экран одним проходом после обновления оружия.
+    """
+    def __init__(self):
+        self.events: List[DamageEvent] = []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, enemy, amount: float, source: str) -> None:
+        """
+        Добавить событие урона.
+
+        Аргументы:
+            enemy: Враг, которому нанесён урон
+            amount: Количество урона
+            source: Название источника урона (обычно имя оружия)
+        """
+        self.events.append(DamageEvent(enemy, amount, source))
+
+    def resolve(self) -> DamageReport:
+        """
+        Применить накопленный урон и очистить буфер.
+
+        Урон по каждому врагу суммируется и применяется один раз, поэтому
+        полоска здоровья обновляется не чаще раза за кадр, а каждый враг
+        попадает в список поверженных не более одного раза.
+
+        Возвращает:
+            Отчёт с поверженными врагами, суммой очков и статистикой по источникам
+        """
+        events, self.events = self.events, []
+
+        # Суммарный урон по врагу и источник последнего удара (для статистики убийств)
+        totals: Dict[object, float] = {}
+        last_source: Dict[object, str] = {}
+        damage_by_source: Counter = Counter()
+        for enemy, amount, source in events:
+            totals[enemy] = totals.get(enemy, 0) + amount
+            last_source[enemy] = source
+            damage_by_source[source] += amount
+
+        defeated = []
+        kills_by_source: Counter = Counter()
+        score = 0.0
+        for enemy, amount in totals.items():
+            # Враг мог быть убран другим способом до разрешения урона
+            if not enemy.alive():
+                continue
+
+            if enemy.take_damage(amount):
+                defeated.append(enemy)
+                kills_by_source[last_source[enemy]] += 1
+                score += enemy.score_value()
+
+        return DamageReport(defeated, score, dict(damage_by_source), dict(kills_by_source))
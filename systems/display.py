@@ -0,0 +1,54 @@
+from typing import Optional, Tuple
+
+import pygame
+from pygame import Surface
+
+
+class Display:
+    """
+    Окно игры и поверхность, в которую рисуют экраны.
+
+    Экраны всегда рисуют в логическом разрешении (1280×720): от него
+    зависят камера, кольца спавна и уровней детализации, интерфейс.
+    С pygame.SCALED окно можно растягивать, а масштабирование кадра и
+    перевод координат мыши выполняет SDL, не добавляя работы кадру.
+    Уменьшенного разрешения отрисовки нет: масштабирующий blit при выводе
+    только удорожал кадр, а мир и интерфейс всё равно рисовались в 1280×720.
+    """
+    def __init__(self):
+        self.window: Optional[Surface] = None
+        self.use_scaled = False
+
+    def open(self, logical_size: Tuple[int, int], use_scaled: bool = False) -> Surface:
+        """
+        Создать окно.
+
+        Аргументы:
+            logical_size: Логическое разрешение (ширина, высота), в котором рисуют экраны
+            use_scaled: Растягивать кадр до размера окна средствами SDL (pygame.SCALED)
+
+        Возвращает:
+            Поверхность окна, в которую должны рисовать экраны
+        """
+        self.use_scaled = use_scaled
+        self.window = pygame.display.set_mode(logical_size, pygame.SCALED if use_scaled else 0)
+        return self.window
+
+    def present(self) -> None:
+        """
+        Вывести кадр на экран.
+        """
+        pygame.display.flip()
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        """
+        Получить позицию мыши в координатах поверхности отрисовки.
+
+        Возвращает:
+            Позиция (x, y); с pygame.SCALED SDL уже переводит её в логическое разрешение
+        """
+        return pygame.mouse.get_pos()
+
+
+# Окно текущей игры
+display = Display()
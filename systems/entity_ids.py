@@ -0,0 +1,159 @@
+from array import array
+from typing import List
+
+import numpy as np
+
+
+class EntityAllocator:
+    """
+    Выдаёт идентификаторы сущностей с поколениями.
+
+    Идентификатор — это целое число, в младших битах которого хранится индекс
+    слота, а в старших — поколение слота. Освобождённый слот переиспользуется,
+    но с новым поколением, поэтому старый идентификатор больше никогда не
+    совпадёт с новой сущностью (в отличие от id(), который CPython
+    переиспользует сразу после удаления объекта).
+    """
+    INDEX_BITS = 20
+    INDEX_MASK = (1 << INDEX_BITS) - 1
+
+    def __init__(self):
+        # Текущее поколение каждого слота
+        self.generations = array('I')
+        self.free_indices: List[int] = []
+        self.live_count = 0
+
+    @classmethod
+    def index_of(cls, entity_id: int) -> int:
+        """
+        Получить индекс слота для прямого доступа к массивам хранилища.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+
+        Возвращает:
+            Индекс слота
+        """
+        return entity_id & cls.INDEX_MASK
+
+    @classmethod
+    def generation_of(cls, entity_id: int) -> int:
+        """
+        Получить поколение, закодированное в идентификаторе.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+
+        Возвращает:
+            Поколение слота на момент выдачи идентификатора
+        """
+        return entity_id >> cls.INDEX_BITS
+
+    @property
+    def capacity(self) -> int:
+        """Количество слотов, когда-либо выданных аллокатором."""
+        return len(self.generations)
+
+    def allocate(self) -> int:
+        """
+        Выдать новый идентификатор.
+
+        Возвращает:
+            Идентификатор сущности
+        """
+        if self.free_indices:
+            index = self.free_indices.pop()
+        else:
+            index = len(self.generations)
+            if index > self.INDEX_MASK:
+                raise RuntimeError("Превышено максимальное количество одновременно живых сущностей")
+            self.generations.append(0)
+
+        self.live_count += 1
+        return (self.generations[index] << self.INDEX_BITS) | index
+
+    def release(self, entity_id: int) -> None:
+        """
+        Освободить идентификатор. Повторное освобождение ничего не делает.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+        """
+        if not self.is_alive(entity_id):
+            return
+
+        index = self.index_of(entity_id)
+        self.generations[index] += 1
+        self.free_indices.append(index)
+        self.live_count -= 1
+
+    def is_alive(self, entity_id: int) -> bool:
+        """
+        Проверить, принадлежит ли идентификатор живой сущности.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+
+        Возвращает:
+            True, если слот не освобождался с момента выдачи идентификатора
+        """
+        index = self.index_of(entity_id)
+        return index < len(self.generations) and self.generations[index] == self.generation_of(entity_id)
+
+
+class HitSet:
+    """
+    Компактное множество поражённых сущностей.
+
+    Битовая маска по индексам слотов даёт быструю отрицательную проверку,
+    а небольшой массив полных идентификаторов подтверждает поколение.
+    """
+    def __init__(self):
+        self.mask = 0
+        self.entity_ids = array('q')
+
+    def __len__(self) -> int:
+        return len(self.entity_ids)
+
+    def __contains__(self, entity_id: int) -> bool:
+        if not (self.mask >> EntityAllocator.index_of(entity_id)) & 1:
+            return False
+        return entity_id in self.entity_ids
+
+    def add(self, entity_id: int) -> None:
+        """
+        Добавить сущность в множество.
+
+        Аргументы:
+            entity_id: Идентификатор сущности
+        """
+        if entity_id in self:
+            return
+        self.mask |= 1 << EntityAllocator.index_of(entity_id)
+        self.entity_ids.append(entity_id)
+
+    def clear(self) -> None:
+        """Очистить множество."""
+        self.mask = 0
+        del self.entity_ids[:]
+
+    def contains_many(self, entity_ids: np.ndarray) -> np.ndarray:
+        """
+        Проверить принадлежность сразу для массива идентификаторов.
+
+        Аргументы:
+            entity_ids: Массив идентификаторов
+
+        Возвращает:
+            Булев массив той же длины
+        """
+        if not self.entity_ids:
+            return np.zeros(len(entity_ids), dtype=bool)
+        return np.isin(entity_ids, np.frombuffer(self.entity_ids, dtype=np.int64))
+
+
+# Отдельные пространства идентификаторов для врагов, снарядов, эффектов и роев
+enemy_ids = EntityAllocator()
+projectile_ids = EntityAllocator()
+effect_ids = EntityAllocator()
+swarm_ids = EntityAllocator()
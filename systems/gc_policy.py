@@ -0,0 +1,189 @@
+import gc
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class GcPolicy:
+    """
+    Управление сборщиком циклического мусора вокруг игрового цикла.
+
+    - После загрузки ресурсов и при смене экрана живые объекты собираются
+      и замораживаются (gc.freeze), чтобы сборщик больше их не обходил.
+    - На экранах с флагом suppress_gc (игровой экран) автоматическая сборка
+      отключается, чтобы она не срабатывала посреди кадра.
+    - Вместо неё молодое поколение собирается в конце кадра, если до
+      следующего кадра остался запас времени; раз в young_interval таких
+      сборок собирается и поколение 1. Если запаса долго нет и объектов
+      накопилось слишком много, сборка выполняется всё равно.
+    - Полная сборка выполняется при смене экрана.
+
+    Длительность каждой сборки записывается через gc.callbacks.
+    """
+    def __init__(self, frame_budget_ms: float = 1000 / 60, min_slack_ms: float = 4.0,
+                 young_interval: int = 10, gen0_limit: int = 20000):
+        """
+        Инициализация политики сборки мусора.
+
+        Аргументы:
+            frame_budget_ms: Длительность кадра при целевой частоте
+            min_slack_ms: Запас времени, при котором можно собирать мусор
+            young_interval: Раз во сколько сборок в запасе кадра собирать поколение 1
+            gen0_limit: Количество новых объектов, после которого сборка
+                выполняется даже без запаса времени
+        """
+        self.frame_budget_ms = frame_budget_ms
+        self.min_slack_ms = min_slack_ms
+        self.young_interval = young_interval
+        self.gen0_limit = gen0_limit
+
+        self.installed = False
+        self.suppressed = False
+        self.slack_collections = 0
+        self.forced_collections = 0
+
+        # Паузы сборщика
+        self.collect_started: Optional[float] = None
+        self.pause_count = 0
+        self.pause_total_ms = 0.0
+        self.pause_max_ms = 0.0
+        self.recent_pauses = deque(maxlen=120)  # (поколение, мс)
+
+        # Паузы за текущий кадр (для телеметрии)
+        self.frame_pauses = 0
+        self.frame_pause_ms = 0.0
+
+    def install(self) -> None:
+        """
+        Подписаться на события сборщика.
+        """
+        if not self.installed:
+            gc.callbacks.append(self.on_gc)
+            self.installed = True
+
+    def uninstall(self) -> None:
+        """
+        Отписаться от событий сборщика и вернуть автоматическую сборку.
+        """
+        if self.installed:
+            gc.callbacks.remove(self.on_gc)
+            self.installed = False
+        self.set_suppressed(False)
+
+    def on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        """
+        Обработчик gc.callbacks: замерить длительность сборки.
+
+        Аргументы:
+            phase: "start" или "stop"
+            info: Сведения о сборке (generation, collected, uncollectable)
+        """
+        if phase == "start":
+            self.collect_started = time.perf_counter()
+            return
+        if self.collect_started is None:
+            return
+
+        pause_ms = (time.perf_counter() - self.collect_started) * 1000
+        self.collect_started = None
+
+        self.pause_count += 1
+        self.pause_total_ms += pause_ms
+        self.pause_max_ms = max(self.pause_max_ms, pause_ms)
+        self.recent_pauses.append((info["generation"], pause_ms))
+        self.frame_pauses += 1
+        self.frame_pause_ms += pause_ms
+
+    def freeze(self) -> None:
+        """
+        Собрать мусор и заморозить все живые объекты.
+
+        Вызывается после загрузки ресурсов: долгоживущие объекты (модули,
+        звуки, кэши изображений) переносятся в постоянное поколение и
+        больше не обходятся сборщиком.
+        """
+        gc.collect()
+        gc.freeze()
+
+    def set_suppressed(self, suppressed: bool) -> None:
+        """
+        Включить или отключить автоматическую сборку.
+
+        Аргументы:
+            suppressed: True, чтобы отключить автоматическую сборку
+        """
+        if suppressed == self.suppressed:
+            return
+        self.suppressed = suppressed
+        if suppressed:
+            gc.disable()
+        else:
+            gc.enable()
+
+    def begin_frame(self, suppress: bool) -> None:
+        """
+        Начать кадр.
+
+        Аргументы:
+            suppress: Отключить ли автоматическую сборку на время кадра
+        """
+        self.frame_pauses = 0
+        self.frame_pause_ms = 0.0
+        self.set_suppressed(suppress)
+
+    def end_frame(self, work_ms: float) -> None:
+        """
+        Закончить кадр и собрать мусор, если есть запас времени.
+
+        Аргументы:
+            work_ms: Сколько миллисекунд занял кадр (без ожидания)
+        """
+        if not self.suppressed:
+            return
+
+        young = gc.get_count()[0]
+        if young >= self.gen0_limit:
+            # Запаса долго не было: не давать мусору копиться бесконечно
+            gc.collect(0)
+            self.forced_collections += 1
+            return
+
+        # Собирать только тогда, когда автоматическая сборка уже сработала бы
+        if young < gc.get_threshold()[0]:
+            return
+        if self.frame_budget_ms - work_ms < self.min_slack_ms:
+            return
+
+        self.slack_collections += 1
+        generation = 1 if self.slack_collections % self.young_interval == 0 else 0
+        gc.collect(generation)
+
+    def on_view_change(self) -> None:
+        """
+        Полная сборка при смене экрана: заморозка снимается, мусор
+        собирается целиком и оставшиеся объекты снова замораживаются.
+        """
+        gc.unfreeze()
+        self.freeze()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Получить статистику пауз сборщика.
+
+        Возвращает:
+            Словарь: pauses, total_ms, max_ms, mean_ms, slack_collections,
+            forced_collections, frozen
+        """
+        return {
+            "pauses": self.pause_count,
+            "total_ms": self.pause_total_ms,
+            "max_ms": self.pause_max_ms,
+            "mean_ms": self.pause_total_ms / self.pause_count if self.pause_count else 0.0,
+            "slack_collections": self.slack_collections,
+            "forced_collections": self.forced_collections,
+            "frozen": gc.get_freeze_count(),
+        }
+
+
+# Политика сборки мусора текущей игры
+gc_policy = GcPolicy()
@@ -0,0 +1,369 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from systems.archetypes import world
+from systems.controls import ReplayInput, controls, scripted_track
+from systems.quality import quality
+from systems.scenarios import SCENARIOS, run_ticks, start_scenario
+
+
+# Каталог эталонных трасс
+GOLDEN_DIR = "golden"
+
+# Составляющие состояния: таблица мира и её поля. Сущности упорядочиваются
+# по значениям, а не по идентификаторам, чтобы другая раздача строк и
+# идентификаторов не считалась изменением игры.
+TABLE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "enemies": ("pos_x", "pos_y", "health"),
+    "projectiles": ("pos_x", "pos_y"),
+    "effects": ("pos_x", "pos_y", "radius"),
+    "swarms": ("pos_x", "pos_y", "health", "members"),
+}
+
+# Поля игрока и игрового экрана
+PLAYER_FIELDS = ("health", "max_health", "experience", "level", "score", "kills", "camera_x", "camera_y")
+
+COMPONENTS = tuple(TABLE_FIELDS) + ("player",)
+
+
+class Divergence(NamedTuple):
+    """
+    Первое расхождение с эталоном.
+    """
+    tick: int
+    component: str             # enemies, projectiles, effects, swarms или player
+    index: int                 # Номер сущности в каноническом порядке
+    golden: Optional[Dict[str, float]]    # None — сущности нет в эталоне
+    current: Optional[Dict[str, float]]   # None — сущности нет в текущем прогоне
+    entity_id: Optional[int]   # Идентификатор сущности в текущем прогоне
+
+    def describe(self) -> str:
+        """Текстовое описание расхождения."""
+        lines = [f"Первое расхождение: тик {self.tick}, {self.component}, сущность №{self.index}"
+                 + (f" (id {self.entity_id})" if self.entity_id is not None else "")]
+        if self.golden is None:
+            lines.append(f"    лишняя сущность: {self.current}")
+        elif self.current is None:
+            lines.append(f"    пропала сущность: {self.golden}")
+        else:
+            for field, value in self.golden.items():
+                if value != self.current[field]:
+                    lines.append(f"    {field}: эталон {value!r}, сейчас {self.current[field]!r}")
+        return "\n".join(lines)
+
+
+class TickState(NamedTuple):
+    """
+    Каноническое состояние игры на одном тике.
+    """
+    digest: int
+    values: Dict[str, np.ndarray]     # Составляющая -> массив (сущности, поля)
+    rows: Dict[str, np.ndarray]       # Составляющая -> строки таблицы в том же порядке
+
+
+def capture_state(game_view) -> TickState:
+    """
+    Снять каноническое состояние игрового экрана и его хеш.
+
+    Аргументы:
+        game_view: Игровой экран
+
+    Возвращает:
+        Состояние тика
+    """
+    values = {}
+    rows_by_component = {}
+    for name, fields in TABLE_FIELDS.items():
+        table = getattr(world, name)
+        rows = table.live_rows()
+        state = np.empty((len(rows), len(fields)), dtype=np.float64)
+        for column, field in enumerate(fields):
+            state[:, column] = table[field][rows]
+        # Порядок по значениям: первое поле главное
+        order = np.lexsort(state.T[::-1]) if len(rows) else rows
+        values[name] = state[order]
+        rows_by_component[name] = rows[order]
+
+    player = game_view.player
+    values["player"] = np.array([[
+        player.current_health, player.max_health, player.score, player.current_level,
+        game_view.score, game_view.kills, game_view.camera.x, game_view.camera.y,
+    ]], dtype=np.float64)
+    rows_by_component["player"] = np.zeros(1, dtype=np.int64)
+
+    digest = hashlib.blake2b(digest_size=8)
+    for name in COMPONENTS:
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(values[name]).tobytes())
+    return TickState(int.from_bytes(digest.digest(), "little"), values, rows_by_component)
+
+
+class GoldenTrace:
+    """
+    Эталонная трасса: хеш состояния на каждом тике, само состояние (чтобы
+    показать, какая сущность разошлась) и записанное управление.
+    """
+    def __init__(self, scenario_name: str, inputs: np.ndarray):
+        """
+        Аргументы:
+            scenario_name: Название сценария из SCENARIOS
+            inputs: Управление по тикам для ReplayInput
+        """
+        self.scenario_name = scenario_name
+        self.inputs = inputs
+        self.digests: List[int] = []
+        self.states: Dict[str, List[np.ndarray]] = {name: [] for name in COMPONENTS}
+
+    @property
+    def ticks(self) -> int:
+        return len(self.inputs)
+
+    def append(self, state: TickState) -> None:
+        """Добавить состояние очередного тика."""
+        self.digests.append(state.digest)
+        for name in COMPONENTS:
+            self.states[name].append(state.values[name])
+
+    def save(self, path: str) -> None:
+        """
+        Записать трассу в файл .npz.
+
+        Аргументы:
+            path: Путь к файлу
+        """
+        arrays = {
+            "digests": np.array(self.digests, dtype=np.uint64),
+            "inputs": self.inputs,
+            "meta": np.array(json.dumps({"scenario": self.scenario_name, "player_fields": PLAYER_FIELDS,
+                                         "table_fields": TABLE_FIELDS})),
+        }
+        for name, states in self.states.items():
+            arrays[name] = np.concatenate(states) if states else np.empty((0, 0))
+            arrays[name + "_offsets"] = np.cumsum([0] + [len(state) for state in states])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "GoldenTrace":
+        """
+        Прочитать трассу из файла .npz.
+
+        Аргументы:
+            path: Путь к файлу
+
+        Возвращает:
+            Трасса
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            trace = cls(meta["scenario"], data["inputs"])
+            trace.digests = data["digests"].tolist()
+            for name in COMPONENTS:
+                states, offsets = data[name], data[name + "_offsets"]
+                trace.states[name] = [states[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+        return trace
+
+
+def field_names(component: str) -> Tuple[str, ...]:
+    """Названия полей составляющей состояния."""
+    return PLAYER_FIELDS if component == "player" else TABLE_FIELDS[component]
+
+
+def unmatched_rows(rows: np.ndarray, other: np.ndarray) -> List[int]:
+    """
+    Индексы строк, которым нет точной пары в другом массиве.
+
+    Аргументы:
+        rows: Строки состояния
+        other: Строки состояния другой стороны
+
+    Возвращает:
+        Индексы строк rows без пары
+    """
+    available = Counter(row.tobytes() for row in other)
+    unmatched = []
+    for index, row in enumerate(rows):
+        key = row.tobytes()
+        if available[key]:
+            available[key] -= 1
+        else:
+            unmatched.append(index)
+    return unmatched
+
+
+def find_divergence(tick: int, golden: Dict[str, np.ndarray], state: TickState) -> Divergence:
+    """
+    Найти первую разошедшуюся сущность на тике.
+
+    Аргументы:
+        tick: Номер тика
+        golden: Эталонное состояние тика по составляющим
+        state: Текущее состояние тика
+
+    Возвращает:
+        Расхождение
+    """
+    for name in COMPONENTS:
+        expected, actual = golden[name], state.values[name]
+        if np.array_equal(expected, actual):
+            continue
+
+        # Сущности, которых нет на другой стороне (с учётом одинаковых)
+        unmatched_golden = unmatched_rows(expected, actual)
+        unmatched_current = unmatched_rows(actual, expected)
+
+        fields = field_names(name)
+        golden_row = current_row = None
+        if unmatched_current:
+            index = unmatched_current[0]
+            current_row = dict(zip(fields, actual[index].tolist()))
+            if unmatched_golden:
+                # Та же сущность в эталоне — ближайшая по позиции из несовпавших
+                candidates = expected[unmatched_golden]
+                distances = np.abs(candidates[:, :2] - actual[index, :2]).sum(axis=1)
+                golden_row = dict(zip(fields, candidates[distances.argmin()].tolist()))
+        else:
+            index = unmatched_golden[0]
+            golden_row = dict(zip(fields, expected[index].tolist()))
+
+        entity_id = None
+        if name != "player" and current_row is not None:
+            table = getattr(world, name)
+            entity_id = int(table.entity_ids_at(state.rows[name][index:index + 1])[0])
+        return Divergence(tick, name, index, golden_row, current_row, entity_id)
+    # Хеши разошлись, а значения совпали: такого быть не должно
+    return Divergence(tick, "digest", 0, None, None, None)
+
+
+def run_trace(game, scenario_name: str, inputs: np.ndarray, on_state) -> None:
+    """
+    Прогнать сценарий с записанным управлением, передавая состояние каждого тика.
+
+    Всё, что зависит от времени и машины, отключено: качество графики
+    зафиксировано на полном, планировщик решений врагов и регулятор спавна
+    не подстраиваются под время, а кадры не отрисовываются.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario_name: Название сценария из SCENARIOS
+        inputs: Управление по тикам
+        on_state: Функция (тик, состояние); возвращает True, чтобы остановить прогон
+    """
+    override = quality.override
+    quality.set_override(quality.FULL)
+    source = controls.use(ReplayInput(inputs))
+    try:
+        game_view = start_scenario(game, SCENARIOS[scenario_name])
+        game_view.ai_scheduler.adaptive = False
+        # Регулятор спавна не откладывает врагов из-за времени кадра
+        game_view.spawn_governor.budget_ms = float("inf")
+
+        stopped = False
+
+        def on_tick(tick: int) -> None:
+            nonlocal stopped
+            if not stopped:
+                stopped = bool(on_state(tick, capture_state(game_view)))
+
+        # Прогон кусками, чтобы остановиться вскоре после расхождения
+        done = 0
+        while done < len(inputs) and not stopped:
+            chunk = min(60, len(inputs) - done)
+            result = run_ticks(game, chunk, render=False, on_tick=lambda tick: on_tick(done + tick))
+            done += result.ticks
+            if result.game_over:
+                break
+    finally:
+        controls.use(source)
+        quality.set_override(override)
+        del game.view_stack[1:]
+
+
+def record_golden(game, scenario_name: str, ticks: int, path: str) -> GoldenTrace:
+    """
+    Записать эталонную трассу сценария.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario_name: Название сценария из SCENARIOS
+        ticks: Количество тиков
+        path: Путь к файлу трассы
+
+    Возвращает:
+        Трасса
+    """
+    scenario = SCENARIOS[scenario_name]
+    trace = GoldenTrace(scenario_name, scripted_track(ticks, game.screen.get_size(), seed=scenario.seed))
+    run_trace(game, scenario_name, trace.inputs, lambda tick, state: trace.append(state))
+    trace.save(path)
+    return trace
+
+
+def verify_golden(game, path: str) -> Optional[Divergence]:
+    """
+    Прогнать сценарий эталонной трассы и сравнить хеши состояния по тикам.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        path: Путь к файлу трассы
+
+    Возвращает:
+        Первое расхождение или None, если трасса совпала
+    """
+    trace = GoldenTrace.load(path)
+    found: List[Divergence] = []
+
+    def on_state(tick: int, state: TickState) -> bool:
+        if state.digest == trace.digests[tick]:
+            return False
+        golden = {name: trace.states[name][tick] for name in COMPONENTS}
+        found.append(find_divergence(tick, golden, state))
+        return True
+
+    run_trace(game, trace.scenario_name, trace.inputs, on_state)
+    return found[0] if found else None
+
+
+def golden_path(scenario_name: str) -> str:
+    """Путь к эталонной трассе сценария по умолчанию."""
+    return os.path.join(GOLDEN_DIR, f"{scenario_name}.npz")
+
+
+def golden(game, scenario_name: str, ticks: int, save: bool) -> bool:
+    """
+    Записать эталонную трассу сценария или сверить прогон с ней.
+
+    Трасса записывается только по явной просьбе (save): если бы её
+    отсутствие приводило к записи, проверка проходила бы на чистой копии
+    репозитория и сразу после изменения, поменявшего поведение игры.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario_name: Название сценария из SCENARIOS
+        ticks: Количество тиков для новой трассы
+        save: Записать (перезаписать) эталон вместо сверки
+
+    Возвращает:
+        False, если прогон разошёлся с эталоном или эталона нет
+    """
+    path = golden_path(scenario_name)
+    if save:
+        trace = record_golden(game, scenario_name, ticks, path)
+        print(f"Эталон {scenario_name}: {trace.ticks} тиков, {path}")
+        return True
+    if not os.path.exists(path):
+        print(f"Нет эталонной трассы {path}; запишите её до изменений: "
+              f"main.py --golden {scenario_name} --golden-save")
+        return False
+
+    divergence = verify_golden(game, path)
+    if divergence is None:
+        print(f"Совпадает с эталоном {path}")
+        return True
+    print(divergence.describe())
+    return False
@@ -0,0 +1,141 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pygame
+
+from sprites.swarm import Swarm
+from systems.archetypes import ArchetypeTable, chase_system, world
+from systems.lod import SimulationLod
+
+
+class HordeClustering:
+    """
+    Объединение далёких врагов в рои.
+
+    Раз в merge_interval кадров враги дальше merge_radius от игрока
+    группируются по крупной сетке: если в ячейке набирается min_members
+    врагов (или там уже есть рой), они убираются из игры и становятся
+    участниками роя. Рои движутся к игроку как одно тело и распадаются
+    обратно на обычных врагов, подойдя ближе split_radius; отставшие рои
+    переносятся на кольцо merge_radius, за split_radius. Так число
+    симулируемых сущностей остаётся ограниченным, а размер орды сохраняется.
+    """
+    def __init__(self, merge_radius: float, split_radius: float, cell_size: float = 400,
+                 min_members: int = 3, merge_interval: int = 30):
+        """
+        Инициализация кластеризации.
+
+        Аргументы:
+            merge_radius: Расстояние от игрока, за которым враги объединяются в рои
+            split_radius: Расстояние от игрока, ближе которого рои распадаются
+            cell_size: Размер ячейки сетки группировки в пикселях
+            min_members: Минимальное количество врагов для нового роя
+            merge_interval: Раз во сколько кадров выполняется объединение
+        """
+        self.merge_radius = merge_radius
+        self.split_radius = split_radius
+        self.cell_size = cell_size
+        self.min_members = min_members
+        self.merge_interval = merge_interval
+
+        self.swarms = pygame.sprite.Group()
+        self.frame = 0
+
+    def __len__(self) -> int:
+        return len(self.swarms)
+
+    def member_count(self) -> int:
+        """
+        Общее количество врагов внутри роёв.
+
+        Возвращает:
+            Количество участников всех роёв
+        """
+        return int(world.swarms["members"][world.swarms.live_rows()].sum())
+
+    def update(self, target: Tuple[float, float], lod: SimulationLod, enemies) -> None:
+        """
+        Сдвинуть рои, распустить подошедшие и объединить далёких врагов.
+
+        Аргументы:
+            target: Позиция игрока в мировых координатах
+            lod: Уровни детализации (для переноса отставших роёв на кольцо спавна)
+            enemies: Группа врагов
+        """
+        swarms = world.swarms
+        rows = swarms.live_rows()
+
+        # Отставшие рои переносятся ближе, как и отдельные враги, но на кольцо
+        # объединения: кольцо спавна лежит внутри split_radius, и рой сразу бы распался
+        distances_sq = SimulationLod.distances_sq(swarms, rows, target)
+        lod.recycle(swarms, rows[distances_sq > lod.despawn_radius * lod.despawn_radius], target,
+                    radius=self.merge_radius)
+
+        chase_system(swarms, rows, target)
+
+        # Распустить рои, подошедшие к игроку
+        close = rows[SimulationLod.distances_sq(swarms, rows, target) < self.split_radius * self.split_radius]
+        for swarm in swarms.objects_at(close):
+            members = swarm.release()
+            swarm.kill()
+            enemies.add(*members)
+
+        self.frame += 1
+        if self.frame % self.merge_interval == 0:
+            self.merge(world.enemies, target, enemies)
+
+    def merge(self, table: ArchetypeTable, target: Tuple[float, float], enemies) -> None:
+        """
+        Объединить далёких врагов в рои по ячейкам сетки.
+
+        Аргументы:
+            table: Таблица врагов
+            target: Позиция игрока в мировых координатах
+            enemies: Группа врагов
+        """
+        rows = table.live_rows()
+        rows = rows[SimulationLod.distances_sq(table, rows, target) > self.merge_radius * self.merge_radius]
+        if len(rows) == 0:
+            return
+
+        # Ячейки существующих роёв
+        swarm_cells: Dict[Tuple[int, int], Swarm] = {}
+        for swarm in self.swarms:
+            swarm_cells[self.cell_of(swarm.pos_x, swarm.pos_y)] = swarm
+
+        # Сгруппировать далёких врагов по ячейкам
+        cells = np.stack((
+            np.floor(table["pos_x"][rows] / self.cell_size).astype(np.int64),
+            np.floor(table["pos_y"][rows] / self.cell_size).astype(np.int64)
+        ), axis=1)
+        unique_cells, inverse, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        groups = np.split(rows[order], np.cumsum(counts)[:-1])
+
+        for cell, group_rows in zip(map(tuple, unique_cells.tolist()), groups):
+            swarm = swarm_cells.get(cell)
+            if swarm is None and len(group_rows) < self.min_members:
+                continue
+
+            members = table.objects_at(group_rows)
+
+            # Убрать врагов из игры: они отсоединяются от таблицы, сохраняя характеристики
+            enemies.remove(*members)
+
+            if swarm is None:
+                swarm = Swarm(members[0].pos_x, members[0].pos_y)
+                self.swarms.add(swarm)
+            swarm.absorb(members)
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Получить ячейку сетки группировки для точки.
+
+        Аргументы:
+            x: Позиция x в мировых координатах
+            y: Позиция y в мировых координатах
+
+        Возвращает:
+            Координаты ячейки
+        """
+        return int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size))
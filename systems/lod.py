@@ -0,0 +1,137 @@
+import math
+import random
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from systems.ai_scheduler import AiScheduler
+from systems.archetypes import ArchetypeTable, chase_system, movement_system
+
+
+class LodCounts(NamedTuple):
+    """
+    Количество врагов в каждом уровне детализации за последний кадр.
+    """
+    near: int
+    far: int
+    far_updated: int
+    recycled: int
+
+
+class SimulationLod:
+    """
+    Уровни детализации симуляции врагов.
+
+    - Ближние враги (в пределах near_radius от игрока) обновляются каждый кадр
+      и рисуют полоску здоровья.
+    - Дальние враги обновляются раз в far_interval кадров с шагом, увеличенным
+      в far_interval раз, и без полоски здоровья. Обновления дальних врагов
+      распределены по кадрам по индексу строки.
+    - Враги дальше despawn_radius (обычно отставшие от быстрого игрока)
+      переносятся на кольцо спавна вокруг игрока, сохраняя здоровье.
+    """
+    NEAR = 0
+    FAR = 1
+
+    def __init__(self, near_radius: float, despawn_radius: float, spawn_radius: float, far_interval: int = 4):
+        """
+        Инициализация уровней детализации.
+
+        Аргументы:
+            near_radius: Радиус полной симуляции вокруг игрока
+            despawn_radius: Радиус, за которым враги переносятся на кольцо спавна
+            spawn_radius: Радиус кольца спавна (чуть за краем экрана)
+            far_interval: Раз во сколько кадров обновляются дальние враги
+        """
+        self.near_radius = near_radius
+        self.despawn_radius = despawn_radius
+        self.spawn_radius = spawn_radius
+        self.far_interval = far_interval
+
+        self.frame = 0
+        self.counts = LodCounts(0, 0, 0, 0)
+        self.total_recycled = 0
+
+    def update(self, table: ArchetypeTable, target: Tuple[float, float],
+               scheduler: Optional[AiScheduler] = None) -> LodCounts:
+        """
+        Распределить врагов по уровням и обновить их.
+
+        Аргументы:
+            table: Таблица врагов
+            target: Позиция игрока в мировых координатах
+            scheduler: Необязательный планировщик решений; с ним ближние враги
+                пересчитывают направление по корзинам, а не каждый кадр
+
+        Возвращает:
+            Количество врагов в каждом уровне
+        """
+        rows = table.live_rows()
+
+        # Перенести слишком далёких врагов на кольцо спавна
+        recycled = rows[self.distances_sq(table, rows, target) > self.despawn_radius * self.despawn_radius]
+        if len(recycled):
+            self.recycle(table, recycled, target)
+
+        # Распределить врагов по уровням
+        near = self.distances_sq(table, rows, target) <= self.near_radius * self.near_radius
+        table["lod_tier"][rows] = np.where(near, self.NEAR, self.FAR)
+        near_rows = rows[near]
+        far_rows = rows[~near]
+
+        # Ближние враги двигаются каждый кадр
+        if scheduler is None:
+            chase_system(table, near_rows, target)
+        else:
+            scheduler.steer(table, near_rows, target)
+            movement_system(table, near_rows)
+
+        # Дальние — по очереди, каждый раз в far_interval кадров, но с большим шагом
+        due_rows = far_rows[(far_rows + self.frame) % self.far_interval == 0]
+        chase_system(table, due_rows, target, steps=self.far_interval)
+        if scheduler is not None:
+            scheduler.mark_decided(table, due_rows)
+
+        self.frame += 1
+        self.total_recycled += len(recycled)
+        self.counts = LodCounts(len(near_rows), len(far_rows), len(due_rows), len(recycled))
+        return self.counts
+
+    @staticmethod
+    def distances_sq(table: ArchetypeTable, rows: np.ndarray, target: Tuple[float, float]) -> np.ndarray:
+        """
+        Квадраты расстояний от врагов до цели.
+
+        Аргументы:
+            table: Таблица врагов
+            rows: Индексы строк
+            target: Позиция цели в мировых координатах
+
+        Возвращает:
+            Массив квадратов расстояний
+        """
+        dx = table["pos_x"][rows] - target[0]
+        dy = table["pos_y"][rows] - target[1]
+        return dx * dx + dy * dy
+
+    def recycle(self, table: ArchetypeTable, rows: np.ndarray, target: Tuple[float, float],
+                radius: Optional[float] = None) -> None:
+        """
+        Перенести врагов на случайные точки кольца спавна вокруг игрока.
+
+        Аргументы:
+            table: Таблица врагов
+            rows: Индексы строк для переноса
+            target: Позиция игрока в мировых координатах
+            radius: Радиус кольца (None — spawn_radius)
+        """
+        radius = self.spawn_radius if radius is None else radius
+        angles = np.array([random.uniform(0, 2 * math.pi) for _ in range(len(rows))])
+        table["pos_x"][rows] = target[0] + np.cos(angles) * radius
+        table["pos_y"][rows] = target[1] + np.sin(angles) * radius
+        table["vel_x"][rows] = 0
+        table["vel_y"][rows] = 0
+
+        # Перенесённым врагам нужно новое решение о направлении
+        if "decided_at" in table.columns:
+            table["decided_at"][rows] = 0
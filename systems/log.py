@@ -0,0 +1,261 @@
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name.lower(): level for level, name in LEVEL_NAMES.items()}
+
+
+class CategoryLogger:
+    """
+    Журнал одной категории (combat, weapons, ui, ...).
+
+    Запись — это событие и именованные поля; строка собирается не здесь, а в
+    фоновом потоке журнала. Если уровень записи ниже уровня категории, метод
+    возвращается сразу: ни форматирования, ни системных вызовов.
+
+    Для «горячих» категорий задаётся rate_limit — сколько записей в секунду
+    пропускать; лишние отбрасываются, и их количество добавляется к
+    следующей пропущенной записи полем suppressed.
+    """
+    def __init__(self, hub: "LogHub", category: str, level: int, rate_limit: Optional[float] = None):
+        """
+        Аргументы:
+            hub: Общий журнал
+            category: Название категории
+            level: Минимальный уровень записей
+            rate_limit: Максимум записей в секунду (None — без ограничения)
+        """
+        self.hub = hub
+        self.category = category
+        self.level = level
+        self.rate_limit = rate_limit
+
+        self.tokens = rate_limit or 0.0
+        self.refilled_at = time.monotonic()
+        self.suppressed = 0
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Записываются ли записи этого уровня."""
+        return level >= self.level
+
+    def debug(self, event: str, **fields) -> None:
+        """Записать событие уровня DEBUG."""
+        if self.level <= DEBUG:
+            self.log(DEBUG, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        """Записать событие уровня INFO."""
+        if self.level <= INFO:
+            self.log(INFO, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        """Записать событие уровня WARNING."""
+        if self.level <= WARNING:
+            self.log(WARNING, event, fields)
+
+    def error(self, event: str, **fields) -> None:
+        """Записать событие уровня ERROR."""
+        if self.level <= ERROR:
+            self.log(ERROR, event, fields)
+
+    def log(self, level: int, event: str, fields: Dict) -> None:
+        """
+        Передать запись фоновому потоку с учётом ограничения частоты.
+
+        Аргументы:
+            level: Уровень записи
+            event: Описание события
+            fields: Поля события
+        """
+        if self.rate_limit is not None:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled_at) * self.rate_limit)
+            self.refilled_at = now
+            if self.tokens < 1:
+                self.suppressed += 1
+                return
+            self.tokens -= 1
+            if self.suppressed:
+                fields["suppressed"] = self.suppressed
+                self.suppressed = 0
+
+        self.hub.submit((time.time(), level, self.category, event, fields))
+
+
+class LogHub:
+    """
+    Асинхронный структурированный журнал.
+
+    Записи кладутся в очередь и выводятся фоновым потоком, поэтому игровой
+    цикл не ждёт записи в stdout (особенно медленной, когда это канал).
+    Поток запускается при первой записи; при выходе из программы очередь
+    дописывается до конца.
+    """
+    def __init__(self, default_level: int = INFO):
+        """
+        Аргументы:
+            default_level: Уровень категорий без явной настройки
+        """
+        self.default_level = default_level
+        self.levels: Dict[str, int] = {}
+        self.loggers: Dict[str, CategoryLogger] = {}
+
+        self.stream: TextIO = sys.stdout
+        self.json_lines = False
+
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def get_logger(self, category: str, rate_limit: Optional[float] = None) -> CategoryLogger:
+        """
+        Получить журнал категории (создаётся один раз).
+
+        Аргументы:
+            category: Название категории
+            rate_limit: Максимум записей в секунду для «горячих» категорий
+
+        Возвращает:
+            Журнал категории
+        """
+        logger = self.loggers.get(category)
+        if logger is None:
+            level = self.levels.get(category, self.default_level)
+            logger = CategoryLogger(self, category, level, rate_limit)
+            self.loggers[category] = logger
+        return logger
+
+    def configure(self, default_level: Optional[int] = None, levels: Optional[Dict[str, int]] = None,
+                  stream: Optional[TextIO] = None, json_lines: Optional[bool] = None) -> None:
+        """
+        Настроить уровни и вывод журнала.
+
+        Аргументы:
+            default_level: Уровень категорий без явной настройки
+            levels: Уровни отдельных категорий
+            stream: Куда выводить записи
+            json_lines: Выводить записи как JSON (по одному на строку)
+        """
+        self.flush()
+        if default_level is not None:
+            self.default_level = default_level
+        if levels:
+            self.levels.update(levels)
+        if stream is not None:
+            self.stream = stream
+        if json_lines is not None:
+            self.json_lines = json_lines
+
+        for category, logger in self.loggers.items():
+            logger.level = self.levels.get(category, self.default_level)
+
+    def submit(self, record: tuple) -> None:
+        """
+        Поставить запись в очередь фонового потока.
+
+        Аргументы:
+            record: (время, уровень, категория, событие, поля)
+        """
+        if self.thread is None:
+            self.start()
+        self.queue.put(record)
+
+    def start(self) -> None:
+        """
+        Запустить фоновый поток журнала.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="log", daemon=True)
+                self.thread.start()
+
+    def run(self) -> None:
+        """
+        Цикл фонового потока: форматировать и выводить записи.
+        """
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            if isinstance(record, threading.Event):
+                self.stream.flush()
+                record.set()
+                continue
+
+            self.stream.write(self.format(record))
+            if self.queue.empty():
+                self.stream.flush()
+
+    def format(self, record: tuple) -> str:
+        """
+        Собрать строку записи.
+
+        Аргументы:
+            record: (время, уровень, категория, событие, поля)
+
+        Возвращает:
+            Строка с переводом строки в конце
+        """
+        created, level, category, event, fields = record
+        if self.json_lines:
+            return json.dumps({"time": created, "level": LEVEL_NAMES[level], "category": category,
+                               "event": event, **fields}, ensure_ascii=False, default=str) + "\n"
+
+        clock = time.strftime("%H:%M:%S", time.localtime(created))
+        text = f"{clock}.{int(created % 1 * 1000):03d} {LEVEL_NAMES[level]:<7} [{category}] {event}"
+        if fields:
+            text += " " + " ".join(f"{name}={value}" for name, value in fields.items())
+        return text + "\n"
+
+    def flush(self, timeout: float = 1.0) -> None:
+        """
+        Дождаться вывода всех записей, поставленных в очередь.
+
+        Аргументы:
+            timeout: Максимальное время ожидания в секундах
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def shutdown(self) -> None:
+        """
+        Дописать очередь и остановить фоновый поток.
+        """
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(1.0)
+        self.thread = None
+
+
+# Журнал текущей игры
+log_hub = LogHub()
+atexit.register(log_hub.shutdown)
+
+
+def get_logger(category: str, rate_limit: Optional[float] = None) -> CategoryLogger:
+    """
+    Получить журнал категории из общего журнала игры.
+
+    Аргументы:
+        category: Название категории
+        rate_limit: Максимум записей в секунду для «горячих» категорий
+
+    Возвращает:
+        Журнал категории
+    """
+    return log_hub.get_logger(category, rate_limit)
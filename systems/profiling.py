@@ -0,0 +1,126 @@
+import cProfile
+import os
+import pstats
+from typing import Dict, List, Tuple
+
+from systems.scenarios import SCENARIOS, run_ticks, start_scenario
+
+
+# Функция в pstats: (файл, строка, имя)
+Function = Tuple[str, int, str]
+
+
+def function_label(function: Function) -> str:
+    """
+    Подпись функции для свёрнутых стеков.
+
+    Аргументы:
+        function: Функция в формате pstats
+
+    Возвращает:
+        «имя (файл:строка)» без точек с запятой
+    """
+    file_name, line, name = function
+    if file_name == "~":
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(file_name)}:{line})".replace(";", ",")
+
+
+def collapse_stats(stats: pstats.Stats, min_us: int = 1, max_depth: int = 128) -> List[str]:
+    """
+    Построить свёрнутые стеки (формат flamegraph.pl / speedscope) из pstats.
+
+    Детерминированный профайлер хранит время только по парам
+    «вызывающий → вызываемый», поэтому время функции, вызванной из разных
+    мест, делится между путями пропорционально совокупному времени каждого
+    ребра. Рекурсивные вызовы обрезаются на первом повторе функции в пути.
+
+    Аргументы:
+        stats: Статистика профайлера
+        min_us: Пропускать стеки с собственным временем меньше этого (мкс)
+        max_depth: Максимальная глубина стека
+
+    Возвращает:
+        Строки «функция;функция;... микросекунды»
+    """
+    entries = stats.stats
+    children: Dict[Function, List[Tuple[Function, float]]] = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((function, edge[3]))
+
+    totals: Dict[str, float] = {}
+
+    def walk(function: Function, path: Tuple[str, ...], share: float) -> None:
+        own_time, cumulative_time = entries[function][2], entries[function][3]
+        label = function_label(function)
+        path = path + (label,)
+
+        self_us = own_time * share * 1e6
+        if self_us >= min_us:
+            key = ";".join(path)
+            totals[key] = totals.get(key, 0.0) + self_us
+
+        if len(path) >= max_depth or cumulative_time <= 0:
+            return
+        for child, edge_time in children.get(function, ()):
+            if function_label(child) in path:
+                continue
+            child_total = entries[child][3]
+            if child_total <= 0:
+                continue
+            # Доля времени ребра, приходящаяся на текущий путь
+            child_share = edge_time * share / child_total
+            if child_share * child_total * 1e6 >= min_us:
+                walk(child, path, child_share)
+
+    roots = [function for function, entry in entries.items() if not entry[4]]
+    for root in roots:
+        walk(root, (), 1.0)
+
+    return [f"{stack} {int(round(us))}" for stack, us in sorted(totals.items()) if us >= min_us]
+
+
+def profile_scenario(game, name: str, ticks: int, output: str) -> bool:
+    """
+    Прогнать сценарий под cProfile и сохранить результаты.
+
+    Если игрок погиб раньше, профиль сохраняется по прогнанным тикам,
+    но прогон считается проваленным: профиль покрывает не весь сценарий.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        name: Название сценария из SCENARIOS
+        ticks: Количество тиков
+        output: Путь без расширения для файлов результатов
+
+    Возвращает:
+        True, если прогнаны все тики
+    """
+    scenario = SCENARIOS[name]
+    start_scenario(game, scenario)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = run_ticks(game, ticks)
+    finally:
+        profiler.disable()
+        del game.view_stack[1:]
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    stats_path = output + ".pstats"
+    collapsed_path = output + ".collapsed"
+
+    profiler.dump_stats(stats_path)
+    stats = pstats.Stats(profiler)
+    with open(collapsed_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(collapse_stats(stats)) + "\n")
+
+    print(f"Сценарий {name}: {scenario.description}, прогнано {result.ticks} из {ticks} тиков")
+    stats.sort_stats("cumulative").print_stats(15)
+    print(f"pstats: {stats_path}")
+    print(f"свёрнутые стеки (flamegraph.pl, speedscope): {collapsed_path}")
+    if result.game_over:
+        print(f"ПРОВАЛ: игрок погиб на тике {result.ticks}, профиль покрывает только начало сценария")
+    return not result.game_over
@@ -0,0 +1,129 @@
+from typing import Optional
+
+
+class QualityController:
+    """
+    Динамическое качество графики по времени работы кадра.
+
+    Учитывается только работа (события, обновление, отрисовка), без
+    ожидания ограничителя кадров: по полному времени кадра нельзя отличить
+    быстрый кадр с ожиданием от медленного. Бюджет по умолчанию оставляет
+    запас до 16,7 мс кадра при 60 FPS.
+
+    Уровни (каждый следующий включает все упрощения предыдущих):
+        0 — полное качество;
+        1 — «дрожание» облаков и шаровых молний заморожено, текст интерфейса
+            обновляется реже;
+        2 — у ножа не рисуются рукоятка и кончик;
+        3 — полоски здоровья врагов не рисуются.
+
+    Чтобы уровень не переключался туда-обратно, он понижается, только если
+    сглаженное время кадра держится выше бюджета hold_frames кадров подряд,
+    и повышается, только если оно столько же кадров держится ниже
+    recover_ms. Ручной уровень (из настроек) отключает автоматику.
+    """
+    FULL = 0
+    REDUCED_EFFECTS = 1
+    SIMPLE_WEAPONS = 2
+    NO_HEALTH_BARS = 3
+
+    TIER_NAMES = ("Высокое", "Среднее", "Низкое", "Минимальное")
+
+    def __init__(self, budget_ms: float = 14.0, recover_ms: float = 10.0, hold_frames: int = 60,
+                 ui_refresh_interval: int = 10):
+        """
+        Инициализация контроллера качества.
+
+        Аргументы:
+            budget_ms: Время работы кадра, выше которого качество понижается
+            recover_ms: Время работы кадра, ниже которого качество повышается
+            hold_frames: Сколько кадров подряд условие должно выполняться
+            ui_refresh_interval: Раз во сколько кадров обновляется текст интерфейса
+                на пониженном качестве
+        """
+        self.budget_ms = budget_ms
+        self.recover_ms = recover_ms
+        self.hold_frames = hold_frames
+        self.reduced_ui_refresh_interval = ui_refresh_interval
+
+        self.auto_tier = self.FULL
+        self.override: Optional[int] = None
+
+        self.average_frame_ms = 0.0
+        self.slow_frames = 0
+        self.fast_frames = 0
+
+    @property
+    def tier(self) -> int:
+        """Действующий уровень качества (ручной, если задан)."""
+        return self.auto_tier if self.override is None else self.override
+
+    def record_frame(self, frame_ms: float) -> None:
+        """
+        Учесть время кадра и при необходимости сменить уровень.
+
+        Аргументы:
+            frame_ms: Время работы кадра в миллисекундах (без ожидания)
+        """
+        self.average_frame_ms += (frame_ms - self.average_frame_ms) * 0.1
+
+        if self.average_frame_ms > self.budget_ms:
+            self.slow_frames += 1
+            self.fast_frames = 0
+        elif self.average_frame_ms < self.recover_ms:
+            self.fast_frames += 1
+            self.slow_frames = 0
+        else:
+            self.slow_frames = 0
+            self.fast_frames = 0
+
+        if self.slow_frames >= self.hold_frames and self.auto_tier < self.NO_HEALTH_BARS:
+            self.auto_tier += 1
+            self.slow_frames = 0
+        elif self.fast_frames >= self.hold_frames and self.auto_tier > self.FULL:
+            self.auto_tier -= 1
+            self.fast_frames = 0
+
+    def set_override(self, tier: Optional[int]) -> None:
+        """
+        Задать уровень качества вручную.
+
+        Аргументы:
+            tier: Уровень качества или None для автоматического выбора
+        """
+        self.override = tier
+
+    def tier_name(self) -> str:
+        """
+        Название выбранного режима для меню настроек.
+
+        Возвращает:
+            «Авто (...)» или название ручного уровня
+        """
+        if self.override is None:
+            return f"Авто ({self.TIER_NAMES[self.auto_tier]})"
+        return self.TIER_NAMES[self.override]
+
+    @property
+    def animate_effects(self) -> bool:
+        """Перерисовывать ли случайное «дрожание» облаков и шаровых молний."""
+        return self.tier < self.REDUCED_EFFECTS
+
+    @property
+    def ui_refresh_interval(self) -> int:
+        """Раз во сколько кадров обновлять текст интерфейса."""
+        return 1 if self.tier < self.REDUCED_EFFECTS else self.reduced_ui_refresh_interval
+
+    @property
+    def weapon_details(self) -> bool:
+        """Рисовать ли мелкие детали оружия (рукоятку и кончик ножа)."""
+        return self.tier < self.SIMPLE_WEAPONS
+
+    @property
+    def health_bars(self) -> bool:
+        """Рисовать ли полоски здоровья врагов."""
+        return self.tier < self.NO_HEALTH_BARS
+
+
+# Качество графики текущей игры
+quality = QualityController()
@@ -0,0 +1,296 @@
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+from pygame import Surface
+
+from systems.archetypes import world
+from systems.lod import SimulationLod
+from systems.quality import quality
+from systems.scenarios import Scenario, start_scenario
+from systems.surfaces import make_surface
+
+
+# Количество врагов на экране по умолчанию
+ENEMY_COUNTS = (500, 2000, 5000)
+
+# Снаряды в каждой сцене
+CLOUDS = 40
+BULLETS = 150
+
+
+def build_scene(game, enemies: int, clouds: int = CLOUDS, bullets: int = BULLETS, seed: int = 1):
+    """
+    Собрать игровой экран, на котором все враги и снаряды видны.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        enemies: Количество врагов на экране
+        clouds: Количество облаков магии
+        bullets: Количество пуль
+
+    Возвращает:
+        Игровой экран сцены
+    """
+    from sprites.bullet import Bullet
+    from sprites.magic_cloud import MagicCloud
+    from weapons.magic_wand import MagicWand
+    from weapons.pistol import Pistol
+
+    game_view = start_scenario(game, Scenario("Сцена для замера отрисовки", "mage", seed=seed))
+    game_view.spawn_enemies(max(enemies - len(game_view.enemies), 0))
+
+    # Разложить врагов по всему экрану; все они ближнего уровня (с полосками здоровья)
+    width, height = game.screen.get_size()
+    table = world.enemies
+    rows = table.live_rows()
+    table["pos_x"][rows] = np.random.default_rng(seed).uniform(20, width - 20, len(rows)) - game_view.camera.x
+    table["pos_y"][rows] = np.random.default_rng(seed + 1).uniform(30, height - 20, len(rows)) - game_view.camera.y
+    table["lod_tier"][rows] = SimulationLod.NEAR
+
+    player = game_view.player
+    wand = next(weapon for weapon in player.weapon_slots.values() if isinstance(weapon, MagicWand))
+    pistol = Pistol()
+    player.weapon_slots[len(player.weapon_slots) + 1] = pistol
+
+    for _ in range(clouds):
+        x, y = game_view.camera.screen_to_world((random.randint(0, width), random.randint(0, height)))
+        cloud = MagicCloud(x, y, pygame.math.Vector2(1, 0))
+        wand.clouds.add(cloud)
+        game_view.all_sprites.add(cloud)
+    for _ in range(bullets):
+        x, y = game_view.camera.screen_to_world((random.randint(0, width), random.randint(0, height)))
+        bullet = Bullet(x, y, pygame.math.Vector2(0, 1))
+        pistol.bullets.add(bullet)
+        game_view.all_sprites.add(bullet)
+    return game_view
+
+
+def foreign_format(surface: Surface) -> Surface:
+    """
+    Копия поверхности не в формате экрана (как без convert()).
+
+    Аргументы:
+        surface: Поверхность в формате экрана
+
+    Возвращает:
+        Копия в формате RGBA или RGB с порядком байт из файла
+    """
+    if surface.get_flags() & pygame.SRCALPHA:
+        return pygame.image.frombytes(pygame.image.tobytes(surface, "RGBA"), surface.get_size(), "RGBA")
+    return pygame.image.frombytes(pygame.image.tobytes(surface, "RGB"), surface.get_size(), "RGB")
+
+
+@contextmanager
+def foreign_images(sprites: Iterable) -> Iterator[None]:
+    """
+    Временно заменить изображения спрайтов копиями не в формате экрана.
+
+    Аргументы:
+        sprites: Спрайты, изображения которых заменяются
+    """
+    sprites = list(sprites)
+    originals = [sprite.image for sprite in sprites]
+    # Общие изображения остаются общими и у копий
+    copies: Dict[int, Surface] = {}
+    for sprite in sprites:
+        key = id(sprite.image)
+        if key not in copies:
+            copies[key] = foreign_format(sprite.image)
+        sprite.image = copies[key]
+    try:
+        yield
+    finally:
+        for sprite, image in zip(sprites, originals):
+            sprite.image = image
+
+
+def enemy_blits(game_view) -> List[Tuple[Surface, Tuple[int, int]]]:
+    """
+    Пары (изображение, позиция) всех врагов без отсечения по экрану.
+
+    Аргументы:
+        game_view: Игровой экран
+
+    Возвращает:
+        Список для Surface.blits
+    """
+    camera = game_view.camera
+    return [(enemy.image, camera.world_to_screen(enemy.rect.topleft)) for enemy in game_view.enemies]
+
+
+def draw_projectiles_twice(game_view, surface: Surface) -> None:
+    """
+    Снаряды так, как их рисует GameView.render: проходом по all_sprites и
+    ещё раз через render_bullets оружия.
+
+    Аргументы:
+        game_view: Игровой экран
+        surface: Поверхность для отрисовки
+    """
+    camera = game_view.camera
+    for sprite in game_view.all_sprites:
+        if sprite is game_view.player:
+            continue
+        sprite.render(surface, camera.world_to_screen(sprite.rect.center))
+    draw_projectiles_once(game_view, surface)
+
+
+def draw_projectiles_once(game_view, surface: Surface) -> None:
+    """
+    Снаряды только через render_bullets оружия.
+
+    Аргументы:
+        game_view: Игровой экран
+        surface: Поверхность для отрисовки
+    """
+    for weapon in game_view.player.weapon_slots.values():
+        if weapon:
+            weapon.render_bullets(surface, game_view.combat_context)
+
+
+def bench_cases(game_view) -> List[Tuple[str, Optional[int], Callable[[Surface], None], Callable]]:
+    """
+    Случаи замера для сцены.
+
+    Аргументы:
+        game_view: Игровой экран
+
+    Возвращает:
+        Список (название, уровень качества, отрисовка кадра, обёртка-контекст или None)
+    """
+    from sprites.enemy import render_enemies
+    from sprites.magic_cloud import MagicCloud
+
+    table = world.enemies
+    camera = game_view.camera
+    clouds = [sprite for sprite in game_view.all_sprites if isinstance(sprite, MagicCloud)]
+
+    def full_render(surface):
+        game_view.render(surface)
+
+    def enemies_blit(surface):
+        blit = surface.blit
+        for image, position in enemy_blits(game_view):
+            blit(image, position)
+
+    def enemies_blits(surface):
+        surface.blits(enemy_blits(game_view), doreturn=False)
+
+    def enemies_batched(surface):
+        render_enemies(surface, table, table.live_rows(), camera)
+
+    def enemies_per_sprite(surface):
+        for enemy in game_view.enemies:
+            enemy.render(surface, camera.world_to_screen(enemy.rect.center))
+
+    def projectiles_twice(surface):
+        draw_projectiles_twice(game_view, surface)
+
+    def projectiles_once(surface):
+        draw_projectiles_once(game_view, surface)
+
+    def hud(surface):
+        game_view.render_ui(surface)
+
+    full, no_bars, reduced = quality.FULL, quality.NO_HEALTH_BARS, quality.REDUCED_EFFECTS
+    return [
+        ("GameView.render целиком", full, full_render, None),
+        ("GameView.render без полосок здоровья", no_bars, full_render, None),
+        ("враги: blit по одному, без отсечения", no_bars, enemies_blit, None),
+        ("враги: blits, без отсечения", no_bars, enemies_blits, None),
+        ("враги: blits с отсечением (render_enemies)", no_bars, enemies_batched, None),
+        ("враги: render_enemies + полоски здоровья", full, enemies_batched, None),
+        ("враги: Enemy.render по одному + полоски", full, enemies_per_sprite, None),
+        ("враги: render_enemies, неконвертированные", no_bars, enemies_batched,
+         lambda: foreign_images(game_view.enemies)),
+        ("снаряды: двойная отрисовка (как в render)", full, projectiles_twice, None),
+        ("снаряды: только render_bullets", full, projectiles_once, None),
+        ("облака: только render_bullets, неконвертированные", full, projectiles_once,
+         lambda: foreign_images(clouds)),
+        ("интерфейс: текст каждый кадр", full, hud, None),
+        (f"интерфейс: текст раз в {quality.reduced_ui_refresh_interval} кадров", reduced, hud, None),
+    ]
+
+
+def time_frames(draw: Callable[[Surface], None], surface: Surface, frames: int, warmup: int = 5) -> np.ndarray:
+    """
+    Замерить время отрисовки кадров на поверхности.
+
+    Аргументы:
+        draw: Отрисовка одного кадра
+        surface: Поверхность вне экрана
+        frames: Количество замеряемых кадров
+        warmup: Количество кадров прогрева без замера
+
+    Возвращает:
+        Время кадров в миллисекундах
+    """
+    for _ in range(warmup):
+        surface.fill((0, 0, 0))
+        draw(surface)
+
+    times = np.empty(frames)
+    for frame in range(frames):
+        surface.fill((0, 0, 0))
+        started = time.perf_counter()
+        draw(surface)
+        times[frame] = (time.perf_counter() - started) * 1000
+    return times
+
+
+def run_render_bench(game, counts: Sequence[int] = ENEMY_COUNTS, frames: int = 60) -> Dict[str, Dict[int, Tuple[float, float]]]:
+    """
+    Замерить стратегии отрисовки для сцен с разным количеством врагов.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        counts: Количество врагов на экране в сценах
+        frames: Количество кадров на каждый случай
+
+    Возвращает:
+        {случай: {количество врагов: (среднее, p95) в миллисекундах}}
+    """
+    results: Dict[str, Dict[int, Tuple[float, float]]] = {}
+    surface = make_surface(game.screen.get_size())
+    override = quality.override
+    try:
+        for count in counts:
+            game_view = build_scene(game, count)
+            for name, tier, draw, context in bench_cases(game_view):
+                quality.set_override(tier)
+                if context is None:
+                    times = time_frames(draw, surface, frames)
+                else:
+                    with context():
+                        times = time_frames(draw, surface, frames)
+                results.setdefault(name, {})[count] = (float(times.mean()), float(np.percentile(times, 95)))
+    finally:
+        quality.set_override(override)
+        del game.view_stack[1:]
+    return results
+
+
+def format_table(results: Dict[str, Dict[int, Tuple[float, float]]]) -> str:
+    """
+    Собрать таблицу результатов: среднее время кадра и p95 в миллисекундах.
+
+    Аргументы:
+        results: Результат run_render_bench
+
+    Возвращает:
+        Текст таблицы
+    """
+    counts = sorted({count for row in results.values() for count in row})
+    name_width = max(len(name) for name in results)
+    header = f"{'случай':<{name_width}}" + "".join(f"{f'{count} врагов':>20}" for count in counts)
+    lines = [header, "-" * len(header)]
+    for name, row in results.items():
+        cells = "".join(f"{f'{row[count][0]:.2f} ({row[count][1]:.2f})':>20}" if count in row else f"{'-':>20}"
+                        for count in counts)
+        lines.append(f"{name:<{name_width}}{cells}")
+    lines.append("мс на кадр: среднее (p95)")
+    return "\n".join(lines)
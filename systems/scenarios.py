@@ -0,0 +1,133 @@
+import random
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class Scenario(NamedTuple):
+    """
+    Заранее заданная игровая ситуация для профилирования и проверок.
+    """
+    description: str
+    character: str            # fat, mage, warrior или electromage
+    level: int = 1            # Начальный уровень игрока
+    weapon_levels: int = 0    # Сколько раз улучшить каждое стартовое оружие
+    enemies: int = 0          # Сколько врагов создать заранее
+    seed: int = 1             # Зерно random для повторяемости
+    max_health: int = 0       # Здоровье игрока (0 — как у персонажа)
+
+
+# Здоровье игрока в сценариях: игрок не должен погибнуть посреди прогона
+SURVIVABLE_HEALTH = 1_000_000
+
+
+class RunResult(NamedTuple):
+    """
+    Итог прогона run_ticks.
+    """
+    ticks: int                # Сколько игровых тиков прогнано на самом деле
+    level_ups: int            # Сколько раз открывался экран повышения уровня
+    game_over: bool           # Прогон остановлен гибелью игрока
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "fat": Scenario("Толстяк с пистолетом, 200 врагов", "fat", enemies=200, max_health=SURVIVABLE_HEALTH),
+    "mage": Scenario("Маг с волшебной палочкой, 200 врагов", "mage", enemies=200, max_health=SURVIVABLE_HEALTH),
+    "warrior": Scenario("Воин с ножом, 200 врагов", "warrior", enemies=200, max_health=SURVIVABLE_HEALTH),
+    "electromage": Scenario("Электромаг с шаровой молнией и молнией, 200 врагов", "electromage",
+                            enemies=200, max_health=SURVIVABLE_HEALTH),
+    "electromage_late": Scenario("Электромаг 15 уровня с улучшенным оружием, 400 врагов", "electromage",
+                                 level=15, weapon_levels=7, enemies=400, max_health=SURVIVABLE_HEALTH),
+    "mage_late": Scenario("Маг 15 уровня с улучшенной палочкой, 400 врагов", "mage",
+                          level=15, weapon_levels=7, enemies=400, max_health=SURVIVABLE_HEALTH),
+    "horde": Scenario("Воин против 2000 врагов", "warrior", enemies=2000, max_health=SURVIVABLE_HEALTH),
+}
+
+
+def start_scenario(game, scenario: Scenario):
+    """
+    Начать игру в заданной ситуации.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        scenario: Сценарий
+
+    Возвращает:
+        Игровой экран сценария (уже на вершине стека экранов)
+    """
+    from views.select_player_view import SelectPlayerView
+
+    random.seed(scenario.seed)
+
+    select_view = SelectPlayerView(game)
+    game.view_stack.append(select_view)
+    getattr(select_view, "select_" + scenario.character)()
+    game_view = game.view_stack[-1]
+
+    player = game_view.player
+    player.current_level = scenario.level
+    if scenario.max_health:
+        player.max_health = player.current_health = scenario.max_health
+    player.reset_score_progress_bar()
+    for weapon in player.weapon_slots.values():
+        if weapon is not None:
+            for _ in range(scenario.weapon_levels):
+                weapon.level_up()
+
+    if scenario.enemies:
+        game_view.spawn_enemies(scenario.enemies)
+    return game_view
+
+
+def choose_health(level_up_view) -> None:
+    """Выбор на экране повышения уровня по умолчанию: прибавка здоровья."""
+    level_up_view.increase_health()
+
+
+def run_ticks(game, ticks: int, dt: float = 1 / 60, render: bool = True,
+              on_level_up: Optional[Callable] = None, on_tick: Optional[Callable] = None) -> RunResult:
+    """
+    Прогнать игру заданное количество тиков без главного цикла.
+
+    Экран повышения уровня закрывается выбором источника управления, если
+    тот выбирает сам (автопилот), иначе выбором on_level_up (по умолчанию
+    прибавка здоровья); такой тик не считается игровым. После гибели игрока
+    прогон останавливается: экран конца игры ничего не симулирует.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        ticks: Количество игровых тиков
+        dt: Шаг времени тика в секундах
+        render: Отрисовывать ли кадр
+        on_level_up: Функция выбора на экране повышения уровня
+        on_tick: Функция, вызываемая после каждого тика с номером тика
+
+    Возвращает:
+        Сколько тиков прогнано, сколько раз повышался уровень и погиб ли игрок
+    """
+    from systems.controls import controls
+    from views.level_up_view import LevelUpView
+
+    on_level_up = on_level_up or choose_health
+    level_ups = 0
+    tick = 0
+    while tick < ticks and game.view_stack:
+        view = game.view_stack[-1]
+        if isinstance(view, LevelUpView):
+            if not controls.choose_level_up(view):
+                on_level_up(view)
+            level_ups += 1
+            continue
+
+        started = time.perf_counter()
+        view.update(dt, [])
+        if render:
+            game.screen.fill((0, 0, 0))
+            view.render(game.screen)
+        # Время работы тика, как в главном цикле (для регулятора спавна)
+        game.frame_work_ms = (time.perf_counter() - started) * 1000
+        if on_tick is not None:
+            on_tick(tick)
+        tick += 1
+        if getattr(view, "game_over", False):
+            return RunResult(tick, level_ups, True)
+    return RunResult(tick, level_ups, False)
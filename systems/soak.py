@@ -0,0 +1,302 @@
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pygame
+
+from systems.archetypes import world
+from systems.log import get_logger
+from systems.scenarios import SCENARIOS, run_ticks, start_scenario
+
+
+log = get_logger("soak")
+
+# Тиков в минуте игрового времени при шаге 1/60 секунды
+TICKS_PER_MINUTE = 60 * 60
+
+
+class MemorySample(NamedTuple):
+    """
+    Замер памяти в один момент прогона.
+    """
+    tick: int
+    traced: int               # Байт, выделенных Python (по tracemalloc)
+    surface_bytes: int        # Байт пикселей живых поверхностей (выделяет SDL)
+    entities: int             # Живых сущностей в таблицах мира плюс игрок
+    counts: Dict[str, int]    # Живые спрайты, группы и поверхности по типам
+
+    @property
+    def per_entity(self) -> float:
+        """Удерживаемая память в байтах на одну сущность."""
+        return (self.traced + self.surface_bytes) / max(self.entities, 1)
+
+
+def live_object_counts() -> Tuple[Counter, int]:
+    """
+    Подсчитать живые спрайты, группы и поверхности по типам.
+
+    Поверхности pygame не отслеживаются сборщиком мусора, поэтому они
+    находятся через ссылки из отслеживаемых объектов.
+
+    Возвращает:
+        (количество по именам типов, байт пикселей всех поверхностей)
+    """
+    counts = Counter()
+    surfaces = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, (pygame.sprite.Sprite, pygame.sprite.AbstractGroup)):
+            counts[type(obj).__name__] += 1
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, pygame.Surface):
+                surfaces[id(referent)] = referent
+
+    surface_bytes = 0
+    for surface in surfaces.values():
+        counts["Surface"] += 1
+        width, height = surface.get_size()
+        surface_bytes += width * height * surface.get_bytesize()
+    return counts, surface_bytes
+
+
+def choose_random(level_up_view) -> None:
+    """Выбор на экране повышения уровня: случайная кнопка (включая случайное оружие)."""
+    random.choice(level_up_view.weapon_buttons).callback()
+
+
+class MemorySoak:
+    """
+    Долгий прогон игры без окна с поиском утечек памяти.
+
+    Сценарий прогоняется тиками фиксированной длины; после гибели игрока
+    начинается новая игра, так что проверяется и перезапуск. После прогрева
+    снимается опорный снимок tracemalloc, затем раз в sample_ticks тиков
+    собирается мусор, снимается новый снимок и считаются живые объекты.
+    Если удерживаемая память (Python плюс пиксели поверхностей) выросла
+    относительно опорной больше чем на threshold байт в пересчёте на
+    сущность в confirm замерах подряд, прогон считается проваленным.
+    """
+    def __init__(self, game, scenario_name: str, threshold: float = 2048.0,
+                 sample_ticks: int = 5 * TICKS_PER_MINUTE, warmup_ticks: int = 2 * TICKS_PER_MINUTE,
+                 confirm: int = 3, render: bool = False):
+        """
+        Инициализация прогона.
+
+        Аргументы:
+            game: Главный экземпляр игры
+            scenario_name: Название сценария из SCENARIOS
+            threshold: Допустимый рост памяти на сущность в байтах
+            sample_ticks: Интервал между замерами в тиках
+            warmup_ticks: Тиков прогрева до опорного замера
+            confirm: Сколько замеров подряд должны превысить порог
+            render: Отрисовывать ли кадры
+        """
+        self.game = game
+        self.scenario_name = scenario_name
+        self.scenario = SCENARIOS[scenario_name]
+        self.threshold = threshold
+        self.sample_ticks = sample_ticks
+        self.warmup_ticks = warmup_ticks
+        self.confirm = confirm
+        self.render = render
+
+        self.tick = 0
+        self.games = 0
+        self.level_ups = 0
+        self.samples: List[MemorySample] = []
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start_game(self) -> None:
+        """
+        Начать новую игру сценария, как после возврата в главное меню.
+
+        Здоровье игрока обычное, а не с запасом из сценария: игрок должен
+        погибать, чтобы проверялся и перезапуск.
+        """
+        del self.game.view_stack[1:]
+        start_scenario(self.game, self.scenario._replace(seed=self.scenario.seed + self.games, max_health=0))
+        self.games += 1
+
+    def advance(self, ticks: int) -> None:
+        """
+        Прогнать игру, начиная новую после гибели игрока.
+
+        Аргументы:
+            ticks: Количество игровых тиков
+        """
+        left = ticks
+        while left > 0:
+            game_view = self.game.view_stack[-1]
+            if getattr(game_view, "game_over", False):
+                self.start_game()
+            # Короткими кусками, чтобы не проводить долго время после гибели
+            chunk = min(left, TICKS_PER_MINUTE)
+            result = run_ticks(self.game, chunk, render=self.render, on_level_up=choose_random)
+            self.level_ups += result.level_ups
+            left -= result.ticks
+            self.tick += result.ticks
+
+    def measure(self) -> Tuple[MemorySample, tracemalloc.Snapshot]:
+        """
+        Собрать мусор и снять замер памяти.
+
+        Возвращает:
+            (замер, снимок tracemalloc)
+        """
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        counts, surface_bytes = live_object_counts()
+        entities = sum(len(table) for table in world.tables()) + 1
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        return MemorySample(self.tick, traced, surface_bytes, entities, dict(counts)), snapshot
+
+    def growth(self, sample: MemorySample) -> float:
+        """
+        Рост удерживаемой памяти относительно опорного замера на одну сущность.
+
+        Делится на большее из двух количеств сущностей: так колебания числа
+        врагов не принимаются за утечку, а настоящая утечка растёт с
+        временем без ограничений.
+
+        Аргументы:
+            sample: Замер
+
+        Возвращает:
+            Рост в байтах на сущность
+        """
+        first = self.samples[0]
+        retained = sample.traced + sample.surface_bytes - first.traced - first.surface_bytes
+        return retained / max(sample.entities, first.entities)
+
+    def run(self, minutes: float) -> bool:
+        """
+        Прогнать сценарий и проверить рост памяти.
+
+        Аргументы:
+            minutes: Длительность прогона в минутах игрового времени
+
+        Возвращает:
+            True, если утечка не обнаружена
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+
+        try:
+            self.start_game()
+            self.advance(self.warmup_ticks)
+            sample, self.baseline = self.measure()
+            self.samples.append(sample)
+            log.info("Опорный замер", tick=self.tick, per_entity=round(sample.per_entity),
+                     entities=sample.entities)
+
+            total_ticks = int(minutes * TICKS_PER_MINUTE)
+            over = 0
+            started = time.perf_counter()
+            while self.tick < self.warmup_ticks + total_ticks:
+                self.advance(min(self.sample_ticks, self.warmup_ticks + total_ticks - self.tick))
+                sample, self.last_snapshot = self.measure()
+                self.samples.append(sample)
+
+                growth = self.growth(sample)
+                over = over + 1 if growth > self.threshold else 0
+                log.info("Замер", minute=round(self.tick / TICKS_PER_MINUTE, 1),
+                         per_entity=round(sample.per_entity), growth=round(growth),
+                         entities=sample.entities, games=self.games,
+                         seconds=round(time.perf_counter() - started, 1))
+                if over >= self.confirm:
+                    return False
+            return True
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+    def report(self, limit: int = 15) -> str:
+        """
+        Собрать отчёт: рост по местам выделения и живые объекты по типам.
+
+        Аргументы:
+            limit: Сколько строк показывать в каждом разделе
+
+        Возвращает:
+            Текст отчёта
+        """
+        if len(self.samples) < 2:
+            return "Недостаточно замеров"
+
+        first, last = self.samples[0], self.samples[-1]
+        lines = [
+            f"Сценарий {self.scenario_name}: {last.tick / TICKS_PER_MINUTE:.1f} мин игрового времени, "
+            f"игр {self.games}, повышений уровня {self.level_ups}",
+            f"Рост памяти на сущность: {self.growth(last):+.0f} байт (порог {self.threshold:.0f}); "
+            f"на сущность {first.per_entity:.0f} -> {last.per_entity:.0f} байт",
+            f"Python: {first.traced / 1024:.0f} -> {last.traced / 1024:.0f} КБ; "
+            f"пиксели поверхностей: {first.surface_bytes / 1024:.0f} -> {last.surface_bytes / 1024:.0f} КБ; "
+            f"сущностей: {first.entities} -> {last.entities}",
+            "",
+            "Живые объекты по типам (опорный -> последний):",
+        ]
+        names = set(first.counts) | set(last.counts)
+        changes = sorted(names, key=lambda name: -abs(last.counts.get(name, 0) - first.counts.get(name, 0)))
+        for name in changes[:limit]:
+            before, after = first.counts.get(name, 0), last.counts.get(name, 0)
+            lines.append(f"    {name:<24} {before:>8} -> {after:<8} ({after - before:+d})")
+
+        if self.baseline is not None and self.last_snapshot is not None:
+            lines.append("")
+            lines.append("Рост выделений по местам (tracemalloc):")
+            for stat in self.last_snapshot.compare_to(self.baseline, "lineno")[:limit]:
+                frame = stat.traceback[0]
+                lines.append(f"    {stat.size_diff / 1024:+9.1f} КБ {stat.count_diff:+7d} блоков  "
+                             f"{os.path.relpath(frame.filename)}:{frame.lineno}")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        """
+        Записать замеры в JSON.
+
+        Аргументы:
+            path: Путь к файлу
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({
+                "scenario": self.scenario_name,
+                "threshold": self.threshold,
+                "games": self.games,
+                "level_ups": self.level_ups,
+                "samples": [dict(sample._asdict(), per_entity=sample.per_entity) for sample in self.samples],
+            }, file, ensure_ascii=False, indent=1)
+
+
+def soak_scenario(game, name: str, minutes: float, threshold: float, output: Optional[str] = None) -> bool:
+    """
+    Прогнать сценарий на утечки памяти и вывести отчёт.
+
+    Аргументы:
+        game: Главный экземпляр игры
+        name: Название сценария из SCENARIOS
+        minutes: Длительность прогона в минутах игрового времени
+        threshold: Допустимый рост памяти на сущность в байтах
+        output: Путь к файлу JSON с замерами (None — не записывать)
+
+    Возвращает:
+        True, если утечка не обнаружена
+    """
+    soak = MemorySoak(game, name, threshold=threshold)
+    passed = soak.run(minutes)
+    if output:
+        soak.save(output)
+
+    print(soak.report())
+    print("Утечка не обнаружена" if passed else "ПРОВАЛ: память на сущность растёт")
+    return passed
@@ -0,0 +1,322 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import pygame
+
+
+# Каталог исходных звуков и путь к собранному архиву
+SOURCE_DIR = "assets/sounds"
+ARCHIVE_PATH = "assets/cache/sounds.pak"
+
+MAGIC = b"SNDPAK1\n"
+HEADER = struct.Struct("<8sI")
+ALIGN = 16
+
+# Виды записей: звуковые эффекты хранятся декодированными (PCM в формате
+# микшера), музыка — исходным сжатым файлом для потокового проигрывания
+PCM = "pcm"
+RAW = "raw"
+
+
+def file_sha256(path: str) -> str:
+    """
+    Посчитать хэш содержимого файла.
+
+    Аргументы:
+        path: Путь к файлу
+
+    Возвращает:
+        SHA-256 в шестнадцатеричном виде
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SoundArchive:
+    """
+    Упакованный архив звуков, открытый через mmap.
+
+    Формат файла: MAGIC, длина индекса (uint32), индекс в JSON и данные
+    записей, выровненные по 16 байт. Индекс хранит формат микшера, для
+    которого декодированы звуки, а для каждого исходного файла — вид записи,
+    смещение и размер данных, SHA-256 содержимого, размер и mtime.
+
+    Звуковые эффекты создаются через pygame.mixer.Sound(buffer=...) прямо из
+    отображённой памяти, без чтения и декодирования файлов при запуске.
+    Музыка отдаётся pygame.mixer.music как файловый объект.
+    """
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.file = None
+        self.mm: Optional[mmap.mmap] = None
+        self.mixer_format: Optional[Tuple[int, int, int]] = None
+        self.entries: Dict[str, dict] = {}
+
+    @property
+    def is_open(self) -> bool:
+        """Открыт ли архив."""
+        return self.mm is not None
+
+    def open(self, path: str) -> bool:
+        """
+        Открыть архив.
+
+        Аргументы:
+            path: Путь к файлу архива
+
+        Возвращает:
+            True, если архив существует и прочитан
+        """
+        self.close()
+        try:
+            file = open(path, "rb")
+        except OSError:
+            return False
+
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_size = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError("неизвестный формат архива")
+            index = json.loads(mm[HEADER.size:HEADER.size + index_size].decode("utf-8"))
+        except (OSError, ValueError, struct.error):
+            file.close()
+            return False
+
+        self.path = path
+        self.file = file
+        self.mm = mm
+        self.mixer_format = tuple(index["mixer"])
+        self.entries = index["entries"]
+        return True
+
+    def close(self) -> None:
+        """
+        Закрыть архив.
+        """
+        if self.mm is not None:
+            self.mm.close()
+            self.file.close()
+        self.path = None
+        self.file = None
+        self.mm = None
+        self.mixer_format = None
+        self.entries = {}
+
+    def data(self, name: str) -> Optional[memoryview]:
+        """
+        Получить данные записи без копирования.
+
+        Аргументы:
+            name: Путь исходного файла, например "assets/sounds/click.wav"
+
+        Возвращает:
+            Срез отображённой памяти или None, если записи нет
+        """
+        entry = self.entries.get(name)
+        if entry is None or self.mm is None:
+            return None
+        return memoryview(self.mm)[entry["offset"]:entry["offset"] + entry["size"]]
+
+    def sound(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Создать звуковой эффект из архива.
+
+        Аргументы:
+            name: Путь исходного файла
+
+        Возвращает:
+            Звук или None, если в архиве нет подходящей записи
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry["kind"] != PCM or self.mixer_format != pygame.mixer.get_init():
+            return None
+        return pygame.mixer.Sound(buffer=self.data(name))
+
+    def load_music(self, name: str) -> None:
+        """
+        Загрузить музыку в pygame.mixer.music из архива или с диска.
+
+        Аргументы:
+            name: Путь исходного файла
+        """
+        data = self.data(name)
+        if data is None:
+            pygame.mixer.music.load(name)
+            return
+        pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(name)[1].lstrip("."))
+
+    def is_current(self, sources: Dict[str, str]) -> bool:
+        """
+        Проверить, соответствует ли архив исходным файлам и формату микшера.
+
+        Сначала сравниваются размер и mtime; содержимое хэшируется, только
+        если они изменились.
+
+        Аргументы:
+            sources: Словарь путь исходного файла → вид записи
+
+        Возвращает:
+            True, если пересобирать архив не нужно
+        """
+        if not self.is_open or self.mixer_format != pygame.mixer.get_init():
+            return False
+        if set(sources) != set(self.entries):
+            return False
+
+        for name, kind in sources.items():
+            entry = self.entries[name]
+            if entry["kind"] != kind:
+                return False
+            stat = os.stat(name)
+            if stat.st_size == entry["source_size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                continue
+            # Файл трогали — пересобрать, если изменилось содержимое или
+            # чтобы запомнить новый mtime (данные при этом переиспользуются)
+            return False
+        return True
+
+    def prepare(self, music_paths: Iterable[str], path: str = ARCHIVE_PATH, source_dir: str = SOURCE_DIR) -> bool:
+        """
+        Открыть архив, при необходимости пересобрав его.
+
+        Аргументы:
+            music_paths: Пути файлов, которые проигрываются как музыка
+            path: Путь к файлу архива
+            source_dir: Каталог исходных звуков
+
+        Возвращает:
+            True, если архив пришлось пересобрать
+        """
+        sources = list_sources(source_dir, music_paths)
+        self.open(path)
+        if self.is_current(sources):
+            return False
+
+        build_sound_archive(path, sources, self)
+        self.open(path)
+        return True
+
+
+def list_sources(source_dir: str, music_paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Найти исходные звуки и определить вид записи для каждого.
+
+    Аргументы:
+        source_dir: Каталог исходных звуков
+        music_paths: Пути файлов, которые проигрываются как музыка
+
+    Возвращает:
+        Словарь путь → PCM или RAW
+    """
+    music = set(music_paths)
+    sources = {}
+    for file_name in sorted(os.listdir(source_dir)):
+        name = f"{source_dir}/{file_name}"
+        if os.path.isfile(name):
+            sources[name] = RAW if name in music else PCM
+    return sources
+
+
+def build_sound_archive(path: str, sources: Dict[str, str], previous: Optional[SoundArchive] = None) -> Dict[str, int]:
+    """
+    Собрать архив звуков.
+
+    Звуковые эффекты декодируются в PCM в формате текущего микшера (микшер
+    должен быть инициализирован). Записи, у которых совпадает хэш содержимого
+    с предыдущим архивом того же формата, копируются из него без повторного
+    декодирования.
+
+    Аргументы:
+        path: Путь к файлу архива
+        sources: Словарь путь исходного файла → вид записи
+        previous: Открытый предыдущий архив или None
+
+    Возвращает:
+        Счётчики: transcoded, reused, raw, bytes
+    """
+    mixer_format = pygame.mixer.get_init()
+    reusable = previous is not None and previous.is_open and previous.mixer_format == mixer_format
+    counts = {"transcoded": 0, "reused": 0, "raw": 0, "bytes": 0}
+
+    entries = {}
+    blobs = []
+    for name, kind in sources.items():
+        stat = os.stat(name)
+        sha256 = file_sha256(name)
+
+        old = previous.entries.get(name) if reusable else None
+        if old is not None and old["sha256"] == sha256 and old["kind"] == kind:
+            blob = bytes(previous.data(name))
+            counts["reused"] += 1
+        elif kind == PCM:
+            blob = pygame.mixer.Sound(name).get_raw()
+            counts["transcoded"] += 1
+        else:
+            with open(name, "rb") as file:
+                blob = file.read()
+            counts["raw"] += 1
+
+        entries[name] = {
+            "kind": kind,
+            "size": len(blob),
+            "sha256": sha256,
+            "source_size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        blobs.append((name, blob))
+
+    # Смещения зависят от длины индекса, а длина индекса — от смещений:
+    # зарезервировать место под индекс с запасом на цифры смещений
+    for name, _ in blobs:
+        entries[name]["offset"] = 0
+    index_reserve = len(json.dumps({"mixer": mixer_format, "entries": entries})) + 16 * len(entries) + ALIGN
+    offset = -(-(HEADER.size + index_reserve) // ALIGN) * ALIGN
+    for name, blob in blobs:
+        entries[name]["offset"] = offset
+        offset = -(-(offset + len(blob)) // ALIGN) * ALIGN
+
+    index = json.dumps({"mixer": mixer_format, "entries": entries}).encode("utf-8")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(index)))
+        file.write(index)
+        for name, blob in blobs:
+            file.seek(entries[name]["offset"])
+            file.write(blob)
+        counts["bytes"] = file.tell()
+
+    # Отображённый файл нельзя заменить (в Windows), пока он открыт
+    if previous is not None:
+        previous.close()
+    os.replace(temp_path, path)
+    return counts
+
+
+# Архив звуков текущей игры (пока не открыт, звуки читаются с диска)
+sound_archive = SoundArchive()
+
+
+if __name__ == "__main__":
+    # Шаг сборки ресурсов: python -m systems.sound_archive
+    from constants import Sounds
+
+    pygame.mixer.init()
+    started = time.perf_counter()
+    previous = SoundArchive()
+    previous.open(ARCHIVE_PATH)
+    counts = build_sound_archive(ARCHIVE_PATH, list_sources(SOURCE_DIR, Sounds.MUSIC), previous)
+    print(f"{ARCHIVE_PATH}: {counts['transcoded']} декодировано, {counts['reused']} без изменений, "
+          f"{counts['raw']} музыки, {counts['bytes'] / 1024 / 1024:.1f} МБ "
+          f"за {(time.perf_counter() - started) * 1000:.0f} мс")
@@ -0,0 +1,142 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from systems.archetypes import ArchetypeTable
+
+
+class SpatialGrid:
+    """
+    Равномерная сетка для быстрого поиска точек в радиусе.
+
+    Индексы точек сортируются по ключу ячейки, поэтому запрос по радиусу
+    сводится к нескольким бинарным поискам по отсортированному массиву ключей.
+    """
+    # Смещение, чтобы ключи ячеек с отрицательными координатами оставались уникальными
+    _KEY_OFFSET = 1 << 20
+    _KEY_STRIDE = 1 << 21
+
+    def __init__(self, positions: np.ndarray, cell_size: int = 128):
+        """
+        Построить сетку по массиву позиций.
+
+        Аргументы:
+            positions: Массив позиций формы (N, 2) в мировых координатах
+            cell_size: Размер ячейки сетки в пикселях
+        """
+        self.cell_size = cell_size
+
+        cells = np.floor_divide(positions, cell_size).astype(np.int64)
+        keys = self._keys(cells[:, 0], cells[:, 1])
+
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _keys(self, cell_x, cell_y):
+        return (cell_x + self._KEY_OFFSET) * self._KEY_STRIDE + (cell_y + self._KEY_OFFSET)
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """
+        Найти индексы всех точек в ячейках, пересекающих квадрат вокруг окружности.
+
+        Аргументы:
+            x: Координата x центра
+            y: Координата y центра
+            radius: Радиус поиска
+
+        Возвращает:
+            Массив индексов-кандидатов (точную проверку расстояния делает вызывающий код)
+        """
+        if len(self.sorted_keys) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        min_cx = int((x - radius) // self.cell_size)
+        max_cx = int((x + radius) // self.cell_size)
+        min_cy = int((y - radius) // self.cell_size)
+        max_cy = int((y + radius) // self.cell_size)
+
+        # Ячейки одного столбца имеют подряд идущие ключи, поэтому достаточно
+        # одного диапазона на каждый столбец сетки
+        chunks = []
+        for cell_x in range(min_cx, max_cx + 1):
+            start = np.searchsorted(self.sorted_keys, self._keys(cell_x, min_cy), side="left")
+            end = np.searchsorted(self.sorted_keys, self._keys(cell_x, max_cy), side="right")
+            if end > start:
+                chunks.append(self.order[start:end])
+
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(chunks)
+
+
+class EnemySnapshot:
+    """
+    Снимок позиций врагов в виде массивов для пакетных геометрических запросов.
+    """
+    def __init__(self, table: ArchetypeTable, cell_size: int = 128):
+        """
+        Собрать массивы позиций из таблицы врагов.
+
+        Аргументы:
+            table: Таблица врагов
+            cell_size: Размер ячейки пространственной сетки
+        """
+        self.rows = table.live_rows()
+        self.sprites: List = table.objects_at(self.rows)
+
+        # Центры врагов в мировых координатах
+        self.positions = np.stack((table["pos_x"][self.rows], table["pos_y"][self.rows]), axis=1)
+        self.half_sizes = np.stack((table["width"][self.rows], table["height"][self.rows]), axis=1) / 2
+        self.half_widths = self.half_sizes[:, 0]
+        self.entity_ids = table.entity_ids_at(self.rows)
+
+        self.grid = SpatialGrid(self.positions, cell_size)
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    def query_circles(self, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """
+        Найти кандидатов для набора окружностей с учётом половины ширины врагов.
+
+        Аргументы:
+            centers: Массив центров окружностей формы (C, 2)
+            radii: Массив радиусов окружностей формы (C,)
+
+        Возвращает:
+            Отсортированный массив уникальных индексов врагов-кандидатов
+        """
+        if len(self.sprites) == 0 or len(centers) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        margin = float(self.half_widths.max())
+        chunks = [
+            self.grid.query_radius(x, y, radius + margin)
+            for (x, y), radius in zip(centers.tolist(), radii.tolist())
+        ]
+        return np.unique(np.concatenate(chunks))
+
+    def query_sector(self, origin: Tuple[float, float], direction: Tuple[float, float], radius: float) -> np.ndarray:
+        """
+        Найти врагов в полукруге радиуса radius перед точкой origin.
+
+        Аргументы:
+            origin: Вершина сектора в мировых координатах
+            direction: Направление сектора (длина не важна)
+            radius: Радиус сектора
+
+        Возвращает:
+            Массив индексов врагов внутри сектора
+        """
+        candidates = self.grid.query_radius(origin[0], origin[1], radius)
+        if len(candidates) == 0:
+            return candidates
+
+        offsets = self.positions[candidates] - origin
+        distances_sq = np.einsum("ij,ij->i", offsets, offsets)
+
+        # Знак скалярного произведения не зависит от нормализации векторов
+        facing = offsets @ np.asarray(direction, dtype=np.float64)
+
+        inside = (distances_sq <= radius * radius) & (facing > 0)
+        return candidates[inside]
@@ -0,0 +1,159 @@
+from collections import Counter, deque
+from typing import Dict
+
+
+class SpawnGovernor:
+    """
+    Регулятор спавна врагов по времени кадра и количеству сущностей.
+
+    Игровой экран сообщает, сколько врагов он хотел бы создать в этом кадре,
+    а регулятор решает, сколько создать на самом деле:
+
+    - если скользящее среднее времени кадра превышает бюджет, спавн
+      откладывается в очередь (throttle/defer);
+    - когда запас по времени появляется, отложенные враги создаются
+      пачкой, но не больше batch_size за кадр (batch);
+    - если достигнут лимит сущностей или очередь переполнена, лишние враги
+      превращаются в прибавку к прочности следующих врагов (max_health и
+      damage), а не в новые тела. Прибавка ограничена max_toughness и
+      убывает на toughness_decay за кадр, пока регулятор укладывается в
+      бюджет и не держит отложенных врагов.
+    """
+    def __init__(self, budget_ms: float = 20.0, entity_cap: int = 400, window: int = 60,
+                 batch_size: int = 5, max_pending: int = 20, toughness_per_spawn: float = 0.05,
+                 max_toughness: float = 2.0, toughness_decay: float = 0.001):
+        """
+        Инициализация регулятора.
+
+        Аргументы:
+            budget_ms: Бюджет времени кадра в миллисекундах
+            entity_cap: Максимальное количество врагов в игре
+            window: Количество кадров в скользящем окне времени кадра
+            batch_size: Максимальное количество отложенных врагов, создаваемых за кадр
+            max_pending: Максимальное количество отложенных врагов
+            toughness_per_spawn: Прибавка к прочности за каждого непоявившегося врага
+            max_toughness: Наибольшая прибавка к прочности
+            toughness_decay: Убывание прибавки за кадр, когда запас есть
+        """
+        self.budget_ms = budget_ms
+        self.entity_cap = entity_cap
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.toughness_per_spawn = toughness_per_spawn
+        self.max_toughness = max_toughness
+        self.toughness_decay = toughness_decay
+
+        self.frame_times = deque(maxlen=window)
+        self.frame_time_sum = 0.0
+
+        self.pending = 0
+        self.toughness = 0.0
+        self.counts: Counter = Counter()
+
+    @property
+    def average_frame_ms(self) -> float:
+        """Скользящее среднее времени кадра в миллисекундах."""
+        if not self.frame_times:
+            return 0.0
+        return self.frame_time_sum / len(self.frame_times)
+
+    def record_frame(self, frame_ms: float) -> None:
+        """
+        Добавить время кадра в скользящее окно.
+
+        Аргументы:
+            frame_ms: Время кадра в миллисекундах
+        """
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self.frame_time_sum -= self.frame_times[0]
+        self.frame_times.append(frame_ms)
+        self.frame_time_sum += frame_ms
+
+    def request(self, wanted: int, enemy_count: int) -> int:
+        """
+        Решить, сколько врагов создать в этом кадре.
+
+        Аргументы:
+            wanted: Сколько врагов игра хотела бы создать
+            enemy_count: Текущее количество врагов в игре
+
+        Возвращает:
+            Количество врагов, которое нужно создать
+        """
+        self.counts["requested"] += wanted
+        self.pending += wanted
+
+        # Лимит сущностей: всё сверх него становится прочностью
+        headroom = max(0, self.entity_cap - enemy_count)
+        if headroom == 0:
+            if self.pending:
+                self.counts["capped_frames"] += 1
+            self.convert(self.pending)
+            return 0
+
+        # Кадр не укладывается в бюджет: отложить спавн
+        if self.average_frame_ms > self.budget_ms:
+            if wanted:
+                self.counts["throttled_frames"] += 1
+                self.counts["deferred"] += wanted
+            if self.pending > self.max_pending:
+                self.convert(self.pending - self.max_pending)
+            return 0
+
+        # Запас есть: создать отложенных врагов пачкой
+        count = min(self.pending, self.batch_size, headroom)
+        self.pending -= count
+        self.counts["spawned"] += count
+        if count > 1:
+            self.counts["batches"] += 1
+
+        # То, что не влезло в лимит сущностей, тоже становится прочностью
+        overflow = max(0, self.pending - max(0, headroom - count))
+        self.convert(overflow)
+
+        # Очередь пуста и кадр в бюджете: прибавка к прочности больше не нужна
+        if self.pending == 0:
+            self.toughness = max(0.0, self.toughness - self.toughness_decay)
+
+        return count
+
+    def convert(self, count: int) -> None:
+        """
+        Превратить непоявившихся врагов в прибавку к прочности следующих.
+
+        Аргументы:
+            count: Количество врагов
+        """
+        if count <= 0:
+            return
+        self.pending -= count
+        self.toughness = min(self.max_toughness, self.toughness + count * self.toughness_per_spawn)
+        self.counts["converted"] += count
+
+    def toughness_multiplier(self) -> float:
+        """
+        Множитель max_health и damage для новых врагов.
+
+        Возвращает:
+            Множитель (1.0 — без прибавки)
+        """
+        return 1.0 + self.toughness
+
+    def counters(self) -> Dict[str, float]:
+        """
+        Получить счётчики решений регулятора.
+
+        Возвращает:
+            Словарь: requested, spawned, deferred, batches, converted,
+            throttled_frames, capped_frames, а также текущие pending,
+            toughness и average_frame_ms
+        """
+        counters = {
+            name: self.counts[name]
+            for name in ("requested", "spawned", "deferred", "batches", "converted",
+                         "throttled_frames", "capped_frames")
+        }
+        counters["pending"] = self.pending
+        counters["toughness"] = self.toughness
+        counters["average_frame_ms"] = self.average_frame_ms
+        return counters
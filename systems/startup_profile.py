@@ -0,0 +1,49 @@
+import time
+from typing import List, Tuple
+
+from constants import LazySound
+
+
+class StartupProfile:
+    """
+    Разбивка времени запуска игры по этапам (--startup-profile).
+
+    Этапы отмечаются по порядку вызовом mark(): каждый этап длится от
+    предыдущей отметки (или от запуска процесса) до текущей.
+    """
+    def __init__(self, started: float):
+        """
+        Аргументы:
+            started: Момент запуска (time.perf_counter()) до импортов
+        """
+        self.started = started
+        self.last = started
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, name: str) -> None:
+        """
+        Завершить этап запуска.
+
+        Аргументы:
+            name: Название этапа
+        """
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self) -> None:
+        """
+        Напечатать разбивку времени запуска (один раз).
+        """
+        if self.reported:
+            return
+        self.reported = True
+
+        total = self.last - self.started
+        print("Профиль запуска:")
+        for name, seconds in self.phases:
+            share = seconds / total * 100 if total > 0 else 0.0
+            print(f"  {name:<12} {seconds * 1000:8.1f} мс  {share:5.1f}%")
+        print(f"  {'звуки':<12} {LazySound.load_seconds * 1000:8.1f} мс  (декодирование, входит в этапы выше)")
+        print(f"  {'всего':<12} {total * 1000:8.1f} мс")
@@ -0,0 +1,176 @@
+import gc
+import sys
+from typing import List, Tuple
+
+import pygame
+from pygame import Surface
+
+from systems.log import get_logger
+
+
+log = get_logger("render")
+
+
+def display_ready() -> bool:
+    """
+    Проверить, открыто ли окно (до этого convert() невозможен).
+
+    Возвращает:
+        True, если формат экрана уже известен
+    """
+    return pygame.display.get_surface() is not None
+
+
+def to_display_format(surface: Surface) -> Surface:
+    """
+    Перевести поверхность в пиксельный формат экрана.
+
+    Поверхности с попиксельной прозрачностью переводятся через
+    convert_alpha(), остальные — через convert(). Пока окно не открыто,
+    поверхность возвращается как есть и будет показана проверкой
+    check_surface_formats(), если доживёт до неё.
+
+    Аргументы:
+        surface: Исходная поверхность
+
+    Возвращает:
+        Поверхность в формате экрана (или исходная, если окна ещё нет)
+    """
+    alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    if display_ready():
+        surface = surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+
+def make_surface(size: Tuple[int, int], alpha: bool = False) -> Surface:
+    """
+    Создать поверхность сразу в формате экрана.
+
+    Аргументы:
+        size: Размер (ширина, высота)
+        alpha: Нужна ли попиксельная прозрачность
+
+    Возвращает:
+        Новая поверхность
+    """
+    return to_display_format(Surface(size, pygame.SRCALPHA if alpha else 0))
+
+
+def make_overlay(size: Tuple[int, int], color: Tuple[int, int, int], alpha: int) -> Surface:
+    """
+    Создать равномерный полупрозрачный оверлей.
+
+    Вместо попиксельной прозрачности используется прозрачность всей
+    поверхности: непрозрачная поверхность в формате экрана с set_alpha()
+    выглядит так же, но смешивается заметно быстрее.
+
+    Аргументы:
+        size: Размер (ширина, высота)
+        color: RGB цвет оверлея
+        alpha: Прозрачность 0–255
+
+    Возвращает:
+        Поверхность оверлея
+    """
+    overlay = make_surface(size)
+    overlay.fill(color)
+    overlay.set_alpha(alpha)
+    return overlay
+
+
+def freeze(surface: Surface, premultiply: bool = True) -> Surface:
+    """
+    Подготовить готовую неизменяемую картинку с прозрачностью к быстрому выводу.
+
+    Картинка переводится в формат экрана, включается RLE-ускорение (выгодно
+    для спрайтов с большими прозрачными областями), а при premultiply цвет
+    заранее умножается на альфу. Такую картинку нужно выводить с
+    special_flags=pygame.BLEND_PREMULTIPLIED. После freeze() в картинку
+    больше нельзя рисовать.
+
+    Аргументы:
+        surface: Нарисованная поверхность с SRCALPHA
+        premultiply: Умножить цвет на альфу
+
+    Возвращает:
+        Подготовленная поверхность
+    """
+    surface = to_display_format(surface)
+    if premultiply:
+        surface = surface.premul_alpha()
+    surface.set_alpha(255, pygame.RLEACCEL)
+    return surface
+
+
+def live_surfaces() -> List[Surface]:
+    """
+    Найти все живые поверхности.
+
+    Поверхности pygame не отслеживаются сборщиком мусора, поэтому они
+    находятся через ссылки из отслеживаемых объектов и модулей: атрибуты
+    спрайтов, экранов и кнопок, списки кадров анимации, кэши и т. п.
+
+    Возвращает:
+        Поверхности без повторов
+    """
+    surfaces = {}
+    # Словари модулей добавлены явно: в gc.get_objects() они попадают не всегда
+    modules = [vars(module) for module in list(sys.modules.values()) if module is not None]
+    for obj in gc.get_objects() + modules:
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, Surface):
+                surfaces[id(referent)] = referent
+    return list(surfaces.values())
+
+
+def check_surface_formats() -> List[str]:
+    """
+    Найти живые поверхности, формат которых не совпадает с форматом экрана.
+
+    Проверяются все поверхности, а не только созданные фабрикой: текст,
+    отрисованный шрифтом, кнопки, полоски прогресса и картинки, загруженные
+    мимо фабрики. Поверхность с каналом альфы сравнивается с
+    форматом convert_alpha(), остальные — с форматом convert().
+
+    Возвращает:
+        Список описаний несовпадений (пустой, если всё в порядке)
+    """
+    if not display_ready():
+        return ["окно не открыто, формат экрана неизвестен"]
+
+    window = pygame.display.get_surface()
+    references = {
+        False: Surface((1, 1)).convert(),
+        True: Surface((1, 1), pygame.SRCALPHA).convert_alpha(),
+    }
+
+    skip = {id(window)} | {id(reference) for reference in references.values()}
+    problems = []
+    for surface in live_surfaces():
+        if id(surface) in skip:
+            continue
+        # Флаг SRCALPHA бывает и у поверхностей с общей прозрачностью
+        # (set_alpha), поэтому попиксельная прозрачность — по маске альфы
+        reference = references[bool(surface.get_masks()[3])]
+        if surface.get_bitsize() != reference.get_bitsize() or surface.get_masks() != reference.get_masks():
+            problems.append(
+                f"{surface.get_size()}: {surface.get_bitsize()} бит, маски {surface.get_masks()}, "
+                f"ожидалось {reference.get_bitsize()} бит, маски {reference.get_masks()}"
+            )
+    return problems
+
+
+def report_surface_formats() -> int:
+    """
+    Записать результат check_surface_formats() в журнал.
+
+    Возвращает:
+        Количество поверхностей не в формате экрана
+    """
+    problems = check_surface_formats()
+    if not problems:
+        log.info("Все поверхности в формате экрана")
+        return 0
+    for problem in problems:
+        log.warning("Поверхность не в формате экрана", surface=problem)
+    return len(problems)
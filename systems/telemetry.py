@@ -0,0 +1,361 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+# Сколько слотов оружия учитывается в телеметрии
+MAX_WEAPON_SLOTS = 8
+
+# Запись одного кадра
+FRAME_DTYPE = np.dtype([
+    ("frame", np.int64),
+    ("time", np.float64),
+    ("frame_ms", np.float32),
+    ("update_ms", np.float32),
+    ("render_ms", np.float32),
+    ("gc_ms", np.float32),
+    ("gc_events", np.uint16),
+    ("level", np.int16),
+    ("enemies", np.int32),
+    ("kills", np.int32),
+    ("projectiles", np.int32, (MAX_WEAPON_SLOTS,)),
+])
+
+# Поля, которые заполняет игровой экран (на остальных экранах они нулевые)
+GAME_FIELDS = ("level", "enemies", "kills", "projectiles")
+
+# Заголовок файла: магия, версия, размер записи, ёмкость, число записанных
+# кадров, длина описания полей; за ним описание полей в JSON и данные,
+# начиная со смещения, кратного DATA_ALIGN
+MAGIC = b"TLMTRY1\n"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIQI")
+COUNT_OFFSET = struct.calcsize("<8sIII")
+DATA_ALIGN = 64
+
+
+class TelemetryRecorder:
+    """
+    Кольцевой буфер телеметрии по кадрам.
+
+    Буфер — структурированный массив numpy фиксированной ёмкости, поэтому
+    запись кадра сводится к присваиванию в уже выделенную память. Если
+    открыт файл (open()), буфер лежит прямо в отображённом в память файле:
+    счётчик кадров в заголовке обновляется каждый кадр (это запись в
+    память), а раз в flush_interval кадров страницы сбрасываются на диск,
+    так что после аварийного завершения в файле остаются последние
+    capacity кадров.
+
+    Кадр заполняется в два приёма: главный цикл записывает время кадра,
+    обновления, отрисовки и паузы сборщика мусора (end_frame), а игровой
+    экран — состояние боя (record_game).
+    """
+    def __init__(self, capacity: int = 4096, flush_interval: int = 300):
+        """
+        Инициализация регистратора.
+
+        Аргументы:
+            capacity: Количество кадров в кольцевом буфере
+            flush_interval: Раз во сколько кадров сбрасывать буфер в файл
+        """
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.started = time.perf_counter()
+
+        self.path: Optional[str] = None
+        self.file = None
+        self.mm: Optional[mmap.mmap] = None
+
+        self.count = 0
+        self.attach(np.zeros(capacity, dtype=FRAME_DTYPE))
+
+    def attach(self, buffer: np.ndarray) -> None:
+        """
+        Использовать массив как кольцевой буфер.
+
+        Аргументы:
+            buffer: Массив записей FRAME_DTYPE длиной capacity
+        """
+        self.buffer = buffer
+        # Представления полей создаются один раз, чтобы запись кадра
+        # ничего не выделяла
+        self.columns = {name: buffer[name] for name in FRAME_DTYPE.names}
+
+    @property
+    def head(self) -> int:
+        """Индекс записи текущего кадра."""
+        return self.count % self.capacity
+
+    def open(self, path: str) -> None:
+        """
+        Перенести буфер в отображённый в память файл.
+
+        Аргументы:
+            path: Путь к файлу телеметрии (перезаписывается)
+        """
+        self.close()
+
+        descr = json.dumps(FRAME_DTYPE.descr).encode("utf-8")
+        data_offset = -(-(HEADER.size + len(descr)) // DATA_ALIGN) * DATA_ALIGN
+        size = data_offset + FRAME_DTYPE.itemsize * self.capacity
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        file = open(path, "w+b")
+        file.truncate(size)
+        mm = mmap.mmap(file.fileno(), size)
+        HEADER.pack_into(mm, 0, MAGIC, VERSION, FRAME_DTYPE.itemsize, self.capacity, 0, len(descr))
+        mm[HEADER.size:HEADER.size + len(descr)] = descr
+
+        self.path = path
+        self.file = file
+        self.mm = mm
+        self.count = 0
+        self.attach(np.frombuffer(mm, dtype=FRAME_DTYPE, count=self.capacity, offset=data_offset))
+
+    def close(self) -> None:
+        """
+        Сбросить и закрыть файл; буфер снова становится обычным массивом.
+        """
+        if self.mm is None:
+            return
+        self.flush()
+        copy = self.buffer.copy()
+        # Отображение нельзя закрыть, пока на него ссылаются массивы
+        self.attach(copy)
+        self.mm.close()
+        self.file.close()
+        self.path = None
+        self.file = None
+        self.mm = None
+
+    def flush(self) -> None:
+        """
+        Записать счётчик кадров в заголовок и сбросить страницы на диск.
+        """
+        if self.mm is None:
+            return
+        struct.pack_into("<Q", self.mm, COUNT_OFFSET, self.count)
+        self.mm.flush()
+
+    def begin_frame(self) -> None:
+        """
+        Начать запись кадра: обнулить поля игрового экрана.
+        """
+        head = self.head
+        columns = self.columns
+        for name in GAME_FIELDS:
+            columns[name][head] = 0
+
+    def record_game(self, enemies: int, level: int, kills: int, weapons: Iterable) -> None:
+        """
+        Записать состояние боя в текущий кадр.
+
+        Аргументы:
+            enemies: Количество врагов
+            level: Уровень игрока
+            kills: Количество убитых врагов с начала игры
+            weapons: Оружие по слотам (None — пустой слот)
+        """
+        head = self.head
+        columns = self.columns
+        columns["enemies"][head] = enemies
+        columns["level"][head] = level
+        columns["kills"][head] = kills
+
+        projectiles = columns["projectiles"]
+        for slot, weapon in enumerate(weapons):
+            if slot >= MAX_WEAPON_SLOTS:
+                break
+            if weapon is not None:
+                projectiles[head, slot] = weapon.projectile_count()
+
+    def end_frame(self, frame_ms: float, update_ms: float, render_ms: float,
+                  gc_events: int, gc_ms: float) -> None:
+        """
+        Закончить запись кадра.
+
+        Аргументы:
+            frame_ms: Полное время кадра (вместе с ожиданием)
+            update_ms: Время обновления экрана
+            render_ms: Время отрисовки и вывода на экран
+            gc_events: Количество сборок мусора за кадр
+            gc_ms: Суммарная пауза сборщика мусора за кадр
+        """
+        head = self.head
+        columns = self.columns
+        columns["frame"][head] = self.count
+        columns["time"][head] = time.perf_counter() - self.started
+        columns["frame_ms"][head] = frame_ms
+        columns["update_ms"][head] = update_ms
+        columns["render_ms"][head] = render_ms
+        columns["gc_events"][head] = gc_events
+        columns["gc_ms"][head] = gc_ms
+
+        self.count += 1
+        if self.mm is not None:
+            # Счётчик в заголовке актуален даже без сброса на диск: страницы
+            # отображения попадут в файл и при аварийном завершении процесса
+            struct.pack_into("<Q", self.mm, COUNT_OFFSET, self.count)
+            if self.count % self.flush_interval == 0:
+                self.mm.flush()
+
+    def frames(self) -> np.ndarray:
+        """
+        Получить записанные кадры по порядку (копия).
+
+        Возвращает:
+            Массив записей FRAME_DTYPE от самого старого кадра к новому
+        """
+        return ordered(self.buffer, self.count)
+
+
+def ordered(buffer: np.ndarray, count: int) -> np.ndarray:
+    """
+    Развернуть кольцевой буфер в хронологическом порядке.
+
+    Аргументы:
+        buffer: Кольцевой буфер
+        count: Сколько кадров было записано всего
+
+    Возвращает:
+        Массив записей от самого старого кадра к новому
+    """
+    capacity = len(buffer)
+    if count <= capacity:
+        return buffer[:count].copy()
+    head = count % capacity
+    return np.concatenate((buffer[head:], buffer[:head]))
+
+
+def read_telemetry(path: str) -> np.ndarray:
+    """
+    Прочитать файл телеметрии.
+
+    Аргументы:
+        path: Путь к файлу
+
+    Возвращает:
+        Массив записей от самого старого кадра к новому
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, record_size, capacity, count, descr_size = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: неизвестный формат телеметрии")
+
+    descr = json.loads(data[HEADER.size:HEADER.size + descr_size].decode("utf-8"))
+    dtype = np.dtype([tuple(field) if len(field) == 2 else (field[0], field[1], tuple(field[2]))
+                      for field in descr])
+    if dtype.itemsize != record_size:
+        raise ValueError(f"{path}: размер записи не совпадает с описанием полей")
+
+    data_offset = -(-(HEADER.size + descr_size) // DATA_ALIGN) * DATA_ALIGN
+    buffer = np.frombuffer(data, dtype=dtype, count=capacity, offset=data_offset)
+    return ordered_by_frame(buffer)
+
+
+def ordered_by_frame(buffer: np.ndarray) -> np.ndarray:
+    """
+    Развернуть кольцевой буфер из файла по номерам кадров.
+
+    Счётчику в заголовке не доверяем: процесс мог завершиться между
+    записью кадра и обновлением счётчика. Слот считается записанным, если
+    номер кадра в нём попадает в этот слот, а время ненулевое (у
+    незаписанных слотов оба поля нулевые).
+
+    Аргументы:
+        buffer: Кольцевой буфер
+
+    Возвращает:
+        Массив записей от самого старого кадра к новому
+    """
+    frame = buffer["frame"]
+    written = (frame >= 0) & (frame % len(buffer) == np.arange(len(buffer))) & (buffer["time"] > 0)
+    valid = buffer[written]
+    return valid[np.argsort(valid["frame"], kind="stable")]
+
+
+def flat_records(frames: np.ndarray) -> Iterable[Dict[str, float]]:
+    """
+    Превратить записи в плоские словари (projectiles → projectiles_1 ...).
+
+    Аргументы:
+        frames: Массив записей
+
+    Возвращает:
+        Словари по кадрам
+    """
+    for record in frames:
+        row = {}
+        for name in frames.dtype.names:
+            value = record[name]
+            if np.ndim(value):
+                for slot, item in enumerate(value, start=1):
+                    row[f"{name}_{slot}"] = item.item()
+            else:
+                row[name] = value.item()
+        yield row
+
+
+def export_csv(frames: np.ndarray, path: str) -> None:
+    """
+    Записать кадры в CSV.
+
+    Аргументы:
+        frames: Массив записей
+        path: Путь к файлу CSV
+    """
+    import csv
+
+    rows = flat_records(frames)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        first = next(rows, None)
+        if first is None:
+            return
+        writer = csv.DictWriter(file, fieldnames=list(first))
+        writer.writeheader()
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def export_jsonl(frames: np.ndarray, path: str) -> None:
+    """
+    Записать кадры в JSONL (один кадр на строку).
+
+    Аргументы:
+        frames: Массив записей
+        path: Путь к файлу JSONL
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for row in flat_records(frames):
+            file.write(json.dumps(row) + "\n")
+
+
+# Телеметрия текущей игры (в памяти, пока не открыт файл)
+telemetry = TelemetryRecorder()
+
+
+if __name__ == "__main__":
+    # Чтение записанной телеметрии: python -m systems.telemetry run.tlm --csv run.csv
+    parser = argparse.ArgumentParser(description="Преобразовать файл телеметрии в CSV или JSONL")
+    parser.add_argument("path", help="файл телеметрии")
+    parser.add_argument("--csv", help="записать кадры в CSV")
+    parser.add_argument("--jsonl", help="записать кадры в JSONL")
+    args = parser.parse_args()
+
+    frames = read_telemetry(args.path)
+    if args.csv:
+        export_csv(frames, args.csv)
+    if args.jsonl:
+        export_jsonl(frames, args.jsonl)
+    if not args.csv and not args.jsonl and len(frames):
+        frame_ms = frames["frame_ms"]
+        print(f"{len(frames)} кадров; время кадра: среднее {frame_ms.mean():.2f} мс, "
+              f"p99 {np.percentile(frame_ms, 99):.2f} мс, максимум {frame_ms.max():.2f} мс")
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+from systems.archetypes import world
+from systems.log import get_logger
+
+
+log = get_logger("watchdog")
+
+# Каталог файлов с медленными кадрами по умолчанию
+CAPTURE_DIR = "captures"
+
+
+class FrameWatchdog:
+    """
+    Автоматический захват медленных кадров.
+
+    Фоновый поток раз в sample_interval секунд снимает стек вызовов
+    главного потока и складывает его в кольцевой буфер вместе с номером
+    кадра. Если кадр оказался дольше threshold_ms, его стеки, разбивка по
+    этапам, количество сущностей и стек экранов записываются в файл
+    JSON в каталоге captures. Захваты ограничены по частоте: не чаще
+    одного раза в min_interval секунд и не больше max_captures за запуск.
+
+    Поток получает стеки только тогда, когда ему достаётся GIL, поэтому на
+    время работы сторожа интервал переключения потоков интерпретатора
+    (sys.setswitchinterval) уменьшается до интервала выборки.
+    """
+    def __init__(self, threshold_ms: float = 50.0, sample_interval: float = 0.002,
+                 history: int = 5000, min_interval: float = 5.0, max_captures: int = 50,
+                 max_depth: int = 64, directory: str = CAPTURE_DIR):
+        """
+        Инициализация сторожа.
+
+        Аргументы:
+            threshold_ms: Время работы кадра, выше которого кадр захватывается
+            sample_interval: Интервал выборки стека в секундах
+            history: Сколько последних выборок хранить
+            min_interval: Минимальный интервал между захватами в секундах
+            max_captures: Максимальное количество захватов за запуск
+            max_depth: Максимальная глубина стека в выборке
+            directory: Каталог для файлов захватов
+        """
+        self.threshold_ms = threshold_ms
+        self.sample_interval = sample_interval
+        self.min_interval = min_interval
+        self.max_captures = max_captures
+        self.max_depth = max_depth
+        self.directory = directory
+
+        self.samples: deque = deque(maxlen=history)  # (кадр, стек)
+        self.frame_index = 0
+        self.frame_started = 0.0
+
+        self.captures = 0
+        self.skipped = 0
+        self.last_capture = float("-inf")
+
+        self.main_thread_id = threading.main_thread().ident
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.switch_interval = sys.getswitchinterval()
+
+    @property
+    def running(self) -> bool:
+        """Запущен ли поток выборки."""
+        return self.thread is not None
+
+    def start(self) -> None:
+        """
+        Запустить поток выборки стеков.
+        """
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, self.sample_interval))
+        self.thread = threading.Thread(target=self.run, name="watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Остановить поток выборки стеков.
+        """
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(1.0)
+        self.thread = None
+        sys.setswitchinterval(self.switch_interval)
+
+    def run(self) -> None:
+        """
+        Цикл потока: снимать стек главного потока.
+        """
+        while not self.stop_event.wait(self.sample_interval):
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is not None:
+                self.samples.append((self.frame_index, self.stack_of(frame)))
+
+    def stack_of(self, frame) -> Tuple[str, ...]:
+        """
+        Получить стек вызовов от внешнего вызова к внутреннему.
+
+        Аргументы:
+            frame: Текущий кадр стека Python
+
+        Возвращает:
+            Кортеж строк «функция (файл:строка)»
+        """
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def begin_frame(self) -> None:
+        """
+        Начать кадр: последующие выборки относятся к нему.
+        """
+        self.frame_index += 1
+        self.frame_started = time.perf_counter()
+
+    def end_frame(self, phases: Dict[str, float], view_stack: List) -> Optional[str]:
+        """
+        Закончить кадр и захватить его, если он слишком долгий.
+
+        Аргументы:
+            phases: Длительность этапов кадра в миллисекундах
+            view_stack: Стек экранов игры
+
+        Возвращает:
+            Путь к файлу захвата или None
+        """
+        work_ms = (time.perf_counter() - self.frame_started) * 1000
+        if work_ms < self.threshold_ms:
+            return None
+
+        now = time.time()
+        if now - self.last_capture < self.min_interval or self.captures >= self.max_captures:
+            self.skipped += 1
+            return None
+        self.last_capture = now
+        self.captures += 1
+
+        frame_index = self.frame_index
+        stacks = Counter(stack for index, stack in list(self.samples) if index == frame_index)
+
+        capture = {
+            "time": now,
+            "frame": frame_index,
+            "frame_ms": work_ms,
+            "threshold_ms": self.threshold_ms,
+            "phases": phases,
+            "entities": {table.name: len(table) for table in world.tables()},
+            "views": [type(view).__name__ for view in view_stack],
+            "samples": sum(stacks.values()),
+            "skipped_before": self.skipped,
+            "stacks": [{"stack": list(stack), "count": count} for stack, count in stacks.most_common()],
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime("frame-%Y%m%d-%H%M%S", time.localtime(now))
+                            + f"-{frame_index}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(capture, file, ensure_ascii=False, indent=1)
+
+        log.warning("Медленный кадр", frame_ms=round(work_ms, 1), path=path)
+        return path
+
+
+def load_captures(directory: str) -> List[Dict]:
+    """
+    Прочитать все захваты из каталога.
+
+    Аргументы:
+        directory: Каталог захватов
+
+    Возвращает:
+        Захваты, отсортированные по времени (в каждом добавлено поле path)
+    """
+    captures = []
+    if not os.path.isdir(directory):
+        return captures
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".json"):
+            continue
+        path = os.path.join(directory, file_name)
+        with open(path, encoding="utf-8") as file:
+            capture = json.load(file)
+        capture["path"] = path
+        captures.append(capture)
+    captures.sort(key=lambda capture: capture["time"])
+    return captures
+
+
+def hot_functions(capture: Dict, limit: int = 3) -> List[Tuple[str, int]]:
+    """
+    Найти функции, в которых чаще всего оказывался стек (по верхнему вызову).
+
+    Аргументы:
+        capture: Захват
+        limit: Сколько функций вернуть
+
+    Возвращает:
+        Список (функция, количество выборок)
+    """
+    leaves = Counter()
+    for entry in capture["stacks"]:
+        if entry["stack"]:
+            leaves[entry["stack"][-1]] += entry["count"]
+    return leaves.most_common(limit)
+
+
+def summarize(captures: List[Dict]) -> str:
+    """
+    Собрать текстовую сводку захватов.
+
+    Аргументы:
+        captures: Захваты
+
+    Возвращает:
+        Текст сводки
+    """
+    if not captures:
+        return "Захватов нет"
+
+    lines = []
+    for capture in captures:
+        clock = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(capture["time"]))
+        phases = ", ".join(f"{name} {ms:.1f}" for name, ms in capture["phases"].items())
+        entities = ", ".join(f"{name} {count}" for name, count in capture["entities"].items())
+        lines.append(f"{clock}  кадр {capture['frame']}  {capture['frame_ms']:.1f} мс  "
+                     f"[{' > '.join(capture['views'])}]")
+        lines.append(f"    этапы: {phases}")
+        lines.append(f"    сущности: {entities}")
+        for function, count in hot_functions(capture):
+            lines.append(f"    {count:4d}/{capture['samples']}  {function}")
+
+    frame_ms = [capture["frame_ms"] for capture in captures]
+    views = Counter(capture["views"][-1] if capture["views"] else "-" for capture in captures)
+    lines.append("")
+    lines.append(f"Всего {len(captures)} захватов; среднее {sum(frame_ms) / len(frame_ms):.1f} мс, "
+                 f"максимум {max(frame_ms):.1f} мс; экраны: "
+                 + ", ".join(f"{view} {count}" for view, count in views.most_common()))
+    return "\n".join(lines)
+
+
+# Сторож медленных кадров текущей игры (запускается флагом --watchdog)
+watchdog = FrameWatchdog()
+
+
+if __name__ == "__main__":
+    # Сводка захватов: python -m systems.watchdog [каталог]
+    parser = argparse.ArgumentParser(description="Список и сводка захваченных медленных кадров")
+    parser.add_argument("directory", nargs="?", default=CAPTURE_DIR, help="каталог захватов")
+    args = parser.parse_args()
+
+    print(summarize(load_captures(args.directory)))
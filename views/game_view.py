@@ -2,20 +2,43 @@ import pygame
 from pygame import Surface
 from typing import List, Dict, Tuple, Optional
 import random
+import math
+
+import numpy as np
 
 from sprites.player import Player
-from sprites.enemy import Enemy
+from sprites.enemy import Enemy, render_enemies
 from components.button import Button
 from constants import Colors, Sounds
 from weapons.pistol import Pistol
 from weapons.magic_wand import MagicWand
 from weapons.knife import Knife
+from systems.ai_scheduler import AiScheduler
+from systems.archetypes import world
+from systems.camera import Camera
+from systems.combat import CombatContext
+from systems.damage import DamageBuffer
+from systems.horde import HordeClustering
+from systems.lod import SimulationLod
+from systems.log import get_logger
+from systems.quality import quality
+from systems.sound_archive import sound_archive
+from systems.spawn_governor import SpawnGovernor
+from systems.surfaces import make_overlay, to_display_format
+
+
+log = get_logger("combat", rate_limit=20)
 
 
 class GameView:
     """
     Игровой экран, содержащий игрока (управление WASD) и врагов.
     """
+    # Экран сам заливает весь фон, поэтому главный цикл его не очищает
+    fills_background = True
+    # Автоматическая сборка мусора отключена, мусор собирается в запасе кадра
+    suppress_gc = True
+
     def __init__(self, game, player: Player):
         """
         Инициализация игрового экрана.
@@ -29,19 +52,50 @@ class GameView:
         # Создать игрока в центре экрана
         self.player = player
 
-        # Создать группы спрайтов
+        # Сущности прошлой игры не должны попасть в новую
+        world.reset()
+
+        # Создать группы спрайтов. Враги в all_sprites не входят: их рисует
+        # пакетная отрисовка по таблице мира, а в проходе по спрайтам
+        # они стоили бы проверки на каждого врага в каждом кадре
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
 
         # Добавить игрока в группу спрайтов
         self.all_sprites.add(self.player)
 
-        # Позиция камеры (мировые координаты)
-        self.camera_x = 0
-        self.camera_y = 0
+        # Камера: смещение между мировыми и экранными координатами
+        self.camera = Camera((self.screen_width, self.screen_height))
+
+        # Уровни детализации симуляции врагов (счётчики уровней — в self.lod.counts)
+        half_diagonal = math.hypot(self.screen_width, self.screen_height) / 2
+        self.lod = SimulationLod(
+            near_radius=half_diagonal + 150,
+            despawn_radius=half_diagonal * 3,
+            spawn_radius=half_diagonal + 50
+        )
+
+        # Планировщик решений врагов (метрики — в self.ai_scheduler.metrics)
+        self.ai_scheduler = AiScheduler()
+
+        # Объединение далёких врагов в рои, которые распадаются у ближней границы
+        self.horde = HordeClustering(
+            merge_radius=self.lod.near_radius * 1.5,
+            split_radius=self.lod.near_radius
+        )
 
         self.weapon_tick = 0
 
+        # Буфер событий урона, который разрешается один раз за кадр
+        self.damage_buffer = DamageBuffer()
+        self.kills = 0
+
+        # Данные боя на кадр (собираются заново после движения игрока)
+        self.combat_context = CombatContext(self.camera, self.enemies, self.all_sprites, self.damage_buffer)
+
+        # Регулятор спавна по времени кадра и лимиту врагов (счётчики — self.spawn_governor.counters())
+        self.spawn_governor = SpawnGovernor()
+
         # Создать начальных врагов
         self.spawn_enemies(5)
 
@@ -52,12 +106,17 @@ class GameView:
         self.game_over = False
         self.score = 0
         self.music_stopped = False  # Флаг, отслеживающий, остановлена ли музыка
+        self.game_over_overlay: Optional[Surface] = None
 
         # Элементы интерфейса
         self.font = pygame.font.SysFont("Arial", 24)
 
+        # Отрисованные строки интерфейса (на пониженном качестве обновляются реже)
+        self.ui_texts: List[Tuple[Surface, Tuple[int, int]]] = []
+        self.ui_frame = 0
+
         # Воспроизвести фоновую музыку
-        pygame.mixer.music.load(Sounds.BATTLE_MUSIC)
+        sound_archive.load_music(Sounds.BATTLE_MUSIC)
         pygame.mixer.music.play(-1)  # -1 означает зациклить бесконечно
 
     def spawn_enemies(self, count: int) -> None:
@@ -71,32 +130,31 @@ class GameView:
             # Спавн врагов в случайных позициях по краям видимого экрана
             side = random.randint(0, 3)
 
-            # Вычислить позиции спавна относительно камеры
+            # Вычислить позиции спавна на экране и перевести их в мировые координаты,
             # чтобы враги появлялись по краям видимого экрана
             if side == 0:  # Сверху
-                x = random.randint(0, self.screen_width) - self.camera_x
-                y = -50 - self.camera_y
+                screen_pos = (random.randint(0, self.screen_width), -50)
             elif side == 1:  # Справа
-                x = self.screen_width + 50 - self.camera_x
-                y = random.randint(0, self.screen_height) - self.camera_y
+                screen_pos = (self.screen_width + 50, random.randint(0, self.screen_height))
             elif side == 2:  # Снизу
-                x = random.randint(0, self.screen_width) - self.camera_x
-                y = self.screen_height + 50 - self.camera_y
+                screen_pos = (random.randint(0, self.screen_width), self.screen_height + 50)
             else:  # Слева
-                x = -50 - self.camera_x
-                y = random.randint(0, self.screen_height) - self.camera_y
+                screen_pos = (-50, random.randint(0, self.screen_height))
+            x, y = self.camera.screen_to_world(screen_pos)
 
 
             red = min(self.player.current_level * 50, 255)
             green = max(255 - self.player.current_level * 20, 0)
             blue = random.randint(0, 50)
+
+            # Сложность, не ставшая новыми врагами, делает врагов прочнее
+            toughness = self.spawn_governor.toughness_multiplier()
             enemy = Enemy(self.player, x, y,
                           speed=int(2 * (1 + self.player.current_level * 0.1)),
-                          max_health=50 + self.player.current_level * 10,
-                          damage=10 + self.player.current_level * 2,
+                          max_health=int((50 + self.player.current_level * 10) * toughness),
+                          damage=int((10 + self.player.current_level * 2) * toughness),
                           color=(red, green, blue))
             self.enemies.add(enemy)
-            self.all_sprites.add(enemy)
 
     def update(self, dt: float, events: List[pygame.event.Event]) -> None:
         """
@@ -113,6 +171,11 @@ class GameView:
                     self.pause_game()
                     return
 
+        # Учесть время кадра в регуляторе спавна и контроллере качества графики:
+        # обоим нужна работа кадра без ожидания ограничителя кадров
+        self.spawn_governor.record_frame(self.game.frame_work_ms)
+        quality.record_frame(self.game.frame_work_ms)
+
         # Проверка, только что ли игрок получил уровень
         if hasattr(self.player, 'just_leveled_up') and self.player.just_leveled_up:
             self.player.just_leveled_up = False
@@ -120,9 +183,10 @@ class GameView:
             return
 
         # Обновить игрока и позицию камеры
-        camera_pos = [self.camera_x, self.camera_y]
-        self.player.update(dt, events, camera_pos)
-        self.camera_x, self.camera_y = camera_pos
+        self.player.update(dt, events, self.camera)
+
+        # Собрать данные боя на кадр: позиция игрока и врагов в мировых координатах
+        self.combat_context = CombatContext(self.camera, self.enemies, self.all_sprites, self.damage_buffer)
 
         # Обработка стрельбы оружием
 
@@ -132,41 +196,29 @@ class GameView:
         weapon = list(self.player.weapon_slots.values())[self.weapon_tick]
 
         if weapon:
-            weapon.update(
-                dt,
-                (self.screen_width // 2, self.screen_height // 2),  # Игрок в центре экрана
-                self.enemies,
-                self.all_sprites,
-                (self.camera_x, self.camera_y)
-            )
-
-            weapon.shoot(
-                (self.screen_width // 2, self.screen_height // 2),  # Игрок в центре экрана
-                self.enemies,
-                self.all_sprites,
-                (self.camera_x, self.camera_y)
+            weapon.update(dt, self.combat_context)
+            weapon.shoot(self.combat_context)
+
+        # Применить весь урон, записанный оружием за кадр
+        self.resolve_damage()
+
+        # Обновить врагов по уровням детализации
+        # (позиция игрока передаётся в мировых координатах)
+        enemies = world.enemies
+        player_world_x, player_world_y = self.combat_context.player_pos
+        self.lod.update(enemies, (player_world_x, player_world_y), self.ai_scheduler)
+        self.horde.update((player_world_x, player_world_y), self.lod, self.enemies)
+        rows = enemies.live_rows()
+
+        # Проверка на столкновения с игроком: первый враг, чей прямоугольник пересекает прямоугольник игрока
+        if self.dt_since_last_damage > self.player_damage_cooldown and len(rows):
+            touching = (
+                (np.abs(enemies["pos_x"][rows] - player_world_x) * 2 < enemies["width"][rows] + self.player.rect.width)
+                & (np.abs(enemies["pos_y"][rows] - player_world_y) * 2 < enemies["height"][rows] + self.player.rect.height)
             )
-
-        # Обновить врагов
-        for enemy in self.enemies:
-            # Передать позицию игрока в мировых координатах
-            enemy.update(dt, (self.screen_width // 2 - self.camera_x, self.screen_height // 2 - self.camera_y))
-
-            # Создать временный прямоугольник для обнаружения столкновений в центре экрана
-            player_collision_rect = self.player.rect.copy()
-            player_collision_rect.center = (self.screen_width // 2, self.screen_height // 2)
-
-            # Создать временный прямоугольник для врага, который соответствует его визуальной позиции на экране
-            enemy_collision_rect = enemy.rect.copy()
-            enemy_collision_rect.x += self.camera_x
-            enemy_collision_rect.y += self.camera_y
-
-            # print(player_collision_rect, enemy_collision_rect, enemy_collision_rect.colliderect(player_collision_rect))
-
-            # Проверка на столкновения с игроком с использованием отрегулированного прямоугольника врага
-            if (enemy_collision_rect.colliderect(player_collision_rect)
-                    and self.dt_since_last_damage > self.player_damage_cooldown):
-                print(f"Получение урона! {enemy.damage} {dt}")
+            if touching.any():
+                enemy = enemies.objects[rows[touching.argmax()]]
+                log.debug("Получение урона", damage=enemy.damage, dt=dt)
                 self.player.take_damage(enemy.damage)  # Масштабировать урон по времени
                 self.dt_since_last_damage = 0
 
@@ -183,15 +235,48 @@ class GameView:
 
         self.dt_since_last_damage += dt
 
-        # Периодически спавнить новых врагов
-        if random.random() < 0.01 + ((self.player.current_level - 1) * 0.005):  # 1% шанс за кадр
-            self.spawn_enemies(1)
+        # Периодически спавнить новых врагов; регулятор решает, сколько создать на самом деле
+        wanted = 1 if random.random() < 0.01 + ((self.player.current_level - 1) * 0.005) else 0  # 1% шанс за кадр
+        # Враги внутри роёв тоже считаются: они распадутся обратно во врагов
+        count = self.spawn_governor.request(wanted, len(self.enemies) + self.horde.member_count())
+        if count:
+            self.spawn_enemies(count)
 
         # Обновляем прицел когда возвращаемся на первое оружие
         if self.weapon_tick == 0:
             for enemy in self.enemies:
                 enemy.recently_targeted = False
 
+        telemetry = getattr(self.game, "telemetry", None)
+        if telemetry is not None:
+            telemetry.record_game(len(self.enemies), self.player.current_level, self.kills,
+                                  self.player.weapon_slots.values())
+
+    def resolve_damage(self) -> None:
+        """
+        Разрешить урон за кадр: применить его, убрать поверженных врагов
+        одним проходом и выдать очки и звук убийства пачкой.
+        """
+        if not self.damage_buffer:
+            return
+
+        report = self.damage_buffer.resolve()
+        if not report.defeated:
+            return
+
+        # Убрать всех поверженных врагов из группы за один проход
+        self.enemies.remove(*report.defeated)
+
+        self.kills += len(report.defeated)
+        self.score += report.score
+
+        # Очки (они же опыт) начисляются одной суммой за кадр
+        self.player.add_score(report.score)
+        log.debug("Добавление очков", score=report.score, enemies=len(report.defeated))
+
+        # Один звук убийства на кадр, сколько бы врагов ни погибло
+        random.choice([Sounds.KILL_1]).play()
+
     def render(self, surface: Surface) -> None:
         """
         Отрисовать игровой экран.
@@ -202,15 +287,14 @@ class GameView:
         # Залить фон
         surface.fill((20, 20, 20))
 
-        # Вычислить позицию игрока на экране (центр экрана)
-        player_screen_x = self.screen_width // 2
-        player_screen_y = self.screen_height // 2
+        # Отрисовать всех врагов одним пакетом
+        render_enemies(surface, world.enemies, world.enemies.live_rows(), self.camera)
 
-        # Отрисовать все спрайты с учетом смещения камеры
+        # Отрисовать остальные спрайты (игрок и снаряды) с учетом смещения камеры
         for sprite in self.all_sprites:
             if sprite == self.player:
                 # Игрок всегда отрисовывается в центре экрана
-                center_pos = (self.screen_width // 2, self.screen_height // 2)
+                center_pos = self.camera.screen_center
                 if hasattr(sprite, 'render'):
                     sprite.render(surface, center_pos)
                 else:
@@ -219,17 +303,13 @@ class GameView:
                     temp_rect.center = center_pos
                     surface.blit(sprite.image, temp_rect)
             else:
-                # Применить смещение камеры к другим спрайтам
-                sprite_screen_x = sprite.rect.x + self.camera_x
-                sprite_screen_y = sprite.rect.y + self.camera_y
-
+                # Применить камеру к другим спрайтам
                 if hasattr(sprite, 'render'):
                     # Передать позицию на экране в метод отрисовки
-                    sprite.render(surface, (sprite_screen_x + sprite.rect.width // 2, 
-                                           sprite_screen_y + sprite.rect.height // 2))
+                    sprite.render(surface, self.camera.world_to_screen(sprite.rect.center))
                 else:
                     # Для спрайтов без пользовательского метода отрисовки
-                    surface.blit(sprite.image, (sprite_screen_x, sprite_screen_y))
+                    surface.blit(sprite.image, self.camera.world_to_screen(sprite.rect.topleft))
 
         # Отрисовать пули оружия
         for weapon in self.player.weapon_slots.values():
@@ -237,7 +317,7 @@ class GameView:
             if not weapon:
                 continue
 
-            weapon.render_bullets(surface, (self.camera_x, self.camera_y))
+            weapon.render_bullets(surface, self.combat_context)
 
         # Отрисовать интерфейс
         self.render_ui(surface)
@@ -253,19 +333,38 @@ class GameView:
         Аргументы:
             surface: Поверхность Pygame для отрисовки
         """
-        # Отрисовать текст здоровья
+        # Перерисовать текст раз в ui_refresh_interval кадров (каждый кадр на полном качестве)
+        if not self.ui_texts or self.ui_frame % quality.ui_refresh_interval == 0:
+            # Текст живёт несколько кадров, поэтому переводится в формат экрана
+            self.ui_texts = [(to_display_format(text), position) for text, position in self.render_ui_texts()]
+        self.ui_frame += 1
+
+        surface.blits(self.ui_texts, doreturn=False)
+
+    def render_ui_texts(self) -> List[Tuple[Surface, Tuple[int, int]]]:
+        """
+        Отрисовать строки интерфейса.
+
+        Возвращает:
+            Список пар (поверхность текста, позиция)
+        """
+        texts = []
+
+        # Текст здоровья
         health_text = self.font.render(f"Здоровье: {int(self.player.current_health)}/{self.player.max_health}", True, Colors.WHITE)
-        surface.blit(health_text, (20, 20))
+        texts.append((health_text, (20, 20)))
 
-        # Отрисовать слоты оружия
+        # Слоты оружия
         weapon_text = self.font.render("Оружие:", True, Colors.WHITE)
-        surface.blit(weapon_text, (20, 50))
+        texts.append((weapon_text, (20, 50)))
 
         for slot, weapon in self.player.weapon_slots.items():
             slot_color = Colors.GREEN_200 if slot == self.player.active_weapon_slot else Colors.GRAY_100
             weapon_name = "Пусто" if weapon is None else weapon.name
             slot_text = self.font.render(f"{slot}: {weapon_name}", True, slot_color)
-            surface.blit(slot_text, (20, 50 + slot * 30))
+            texts.append((slot_text, (20, 50 + slot * 30)))
+
+        return texts
 
     def render_game_over(self, surface: Surface) -> None:
         """
@@ -274,10 +373,10 @@ class GameView:
         Аргументы:
             surface: Поверхность Pygame для отрисовки
         """
-        # Создать полупрозрачный оверлей
-        overlay = Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # Черный с 150 альфа-каналом
-        surface.blit(overlay, (0, 0))
+        # Нарисовать полупрозрачный оверлей (создаётся один раз)
+        if self.game_over_overlay is None:
+            self.game_over_overlay = make_overlay((self.screen_width, self.screen_height), (0, 0, 0), 150)
+        surface.blit(self.game_over_overlay, (0, 0))
 
         # Текст окончания игры
         game_over_font = pygame.font.SysFont("Arial", 64)
@@ -7,17 +7,21 @@ from typing import List, Dict, Tuple, Optional
 from components.button import Button
 from constants import Colors, Sounds
 from sprites.player import Player
-from weapons.magic_wand import MagicWand
-from weapons.pistol import Pistol
-from weapons.knife import Knife
-from weapons.ball_lightning_wand import BallLightningWand
-from weapons.lightning_wand import LightningWand
+from systems.controls import controls
+from systems.log import get_logger
+from systems.surfaces import make_overlay
+
+
+log = get_logger("ui")
 
 
 class LevelUpView:
     """
     Экран повышения уровня, который появляется, когда игрок получает новый уровень, позволяя выбрать оружие для улучшения.
     """
+    # Экран сам заливает весь фон, поэтому главный цикл его не очищает
+    fills_background = True
+
     def __init__(self, game, game_view, player: Player):
         """
         Инициализация экрана повышения уровня.
@@ -31,6 +35,9 @@ class LevelUpView:
         self.player = game_view.player
         self.screen_width, self.screen_height = game.screen.get_size()
 
+        # Полупрозрачный оверлей создаётся один раз, а не каждый кадр
+        self.overlay = make_overlay((self.screen_width, self.screen_height), (0, 0, 0), 150)
+
         # Создать заголовок
         self.title_font = pygame.font.SysFont("Arial", 48)
         self.title_text = self.title_font.render("Level Up!", True, Colors.WHITE)
@@ -64,7 +71,7 @@ class LevelUpView:
 
         slot = len(self.player.weapon_slots) + 1
 
-        print(self.player.current_level % 2 == 0)
+        log.debug("Случайное оружие", available=self.player.current_level % 2 == 0)
         if self.player.current_level % 2 == 0:
             button_y = button_y_start + (slot - 1) * button_spacing
             button = Button(
@@ -104,6 +111,10 @@ class LevelUpView:
             dt: Дельта времени с последнего обновления
             events: Список событий pygame
         """
+        # Автоматический источник управления выбирает сам
+        if controls.choose_level_up(self):
+            return
+
         # Обновить кнопки
         for button in self.weapon_buttons:
             button.update(events)
@@ -118,10 +129,8 @@ class LevelUpView:
         # Сначала отобразить игровой экран в фоне
         self.game_view.render(surface)
 
-        # Создать полупрозрачный оверлей
-        overlay = Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # Черный с 150 альфа
-        surface.blit(overlay, (0, 0))
+        # Нарисовать полупрозрачный оверлей
+        surface.blit(self.overlay, (0, 0))
 
         # Нарисовать заголовок и подзаголовок
         surface.blit(self.title_text, self.title_rect)
@@ -164,6 +173,13 @@ class LevelUpView:
 
 
     def select_random_weapon(self):
+        # Модули оружия нужны только при выборе нового оружия
+        from weapons.magic_wand import MagicWand
+        from weapons.pistol import Pistol
+        from weapons.knife import Knife
+        from weapons.ball_lightning_wand import BallLightningWand
+        from weapons.lightning_wand import LightningWand
+
         all_weapons = [
             MagicWand(),
             Pistol(),
@@ -3,6 +3,11 @@ import time
 from components.button import Button
 from components.progress_bar import ProgressBar
 from constants import Sounds
+from systems.log import get_logger
+from systems.sound_archive import sound_archive
+
+
+log = get_logger("ui")
 
 
 class MainMenu:
@@ -82,7 +87,7 @@ class MainMenu:
         self.loading_duration = 0.7  # секунды
 
         # Воспроизвести музыку меню
-        pygame.mixer.music.load(Sounds.MENU_MUSIC)
+        sound_archive.load_music(Sounds.MENU_MUSIC)
         pygame.mixer.music.play(-1)  # -1 означает бесконечный цикл
 
     def update(self, dt, events):
@@ -134,13 +139,13 @@ class MainMenu:
         self.loading = True
         self.loading_start_time = time.time()
         self.loading_progress_bar.set_progress(0.0)
-        print("Загрузка начата...")
+        log.info("Загрузка начата")
 
     def start_game(self):
         """
         Начать игру.
         """
-        print("Начало игры...")
+        log.info("Начало игры")
         # Остановить музыку меню перед переходом к игровому представлению
         pygame.mixer.music.stop()
 
@@ -152,7 +157,7 @@ class MainMenu:
         """
         Показать меню настроек.
         """
-        print("Показать настройки...")
+        log.info("Показать настройки")
         # Переход к меню настроек
         from views.options_menu import OptionsMenu
         self.game.view_stack.append(OptionsMenu(self.game))
@@ -161,5 +166,5 @@ class MainMenu:
         """
         Выйти из игры.
         """
-        print("Выход из игры...")
+        log.info("Выход из игры")
         self.game.running = False
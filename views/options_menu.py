@@ -4,6 +4,8 @@ from typing import List, Tuple, Optional, Callable
 from components.button import Button
 from components.progress_bar import ProgressBar
 from constants import Colors
+from systems.display import display
+from systems.quality import QualityController, quality
 
 
 class OptionsMenu:
@@ -77,11 +79,21 @@ class OptionsMenu:
             font_size=18
         )
 
+        # Кнопка выбора качества графики (Авто -> Высокое -> ... -> Минимальное -> Авто)
+        quality_width = 400
+        quality_y = self.screen_height // 2 + 110
+        self.quality_button = Button(
+            (self.screen_width - quality_width) // 2, quality_y, quality_width, 40,
+            self.quality_button_text(), self.cycle_quality,
+            bg_color=Colors.GRAY_100, hover_color=Colors.GRAY_150,
+            game=self.game
+        )
+
         # Кнопка "Назад"
         button_width = 200
         button_height = 50
         button_x = (self.screen_width - button_width) // 2
-        back_y = self.screen_height // 2 + 120
+        back_y = self.screen_height // 2 + 170
         self.back_button = Button(
             button_x, back_y, button_width, button_height,
             "Назад", self.go_back,
@@ -102,9 +114,10 @@ class OptionsMenu:
             events: Список событий pygame
         """
         self.back_button.update(events)
+        self.quality_button.update(events)
 
         # Обработка событий мыши для ползунков
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = display.mouse_pos()
         mouse_buttons = pygame.mouse.get_pressed()
 
         # Проверка нажатия и отпускания кнопки мыши
@@ -164,9 +177,32 @@ class OptionsMenu:
         self.music_slider.render(surface)
         self.sfx_slider.render(surface)
 
-        # Нарисовать кнопку "Назад"
+        # Нарисовать кнопки
+        self.quality_button.render(surface)
         self.back_button.render(surface)
 
+    def quality_button_text(self) -> str:
+        """
+        Текст кнопки качества графики.
+
+        Возвращает:
+            Строка с текущим режимом качества
+        """
+        return f"Графика: {quality.tier_name()}"
+
+    def cycle_quality(self) -> None:
+        """
+        Переключить качество графики на следующий режим.
+        """
+        if quality.override is None:
+            quality.set_override(QualityController.FULL)
+        elif quality.override < QualityController.NO_HEALTH_BARS:
+            quality.set_override(quality.override + 1)
+        else:
+            quality.set_override(None)
+
+        self.quality_button.set_text(self.quality_button_text())
+
     def go_back(self):
         """
         Вернуться в предыдущее меню.
@@ -4,12 +4,16 @@ from typing import List, Dict, Tuple, Optional
 
 from components.button import Button
 from constants import Colors
+from systems.surfaces import make_overlay
 
 
 class PauseView:
     """
     Экран паузы, который появляется при постановке игры на паузу.
     """
+    # Экран сам заливает весь фон, поэтому главный цикл его не очищает
+    fills_background = True
+
     def __init__(self, game, game_view):
         """
         Инициализация экрана паузы.
@@ -21,6 +25,9 @@ class PauseView:
         self.game = game
         self.game_view = game_view
         self.screen_width, self.screen_height = game.screen.get_size()
+
+        # Полупрозрачный оверлей создаётся один раз, а не каждый кадр
+        self.overlay = make_overlay((self.screen_width, self.screen_height), (0, 0, 0), 150)
         
         # Создать кнопки
         button_width = 200
@@ -89,10 +96,8 @@ class PauseView:
         # Сначала отобразить игровой экран в фоне
         self.game_view.render(surface)
         
-        # Создать полупрозрачный оверлей
-        overlay = Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # Черный цвет с альфа-каналом 150
-        surface.blit(overlay, (0, 0))
+        # Нарисовать полупрозрачный оверлей
+        surface.blit(self.overlay, (0, 0))
         
         # Нарисовать заголовок
         surface.blit(self.title_text, self.title_rect)
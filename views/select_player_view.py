@@ -4,19 +4,14 @@ from typing import List, Dict, Tuple, Optional
 
 from components.button import Button
 from constants import Colors, Sounds
-from sprites.player import Player
-from views.game_view import GameView
-from weapons.lightning_wand import LightningWand
-from weapons.magic_wand import MagicWand
-from weapons.pistol import Pistol
-from weapons.knife import Knife
-from weapons.ball_lightning_wand import BallLightningWand
 
 
 class SelectPlayerView:
     """
     Экран выбора игрока, который появляется при старте, позволяя выбрать персонажа.
     """
+    # Экран сам заливает весь фон, поэтому главный цикл его не очищает
+    fills_background = True
 
     def __init__(self, game):
         """
@@ -107,10 +102,8 @@ class SelectPlayerView:
         Аргументы:
             surface: Поверхность Pygame для отображения
         """
-        # Создать полупрозрачный оверлей
-        overlay = Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill(Colors.GRAY_50)
-        surface.blit(overlay, (0, 0))
+        # Залить фон (оверлей непрозрачный, поэтому достаточно fill)
+        surface.fill(Colors.GRAY_50)
 
         # Нарисовать заголовок и подзаголовок
         surface.blit(self.title_text, self.title_rect)
@@ -121,12 +114,21 @@ class SelectPlayerView:
             button.render(surface)
 
     def get_player(self):
+        # Игровые модули (numpy, оружие, системы) импортируются только после выбора персонажа
+        from sprites.player import Player
+
         player_x = self.screen_width // 2
         player_y = self.screen_height // 2
 
         return Player(player_x, player_y)
 
+    def create_game_view(self, player):
+        from views.game_view import GameView
+        return GameView(self.game, player)
+
     def select_fat(self) -> None:
+        from weapons.pistol import Pistol
+
         player = self.get_player()
         player.speed = 4
         player.max_health = 150
@@ -136,13 +138,15 @@ class SelectPlayerView:
         player.weapon_slots[1].level_up()
 
         self.game.view_stack.pop()
-        self.game.view_stack.append(GameView(self.game, player))
+        self.game.view_stack.append(self.create_game_view(player))
 
         #Sounds.MUSTARDD.play()
 
 
 
     def select_mage(self):
+        from weapons.magic_wand import MagicWand
+
         player = self.get_player()
         player.speed = 5
         player.max_health = 100
@@ -151,12 +155,14 @@ class SelectPlayerView:
         player.weapon_slots[1] = MagicWand()
 
         self.game.view_stack.pop()
-        self.game.view_stack.append(GameView(self.game, player))
+        self.game.view_stack.append(self.create_game_view(player))
 
         #Sounds.MMMM.play()
 
 
     def select_warrior(self):
+        from weapons.knife import Knife
+
         player = self.get_player()
         player.speed = 6
         player.max_health = 120
@@ -165,12 +171,15 @@ class SelectPlayerView:
         player.weapon_slots[1] = Knife()
 
         self.game.view_stack.pop()
-        self.game.view_stack.append(GameView(self.game, player))
+        self.game.view_stack.append(self.create_game_view(player))
 
         #Sounds.METAL_PIPE.play()
 
 
     def select_electromage(self):
+        from weapons.ball_lightning_wand import BallLightningWand
+        from weapons.lightning_wand import LightningWand
+
         player = self.get_player()
         player.speed = 5
         player.max_health = 110
@@ -180,6 +189,6 @@ class SelectPlayerView:
         player.weapon_slots[2] = LightningWand()
 
         self.game.view_stack.pop()
-        self.game.view_stack.append(GameView(self.game, player))
+        self.game.view_stack.append(self.create_game_view(player))
 
         #Sounds.RANDOM_WEAPON.play()
\ No newline at end of file
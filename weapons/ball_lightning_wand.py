@@ -6,9 +6,14 @@ import math
 
 from constants import Colors
 from sprites.ball_lightning import BallLightning
+from systems.combat import CombatContext
+from systems.log import get_logger
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("weapons")
+
+
 class BallLightningWand(WeaponBase):
     """
     Оружие "Шаровая молния", которое выпускает снаряд-молнию в случайного врага,
@@ -30,48 +35,38 @@ class BallLightningWand(WeaponBase):
         # Группа для управления снарядами-молниями
         self.lightnings = pygame.sprite.Group()
 
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         """
         Обновить состояние шаровой молнии и её снарядов.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         # Обновить кулдаун
         self.time_since_last_shot += dt
 
         # Обновить молнии
-        defeated_enemies = []
         for lightning in self.lightnings:
             # Обновить молнию
             lightning.update(dt)
+            if not lightning.alive():
+                continue
+
+            # Если молния долетела до цели, записать урон и начать поиск следующей
+            if lightning.has_reached_target():
+                lightning.handle_collision(lightning.current_target, context.damage_buffer, self.name)
 
             # Если у молнии нет текущей цели, попытаться найти новую
             if lightning.current_target is None:
-                lightning.find_next_target(enemies, camera_pos)
+                lightning.find_next_target(context.snapshot)
 
-            # Проверить, были ли враги побеждены этой молнией
-            for enemy in enemies:
-                if enemy.current_health <= 0 and id(enemy) in lightning.hit_enemies:
-                    defeated_enemies.append(enemy)
-
-        # Удалить побеждённых врагов
-        for enemy in defeated_enemies:
-            enemy.kill()
-
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+    def shoot(self, context: CombatContext) -> bool:
         """
         Выпустить снаряд-молнию в случайного врага, если кулдаун позволяет.
 
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
 
         Возвращает:
             True, если снаряд-молния была выпущена, иначе False
@@ -81,33 +76,19 @@ class BallLightningWand(WeaponBase):
             return False
 
         # Если врагов нет, не стрелять
-        if not enemies:
+        if len(context.snapshot) == 0:
             return False
 
         # Выбрать случайного врага в качестве начальной цели
-        target_enemy = random.choice(list(enemies))
-
-        # Вычислить позицию врага на экране
-        enemy_screen_x = target_enemy.rect.centerx + camera_pos[0]
-        enemy_screen_y = target_enemy.rect.centery + camera_pos[1]
+        target_index = random.randrange(len(context.snapshot))
 
         # Вычислить направление к целевому врагу
-        dx = enemy_screen_x - player_pos[0]
-        dy = enemy_screen_y - player_pos[1]
-        direction = pygame.math.Vector2(dx, dy)
+        direction = context.direction_to(context.enemy_positions[target_index])
 
-        # Нормализовать направление
-        if direction.length() > 0:
-            direction = direction.normalize()
-
-        # Преобразовать позицию игрока в мировые координаты
-        lightning_world_x = player_pos[0] - camera_pos[0]
-        lightning_world_y = player_pos[1] - camera_pos[1]
-
-        # Создать снаряд-молнию
+        # Создать снаряд-молнию в позиции игрока
         lightning = BallLightning(
-            lightning_world_x,
-            lightning_world_y,
+            context.player_pos[0],
+            context.player_pos[1],
             direction,
             self.lightning_speed,
             self.lightning_damage,
@@ -117,28 +98,34 @@ class BallLightningWand(WeaponBase):
 
         # Добавить молнию в группы
         self.lightnings.add(lightning)
-        all_sprites.add(lightning)
+        context.all_sprites.add(lightning)
 
         # Сбросить кулдаун
         self.time_since_last_shot = 0.0
 
         return True
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         """
         Отобразить все снаряды-молнии.
 
         Аргументы:
             surface: Поверхность Pygame для отрисовки
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
+        camera = context.camera
         for lightning in self.lightnings:
-            # Вычислить позицию молнии на экране
-            lightning_screen_x = lightning.rect.centerx + camera_pos[0]
-            lightning_screen_y = lightning.rect.centery + camera_pos[1]
+            # Отобразить молнию в её позиции на экране
+            lightning.render(surface, camera.world_to_screen(lightning.rect.center))
+
+    def projectile_count(self) -> int:
+        """
+        Получить количество живых шаровых молний.
 
-            # Отобразить молнию
-            lightning.render(surface, (lightning_screen_x, lightning_screen_y))
+        Возвращает:
+            Количество снарядов
+        """
+        return len(self.lightnings)
 
     def level_up(self):
         """
@@ -153,4 +140,4 @@ class BallLightningWand(WeaponBase):
         # Увеличить количество отскоков
         self.max_bounces += 1
 
-        print(f"ШАРОВАЯ МОЛНИЯ улучшена! Урон: {self.lightning_damage}, Отскоки: {self.max_bounces}, Кулдаун: {self.cooldown:.2f}s")
+        log.info("Шаровая молния улучшена", damage=self.lightning_damage, bounces=self.max_bounces, cooldown=round(self.cooldown, 2))
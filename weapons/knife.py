@@ -4,9 +4,16 @@ from typing import List, Tuple, Optional
 import math
 
 from constants import Colors
+from systems.combat import CombatContext
+from systems.entity_ids import HitSet
+from systems.log import get_logger
+from systems.quality import quality
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("weapons")
+
+
 class Knife(WeaponBase):
     """
     Оружие "Нож", которое поражает только врагов рядом с игроком.
@@ -33,19 +40,16 @@ class Knife(WeaponBase):
         self.knife_width = 10
         self.knife_color = (200, 200, 200)  # Серебряный цвет
         
-        # Отслеживание врагов, поражённых текущим ударом, чтобы не поражать одного врага несколько раз
-        self.enemies_hit = set()
+        # Идентификаторы врагов, поражённых текущим ударом, чтобы не поражать одного врага несколько раз
+        self.enemies_hit = HitSet()
 
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         """
         Обновить состояние ножа.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         # Обновить кулдаун
         self.time_since_last_shot += dt
@@ -60,22 +64,19 @@ class Knife(WeaponBase):
             
             # Проверить врагов в радиусе удара
             if progress < 1.0:  # Проверять только во время удара
-                self.check_enemies_in_range(player_pos, enemies, camera_pos)
+                self.check_enemies_in_range(context)
             
             # Завершить удар, когда время удара истечёт
             if self.swing_time >= self.swing_duration:
                 self.is_swinging = False
                 self.enemies_hit.clear()  # Очистить поражённых врагов для следующего удара
 
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+    def shoot(self, context: CombatContext) -> bool:
         """
         Ударить ножом, если кулдаун позволяет.
 
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
 
         Возвращает:
             True, если нож был использован, False в противном случае
@@ -91,99 +92,66 @@ class Knife(WeaponBase):
         self.enemies_hit.clear()
         
         # Проверить врагов в радиусе удара немедленно
-        self.check_enemies_in_range(player_pos, enemies, camera_pos)
+        self.check_enemies_in_range(context)
         
         # Сбросить кулдаун
         self.time_since_last_shot = 0.0
         
         return True
         
-    def check_enemies_in_range(self, player_pos: Tuple[int, int], enemies, camera_pos: Tuple[int, int]) -> None:
+    def check_enemies_in_range(self, context: CombatContext) -> None:
         """
         Проверить врагов в радиусе действия ножа и нанести им урон.
-        
+
+        Сектор удара проверяется одним пакетным запросом по массивам позиций
+        врагов, а не отдельным вектором на каждого врага.
+
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
-        # Получить позицию мыши для направления удара
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Вычислить направление от игрока к мыши
-        dx = mouse_pos[0] - player_pos[0]
-        dy = mouse_pos[1] - player_pos[1]
-        direction = pygame.math.Vector2(dx, dy)
-        
-        # Нормализовать направление
-        if direction.length() > 0:
-            direction = direction.normalize()
-            
-        # Преобразовать позицию игрока на экране в мировые координаты
-        player_world_x = player_pos[0] - camera_pos[0]
-        player_world_y = player_pos[1] - camera_pos[1]
-        
-        # Проверить каждого врага
-        for enemy in enemies:
-            # Пропустить, если уже был поражён этим ударом
-            if enemy in self.enemies_hit:
-                continue
-                
-            # Вычислить позицию врага на экране
-            enemy_screen_x = enemy.rect.centerx + camera_pos[0]
-            enemy_screen_y = enemy.rect.centery + camera_pos[1]
-            
-            # Вычислить расстояние до врага
-            dx = enemy_screen_x - player_pos[0]
-            dy = enemy_screen_y - player_pos[1]
-            distance = math.sqrt(dx * dx + dy * dy)
-            
-            # Проверить, находится ли враг в радиусе действия
-            if distance <= self.range:
-                # Вычислить угол между направлением ножа и направлением к врагу
-                enemy_direction = pygame.math.Vector2(dx, dy)
-                if enemy_direction.length() > 0:
-                    enemy_direction = enemy_direction.normalize()
-                    
-                # Вычислить скалярное произведение для определения, находится ли враг перед игроком
-                dot_product = direction.dot(enemy_direction)
-                
-                # Если враг перед игроком (в пределах ~90 градусов от направления удара)
-                if dot_product > 0:
-                    # Нанести урон врагу
-                    if enemy.take_damage(self.damage):
-                        # Враг повержен
-                        enemy.kill()
-                    
-                    # Отметить как поражённого, чтобы избежать повторного поражения за один удар
-                    self.enemies_hit.add(enemy)
+        snapshot = context.snapshot
+        if len(snapshot) == 0:
+            return
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+        # Получить точку прицеливания для направления удара
+        aim_x, aim_y = context.aim_position()
+
+        # Направление от игрока к прицелу (нормализация не нужна, важен только знак скалярного произведения)
+        player_x, player_y = context.player_pos
+        direction = (aim_x - player_x, aim_y - player_y)
+
+        # Найти всех врагов в секторе удара
+        in_sector = snapshot.query_sector(context.player_pos, direction, self.range)
+
+        # Пропустить врагов, уже поражённых этим ударом
+        if self.enemies_hit and len(in_sector) > 0:
+            in_sector = in_sector[~self.enemies_hit.contains_many(snapshot.entity_ids[in_sector])]
+
+        for index in in_sector:
+            enemy = snapshot.sprites[index]
+
+            # Записать урон врагу (применится при разрешении урона за кадр)
+            context.damage_buffer.add(enemy, self.damage, self.name)
+
+            # Отметить как поражённого, чтобы избежать повторного поражения за один удар
+            self.enemies_hit.add(enemy.entity_id)
+
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         """
         Отобразить анимацию удара ножом.
 
         Аргументы:
             surface: Поверхность Pygame для отрисовки
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         if not self.is_swinging:
             return
             
-        # Получить позицию игрока на экране (центр экрана)
-        player_screen_x = surface.get_width() // 2
-        player_screen_y = surface.get_height() // 2
-        
-        # Получить позицию мыши для направления удара
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Вычислить направление от игрока к мыши
-        dx = mouse_pos[0] - player_screen_x
-        dy = mouse_pos[1] - player_screen_y
-        direction = pygame.math.Vector2(dx, dy)
+        # Получить позицию игрока на экране
+        player_screen_x, player_screen_y = context.camera.world_to_screen(context.player_pos)
         
-        # Нормализовать направление
-        if direction.length() > 0:
-            direction = direction.normalize()
+        # Вычислить направление от игрока к точке прицеливания
+        direction = context.direction_to(context.aim_position())
             
         # Вычислить базовый угол (угол направления мыши)
         base_angle = math.degrees(math.atan2(-direction.y, direction.x))
@@ -208,6 +176,10 @@ class Knife(WeaponBase):
             self.knife_width
         )
         
+        # На пониженном качестве рукоятка и кончик не рисуются
+        if not quality.weapon_details:
+            return
+
         # Нарисовать рукоятку ножа
         handle_length = 10
         handle_angle = rad_angle + math.pi/2  # Перпендикулярно лезвию
@@ -255,4 +227,4 @@ class Knife(WeaponBase):
         # Увеличить дальность
         self.range += 10
         
-        print(f"Нож улучшен! Урон: {self.damage}, Дальность: {self.range}, Кулдаун: {self.cooldown:.2f}s")
\ No newline at end of file
+        log.info("Нож улучшен", damage=self.damage, range=self.range, cooldown=round(self.cooldown, 2))
\ No newline at end of file
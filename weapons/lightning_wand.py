@@ -3,11 +3,19 @@ from pygame import Surface
 from typing import List, Tuple, Optional
 import math
 
+import numpy as np
+
 from constants import Colors, Sounds
 from sprites.lightning import Lightning
+from systems.archetypes import lifetime_system, movement_system, overlap_system, rows_of, world
+from systems.combat import CombatContext
+from systems.log import get_logger
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("weapons")
+
+
 class LightningWand(WeaponBase):
     """
     Оружие "Молния", которое выпускает 2 снаряда-молнии в двух врагов с наибольшим здоровьем.
@@ -27,56 +35,45 @@ class LightningWand(WeaponBase):
         # Группа для управления снарядами-молниями
         self.lightnings = pygame.sprite.Group()
 
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         """
         Обновить состояние молнии и её снарядов.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         # Обновить кулдаун
         self.time_since_last_shot += dt
 
-        # Обновить молнии
-        for lightning in self.lightnings:
-            lightning.update(dt)
-
-            # Проверить столкновения с врагами
-            for enemy in enemies:
-                # Создать временный rect для врага, соответствующий его позиции на экране
-                enemy_collision_rect = enemy.rect.copy()
-                enemy_collision_rect.x += camera_pos[0]
-                enemy_collision_rect.y += camera_pos[1]
-
-                # Создать временный rect для молнии, соответствующий её позиции на экране
-                lightning_collision_rect = lightning.rect.copy()
-                lightning_collision_rect.x += camera_pos[0]
-                lightning_collision_rect.y += camera_pos[1]
-
-                # Проверить столкновение с учётом смещённых rect
-                if lightning_collision_rect.colliderect(enemy_collision_rect):
-                    # Нанести урон врагу
-                    if enemy.take_damage(lightning.damage):
-                        # Враг повержен
-                        enemy.kill()
-
-                    # Удалить молнию
-                    lightning.kill()
-                    break
-
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+        # Сдвинуть все молнии и убрать те, чьё время жизни истекло
+        projectiles = world.projectiles
+        rows = rows_of(self.lightnings)
+        movement_system(projectiles, rows)
+        expired = lifetime_system(projectiles, rows, dt)
+        for lightning in projectiles.objects_at(expired):
+            lightning.kill()
+        rows = np.setdiff1d(rows, expired)
+
+        # Проверить столкновения всех молний с врагами поблизости за один шаг
+        snapshot = context.snapshot
+        first_hit = overlap_system(projectiles, rows, snapshot)
+        for row, enemy_index in zip(rows.tolist(), first_hit.tolist()):
+            if enemy_index < 0:
+                continue
+
+            # Записать урон врагу (применится при разрешении урона за кадр)
+            context.damage_buffer.add(snapshot.sprites[enemy_index], projectiles["damage"][row], self.name)
+
+            # Удалить молнию
+            projectiles.objects[row].kill()
+
+    def shoot(self, context: CombatContext) -> bool:
         """
         Выпустить 2 снаряда-молнии в двух врагов с наибольшим здоровьем, если кулдаун позволяет.
 
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
 
         Возвращает:
             True, если снаряды-молнии были выпущены, False в противном случае
@@ -86,47 +83,26 @@ class LightningWand(WeaponBase):
             return False
 
         # Если врагов нет, не стрелять
-        if not enemies:
+        snapshot = context.snapshot
+        if len(snapshot) == 0:
             return False
 
         # Отсортировать врагов по здоровью (высшее здоровье сначала)
-        sorted_enemies = sorted(list(enemies), key=lambda e: e.current_health, reverse=True)
+        health = world.enemies["health"][snapshot.rows]
+        sorted_indices = np.argsort(-health, kind="stable")
 
         # Выбрать N врагов с наибольшим здоровьем и циклически, если врагов мало
-        target_enemies = []
-        for i in range(self.num_projectiles):
-            target_enemies.append(sorted_enemies[i % len(sorted_enemies)])
-
-        # Если врагов недостаточно, не стрелять
-        if len(target_enemies) < 1:
-            return False
-
-        # Флаг для отслеживания, был ли выпущен хотя бы один снаряд
-        shot_fired = False
+        target_indices = sorted_indices[np.arange(self.num_projectiles) % len(sorted_indices)]
 
         # Стрелять в каждого целевого врага
-        for target_enemy in target_enemies:
-            # Вычислить позицию врага на экране
-            enemy_screen_x = target_enemy.rect.centerx + camera_pos[0]
-            enemy_screen_y = target_enemy.rect.centery + camera_pos[1]
-
+        for target_index in target_indices.tolist():
             # Вычислить направление к целевому врагу
-            dx = enemy_screen_x - player_pos[0]
-            dy = enemy_screen_y - player_pos[1]
-            direction = pygame.math.Vector2(dx, dy)
-
-            # Нормализовать направление
-            if direction.length() > 0:
-                direction = direction.normalize()
+            direction = context.direction_to(context.enemy_positions[target_index])
 
-            # Преобразовать позицию игрока на экране в мировые координаты
-            lightning_world_x = player_pos[0] - camera_pos[0]
-            lightning_world_y = player_pos[1] - camera_pos[1]
-
-            # Создать снаряд-молнию
+            # Создать снаряд-молнию в позиции игрока
             lightning = Lightning(
-                lightning_world_x,
-                lightning_world_y,
+                context.player_pos[0],
+                context.player_pos[1],
                 direction,
                 self.lightning_speed,
                 self.lightning_damage
@@ -134,36 +110,36 @@ class LightningWand(WeaponBase):
 
             # Добавить молнию в группы
             self.lightnings.add(lightning)
-            all_sprites.add(lightning)
-
-            # Установить флаг, что мы выстрелили хотя бы одной молнией
-            shot_fired = True
+            context.all_sprites.add(lightning)
 
-        # Сбросить кулдаун, если мы выстрелили хотя бы одной молнией
-        if shot_fired:
-            # Проиграть звук выстрела
-            Sounds.RIZZ.play()
+        # Проиграть звук выстрела
+        Sounds.RIZZ.play()
 
-            self.time_since_last_shot = 0.0
-            return True
-
-        return False
+        # Сбросить кулдаун
+        self.time_since_last_shot = 0.0
+        return True
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         """
         Отобразить все снаряды-молнии.
 
         Аргументы:
             surface: Поверхность Pygame для отрисовки
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
+        camera = context.camera
         for lightning in self.lightnings:
-            # Вычислить позицию молнии на экране
-            lightning_screen_x = lightning.rect.centerx + camera_pos[0]
-            lightning_screen_y = lightning.rect.centery + camera_pos[1]
+            # Отобразить молнию в её позиции на экране
+            lightning.render(surface, camera.world_to_screen(lightning.rect.center))
 
-            # Отобразить молнию
-            lightning.render(surface, (lightning_screen_x, lightning_screen_y))
+    def projectile_count(self) -> int:
+        """
+        Получить количество живых молний.
+
+        Возвращает:
+            Количество снарядов
+        """
+        return len(self.lightnings)
 
     def level_up(self):
         """
@@ -180,4 +156,5 @@ class LightningWand(WeaponBase):
 
         self.num_projectiles += 1
 
-        print(f"МОЛНИЯ leveled up! Снаряды: {self.num_projectiles}, Урон: {self.lightning_damage}, Скорость: {self.lightning_speed}, Кулдаун: {self.cooldown:.2f}s")
+        log.info("Молния улучшена", projectiles=self.num_projectiles, damage=self.lightning_damage,
+                 speed=self.lightning_speed, cooldown=round(self.cooldown, 2))
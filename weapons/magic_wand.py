@@ -4,11 +4,19 @@ from typing import List, Tuple, Optional
 import math
 import random
 
+import numpy as np
+
 from constants import Colors, Sounds
 from sprites.magic_cloud import MagicCloud
+from systems.archetypes import rows_of, world
+from systems.combat import CombatContext
+from systems.log import get_logger
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("weapons")
+
+
 class MagicWand(WeaponBase):
     """
     Оружие "Волшебная палочка", которое выпускает большие облака магии, наносящие урон всем врагам в области и постепенно исчезающие.
@@ -29,42 +37,73 @@ class MagicWand(WeaponBase):
         # Группа для управления облаками магии
         self.clouds = pygame.sprite.Group()
 
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         """
         Обновить состояние волшебной палочки и её облаков.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         # Обновить кулдаун
         self.time_since_last_shot += dt
 
-        # Обновить облака и проверить столкновения с врагами
-        defeated_enemies = []
+        # Обновить облака и собрать те, у которых истёк интервал урона
+        damaging_clouds = []
         for cloud in self.clouds:
             cloud.update(dt)
+            if cloud.alive() and cloud.consume_damage_tick():
+                damaging_clouds.append(cloud)
 
-            # Нанести урон по области врагам
-            cloud_defeated = cloud.apply_damage_to_enemies(enemies, camera_pos)
-            defeated_enemies.extend(cloud_defeated)
+        # Нанести урон по области всеми облаками за один шаг
+        self.apply_cloud_damage(damaging_clouds, context)
 
-        # Удалить побеждённых врагов
-        for enemy in defeated_enemies:
-            enemy.kill()
+    def apply_cloud_damage(self, clouds: List[MagicCloud], context: CombatContext) -> None:
+        """
+        Записать урон всем врагам в области действия облаков.
 
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+        Расстояния считаются сразу для матрицы облака × кандидаты в мировых
+        координатах, урон от всех облаков суммируется, и на каждого врага
+        записывается одно событие урона.
+
+        Аргументы:
+            clouds: Облака, которые наносят урон в этом кадре
+            context: Данные боя на кадр
+        """
+        snapshot = context.snapshot
+        if not clouds or len(snapshot) == 0:
+            return
+
+        # Параметры облаков берутся прямо из колонок таблицы эффектов
+        effects = world.effects
+        rows = rows_of(clouds)
+        centers = np.stack((effects["pos_x"][rows].astype(np.int64), effects["pos_y"][rows].astype(np.int64)), axis=1)
+        radii = effects["radius"][rows]
+        damages = effects["damage"][rows].astype(np.int64)
+
+        candidates = snapshot.query_circles(centers, radii)
+        if len(candidates) == 0:
+            return
+
+        # Матрица расстояний облака × кандидаты
+        offsets = snapshot.positions[candidates][np.newaxis, :, :] - centers[:, np.newaxis, :]
+        distances_sq = np.einsum("ijk,ijk->ij", offsets, offsets)
+        reach = radii[:, np.newaxis] + snapshot.half_widths[candidates][np.newaxis, :]
+        in_range = distances_sq <= reach * reach
+
+        # Суммарный урон по каждому задетому врагу от всех облаков
+        touched = in_range.any(axis=0)
+        total_damage = damages @ in_range
+
+        for index, amount in zip(candidates[touched].tolist(), total_damage[touched].tolist()):
+            context.damage_buffer.add(snapshot.sprites[index], amount, self.name)
+
+    def shoot(self, context: CombatContext) -> bool:
         """
         Выпустить облако магии в направлении курсора мыши, если кулдаун позволяет.
 
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
 
         Возвращает:
             True, если облако было выпущено, иначе False
@@ -75,26 +114,13 @@ class MagicWand(WeaponBase):
 
         #Sounds.MMMM.play()
 
-        # Получить позицию мыши для определения направления
-        mouse_pos = pygame.mouse.get_pos()
+        # Вычислить направление от игрока к точке прицеливания (курсору мыши)
+        direction = context.direction_to(context.aim_position())
 
-        # Вычислить направление от игрока к мыши
-        dx = mouse_pos[0] - player_pos[0]
-        dy = mouse_pos[1] - player_pos[1]
-        direction = pygame.math.Vector2(dx, dy)
-
-        # Нормализовать направление
-        if direction.length() > 0:
-            direction = direction.normalize()
-
-        # Преобразовать экранную позицию игрока в мировые координаты
-        cloud_world_x = player_pos[0] - camera_pos[0]
-        cloud_world_y = player_pos[1] - camera_pos[1]
-
-        # Создать облако магии
+        # Создать облако магии в позиции игрока
         cloud = MagicCloud(
-            cloud_world_x,
-            cloud_world_y,
+            context.player_pos[0],
+            context.player_pos[1],
             direction,
             self.cloud_speed,
             self.speed_decay,
@@ -104,28 +130,34 @@ class MagicWand(WeaponBase):
 
         # Добавить облако в группы
         self.clouds.add(cloud)
-        all_sprites.add(cloud)
+        context.all_sprites.add(cloud)
 
         # Сбросить кулдаун
         self.time_since_last_shot = 0.0
 
         return True
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         """
         Отобразить все облака магии.
 
         Аргументы:
             surface: Поверхность Pygame для отрисовки
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
+        camera = context.camera
         for cloud in self.clouds:
-            # Вычислить экранную позицию облака
-            cloud_screen_x = cloud.rect.centerx + camera_pos[0]
-            cloud_screen_y = cloud.rect.centery + camera_pos[1]
+            # Отобразить облако в его позиции на экране
+            cloud.render(surface, camera.world_to_screen(cloud.rect.center))
 
-            # Отобразить облако
-            cloud.render(surface, (cloud_screen_x, cloud_screen_y))
+    def projectile_count(self) -> int:
+        """
+        Получить количество живых облаков.
+
+        Возвращает:
+            Количество снарядов
+        """
+        return len(self.clouds)
 
     def level_up(self):
         """
@@ -140,4 +172,4 @@ class MagicWand(WeaponBase):
         # Увеличить радиус облака
         self.cloud_radius += 10
 
-        print(f"Волшебная палочка улучшена! Урон: {self.cloud_damage}, Радиус: {self.cloud_radius}, Кулдаун: {self.cooldown:.2f}s")
+        log.info("Волшебная палочка улучшена", damage=self.cloud_damage, radius=self.cloud_radius, cooldown=round(self.cooldown, 2))
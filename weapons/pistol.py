@@ -3,11 +3,19 @@ from pygame import Surface
 from typing import List, Tuple, Optional
 import math
 
+import numpy as np
+
 from constants import Colors, Sounds
 from sprites.bullet import Bullet
+from systems.archetypes import lifetime_system, movement_system, overlap_system, rows_of, world
+from systems.combat import CombatContext
+from systems.log import get_logger
 from weapons.weapon_base import WeaponBase
 
 
+log = get_logger("weapons")
+
+
 class Pistol(WeaponBase):
     """
     Оружие "Пистолет", которое стреляет пулями в ближайшего врага.
@@ -26,56 +34,45 @@ class Pistol(WeaponBase):
         # Группа для управления пулями
         self.bullets = pygame.sprite.Group()
 
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         """
         Обновить состояние пистолета и его пуль.
 
         Аргументы:
             dt: Дельта времени с последнего обновления
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
         # Обновить кулдаун
         self.time_since_last_shot += dt
 
-        # Обновить пули
-        for bullet in self.bullets:
-            bullet.update(dt)
-
-            # Проверить столкновения с врагами
-            for enemy in enemies:
-                # Создать временный rect для врага, соответствующий его позиции на экране
-                enemy_collision_rect = enemy.rect.copy()
-                enemy_collision_rect.x += camera_pos[0]
-                enemy_collision_rect.y += camera_pos[1]
-
-                # Создать временный rect для пули, соответствующий её позиции на экране
-                bullet_collision_rect = bullet.rect.copy()
-                bullet_collision_rect.x += camera_pos[0]
-                bullet_collision_rect.y += camera_pos[1]
-
-                # Проверить столкновение с учётом смещённых rect
-                if bullet_collision_rect.colliderect(enemy_collision_rect):
-                    # Нанести урон врагу
-                    if enemy.take_damage(bullet.damage):
-                        # Враг повержен
-                        enemy.kill()
-
-                    # Удалить пулю
-                    bullet.kill()
-                    break
-
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+        # Сдвинуть все пули и убрать те, чьё время жизни истекло
+        projectiles = world.projectiles
+        rows = rows_of(self.bullets)
+        movement_system(projectiles, rows)
+        expired = lifetime_system(projectiles, rows, dt)
+        for bullet in projectiles.objects_at(expired):
+            bullet.kill()
+        rows = np.setdiff1d(rows, expired)
+
+        # Проверить столкновения всех пуль с врагами поблизости за один шаг
+        snapshot = context.snapshot
+        first_hit = overlap_system(projectiles, rows, snapshot)
+        for row, enemy_index in zip(rows.tolist(), first_hit.tolist()):
+            if enemy_index < 0:
+                continue
+
+            # Записать урон врагу (применится при разрешении урона за кадр)
+            context.damage_buffer.add(snapshot.sprites[enemy_index], projectiles["damage"][row], self.name)
+
+            # Удалить пулю
+            projectiles.objects[row].kill()
+
+    def shoot(self, context: CombatContext) -> bool:
         """
         Выстрелить пулей в ближайшего врага, если кулдаун позволяет.
 
         Аргументы:
-            player_pos: Позиция игрока (x, y)
-            enemies: Группа врагов
-            all_sprites: Группа всех спрайтов
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
 
         Возвращает:
             True, если пуля была выпущена, иначе False
@@ -84,51 +81,31 @@ class Pistol(WeaponBase):
         if self.time_since_last_shot < self.cooldown:
             return False
 
-        # Найти ближайшего врага
-        closest_enemy_rect = None
-        closest_enemy = None
-        closest_distance = float('inf')
+        snapshot = context.snapshot
+        if len(snapshot) == 0:
+            return False
 
-        for enemy in enemies:
-            if enemy.recently_targeted:
-                continue
+        # Найти ближайшего врага, в которого ещё не целились
+        offsets = context.enemy_positions - context.player_pos
+        distances_sq = np.einsum("ij,ij->i", offsets, offsets)
+        targeted = np.fromiter((enemy.recently_targeted for enemy in snapshot.sprites), dtype=bool, count=len(snapshot))
+        distances_sq[targeted] = np.inf
 
-            # Вычислить позицию врага на экране
-            enemy_screen_x = enemy.rect.centerx + camera_pos[0]
-            enemy_screen_y = enemy.rect.centery + camera_pos[1]
-
-            # Вычислить расстояние до игрока
-            dx = enemy_screen_x - player_pos[0]
-            dy = enemy_screen_y - player_pos[1]
-            distance = math.sqrt(dx * dx + dy * dy)
-
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_enemy_rect = (enemy_screen_x, enemy_screen_y)
-                closest_enemy = enemy
-        # Если врагов нет, не стрелять
-        if closest_enemy_rect is None:
+        closest_index = int(distances_sq.argmin())
+        # Если подходящих врагов нет, не стрелять
+        if targeted[closest_index]:
             return False
 
+        closest_enemy = snapshot.sprites[closest_index]
         closest_enemy.recently_targeted = True
 
         # Вычислить направление к ближайшему врагу
-        dx = closest_enemy_rect[0] - player_pos[0]
-        dy = closest_enemy_rect[1] - player_pos[1]
-        direction = pygame.math.Vector2(dx, dy)
-
-        # Нормализовать направление
-        if direction.length() > 0:
-            direction = direction.normalize()
-
-        # Создать пулю
-        # Преобразовать позицию игрока на экране в мировые координаты
-        bullet_world_x = player_pos[0] - camera_pos[0]
-        bullet_world_y = player_pos[1] - camera_pos[1]
+        direction = context.direction_to(context.enemy_positions[closest_index])
 
+        # Создать пулю в позиции игрока
         bullet = Bullet(
-            bullet_world_x,
-            bullet_world_y,
+            context.player_pos[0],
+            context.player_pos[1],
             direction,
             self.bullet_speed,
             self.bullet_damage
@@ -136,7 +113,7 @@ class Pistol(WeaponBase):
 
         # Добавить пулю в группы
         self.bullets.add(bullet)
-        all_sprites.add(bullet)
+        context.all_sprites.add(bullet)
 
         # Проиграть звук выстрела
         Sounds.SHOOT.play()
@@ -148,21 +125,27 @@ class Pistol(WeaponBase):
 
         return True
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         """
         Отобразить все пули.
 
         Аргументы:
             surface: Поверхность Pygame для отрисовки
-            camera_pos: Позиция камеры (camera_x, camera_y)
+            context: Данные боя на кадр
         """
+        camera = context.camera
         for bullet in self.bullets:
-            # Вычислить позицию пули на экране
-            bullet_screen_x = bullet.rect.centerx + camera_pos[0]
-            bullet_screen_y = bullet.rect.centery + camera_pos[1]
+            # Отобразить пулю в её позиции на экране
+            bullet.render(surface, camera.world_to_screen(bullet.rect.center))
 
-            # Отобразить пулю
-            bullet.render(surface, (bullet_screen_x, bullet_screen_y))
+    def projectile_count(self) -> int:
+        """
+        Получить количество живых пуль.
+
+        Возвращает:
+            Количество снарядов
+        """
+        return len(self.bullets)
 
     def level_up(self):
         """
@@ -177,4 +160,4 @@ class Pistol(WeaponBase):
         # Увеличить скорость пули
         self.bullet_speed += 2
 
-        print(f"Пистолет улучшен! Урон: {self.bullet_damage}, Скорость: {self.bullet_speed}, Кулдаун: {self.cooldown:.2f}s")
+        log.info("Пистолет улучшен", damage=self.bullet_damage, speed=self.bullet_speed, cooldown=round(self.cooldown, 2))
@@ -7,17 +7,21 @@ import math
 
 from constants import Colors
 from sprites.bullet import Bullet
+from systems.combat import CombatContext
 
 
 class WeaponBase(ABC):
-    def update(self, dt: float, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> None:
+    def update(self, dt: float, context: CombatContext) -> None:
         ...  # Обновить состояние оружия
 
-    def shoot(self, player_pos: Tuple[int, int], enemies, all_sprites, camera_pos: Tuple[int, int]) -> bool:
+    def shoot(self, context: CombatContext) -> bool:
         ...  # Выстрелить из оружия
 
-    def render_bullets(self, surface: Surface, camera_pos: Tuple[int, int]) -> None:
+    def render_bullets(self, surface: Surface, context: CombatContext) -> None:
         ...  # Отрисовать пули/снаряды
 
+    def projectile_count(self) -> int:
+        return 0  # Количество живых снарядов (для телеметрии)
+
     def level_up(self):
         ...  # Улучшить оружие
\ No newline at end of file